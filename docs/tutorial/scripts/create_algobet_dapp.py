@@ -2,8 +2,8 @@ import time
 
 from beaker import consts
 from beaker import sandbox
-from beaker.client import ApplicationClient
 
+from client.cache import CachedApplicationClient, cached_application
 from contract import AlgoBet
 
 #######################################################
@@ -40,11 +40,11 @@ print(f"Participant 2 account: {participant_2_acct.address}")
 #######################################################
 
 # Create an Application client
-app_client_manager = ApplicationClient(
+app_client_manager = CachedApplicationClient(
     # Use the `algod` client connected to sandbox
     client=sandbox_client,
     # Provide an AlgoBet instance to the client
-    app=AlgoBet(),
+    app=cached_application(AlgoBet),
     # Select the Manager account as transaction signer
     signer=manager_acct.signer
 )
@@ -2,8 +2,8 @@ import time
 
 from beaker import consts
 from beaker import sandbox
-from beaker.client import ApplicationClient
 
+from client.cache import CachedApplicationClient, cached_application
 from contract import AlgoBet
 
 #######################################################
@@ -43,11 +43,11 @@ APP_ID = 145117913  # <-- put dApp ID here
 APP_ADDR = "GZV7XH2AWIKAAEQQMEPPY7VERX7FVH5P6QKSDCUILA4JTKM75TIITUM6O4"  # <-- put dApp Address
 
 # Create an Application client signed by Manager account
-app_client_manager = ApplicationClient(
+app_client_manager = CachedApplicationClient(
     # Use the `algod` client connected to sandbox
     client=sandbox_client,
     # Provide an AlgoBet instance to the client
-    app=AlgoBet(),
+    app=cached_application(AlgoBet),
     # Provide a deployed AlgoBet dApp ID
     app_id=APP_ID,
     # Select the Manager account as transaction signer
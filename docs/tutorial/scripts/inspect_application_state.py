@@ -1,6 +1,6 @@
 from beaker import sandbox
-from beaker.client import ApplicationClient
 
+from client.cache import CachedApplicationClient, cached_application
 from contract import AlgoBet
 
 #######################################################
@@ -40,11 +40,11 @@ APP_ID = 123842187  # <-- put dApp ID here
 APP_ADDR = "HJKBMH546IHI6R2UVNMWY7EHKZU7S7UGTSRPBQS7HATF3WPDZBR6BHSS2I"  # <-- put dApp Address
 
 # Create an Application client signed by Participant 1
-app_client_participant_1 = ApplicationClient(
+app_client_participant_1 = CachedApplicationClient(
     # Use the `algod` client connected to sandbox
     client=sandbox_client,
     # Provide an AlgoBet instance to the client
-    app=AlgoBet(),
+    app=cached_application(AlgoBet),
     # Provide a deployed AlgoBet dApp ID
     app_id=APP_ID,
     # Select the Participant 1 account as transaction signer
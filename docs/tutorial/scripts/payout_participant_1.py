@@ -1,10 +1,10 @@
 import time
 from algosdk.atomic_transaction_composer import TransactionWithSigner
 from algosdk.future import transaction
-from beaker import consts
 from beaker import sandbox
-from beaker.client import ApplicationClient
 
+from client.cache import CachedApplicationClient, cached_application
+from client.lite import pooled_fee_params
 from contract import AlgoBet
 
 #######################################################
@@ -44,11 +44,11 @@ APP_ID = 145117913  # <-- put dApp ID here
 APP_ADDR = "GZV7XH2AWIKAAEQQMEPPY7VERX7FVH5P6QKSDCUILA4JTKM75TIITUM6O4"  # <-- put dApp Address
 
 # Create an Application client signed by Participant 1
-app_client_participant_1 = ApplicationClient(
+app_client_participant_1 = CachedApplicationClient(
     # Use the `algod` client connected to sandbox
     client=sandbox_client,
     # Provide an AlgoBet instance to the client
-    app=AlgoBet(),
+    app=cached_application(AlgoBet),
     # Provide a deployed AlgoBet dApp ID
     app_id=APP_ID,
     # Select the Participant 1 account as transaction signer
@@ -59,10 +59,15 @@ app_client_participant_1 = ApplicationClient(
 participant_1_acct_balance_before = sandbox_client.account_info(participant_1_acct.address)['amount']
 print(f"Account balance before requesting the payout: {participant_1_acct_balance_before}")
 
+# The payout inner transaction fee is pooled: pay a fee covering both the call and the payout
+payout_params = pooled_fee_params(app_client_participant_1.get_suggested_params(), 1)
+
 # Request the payout
 result = app_client_participant_1.call(
     # Transaction to be requested
-    AlgoBet.payout
+    AlgoBet.payout,
+    # Suggested params with the pooled fee
+    suggested_params=payout_params
 )
 
 # Output the transaction ID
@@ -3,8 +3,8 @@ from algosdk.atomic_transaction_composer import TransactionWithSigner
 from algosdk.future import transaction
 from beaker import consts
 from beaker import sandbox
-from beaker.client import ApplicationClient
 
+from client.cache import CachedApplicationClient, cached_application
 from contract import AlgoBet
 
 #######################################################
@@ -44,11 +44,11 @@ APP_ID = 145117913  # <-- put dApp ID here
 APP_ADDR = "GZV7XH2AWIKAAEQQMEPPY7VERX7FVH5P6QKSDCUILA4JTKM75TIITUM6O4"  # <-- put dApp Address
 
 # Create an Application client signed by Participant 1
-app_client_participant_1 = ApplicationClient(
+app_client_participant_1 = CachedApplicationClient(
     # Use the `algod` client connected to sandbox
     client=sandbox_client,
     # Provide an AlgoBet instance to the client
-    app=AlgoBet(),
+    app=cached_application(AlgoBet),
     # Provide a deployed AlgoBet dApp ID
     app_id=APP_ID,
     # Select the Participant 1 account as transaction signer
@@ -68,8 +68,8 @@ result = app_client_participant_1.call(
         txn=transaction.PaymentTxn(
             # Address of the account requesting the transfer
             participant_1_acct.address,
-            # Transaction parameters (use suggested)
-            app_client_participant_1.client.suggested_params(),
+            # Transaction parameters (suggested, shared by the clients of the `algod` client)
+            app_client_participant_1.get_suggested_params(),
             # Receiver account address
             APP_ADDR,
             # Transfer amount
@@ -0,0 +1,50 @@
+""" Helpers shared by the AlgoBet benchmarks. """
+import time
+
+from algosdk import account
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+from beaker import consts
+
+from client import AlgoBetClient
+
+# Funds given to each fresh bettor: bet amount, opt-in minimum balance and fees
+bettor_funding = 1 * consts.algo
+
+
+def make_market(algod_client, funder, event_start_in_s: int = 600, event_end_in_s: int = 1200) -> AlgoBetClient:
+    """ Create and fund an AlgoBet market managed by `funder`, which acts as oracle too. """
+    app_client = AlgoBetClient(client=algod_client, signer=funder.signer)
+    app_client.create(
+        manager_addr=funder.address,
+        oracle_addr=funder.address,
+        event_start_unix_timestamp=int(time.time() + event_start_in_s),
+        event_end_unix_timestamp=int(time.time() + event_end_in_s),
+        payout_time_window_s=0
+    )
+    app_client.fund(1 * consts.algo)
+    # Read the bet amount once, so that it is shared by the prepared copies
+    _ = app_client.bet_amount
+    return app_client
+
+
+def make_bettors(app_client: AlgoBetClient, count: int) -> list[AlgoBetClient]:
+    """ Create `count` fresh accounts funded by the market creator, and return their clients. """
+    clients = []
+    for _ in range(count):
+        sk, addr = account.generate_account()
+        app_client.fund(bettor_funding, addr)
+        clients.append(app_client.prepare(signer=AccountTransactionSigner(sk)))
+    return clients
+
+
+def wait_for_timestamp(app_client: AlgoBetClient, unix_timestamp: int):
+    """ Wait until the last block timestamp reaches `unix_timestamp`.
+    When using a sandbox in dev mode, blocks are only forged upon transactions: a 0-Algo self payment is issued
+    every second to trigger their creation (see https://github.com/algorand/go-algorand/issues/3192).
+    """
+    while True:
+        last_round = app_client.client.status()["last-round"]
+        if app_client.client.block_info(last_round)["block"]["ts"] >= unix_timestamp:
+            return
+        time.sleep(1)
+        app_client.fund(0, app_client.get_sender())
@@ -0,0 +1,237 @@
+""" Opcode cost benchmark of the AlgoBet methods against a sandbox network.
+
+Runs a full market lifecycle (creation, opt-in, bets, result, read-only queries, payouts, refunds and deletion),
+evaluating each application call by dryrun right before its submission, against the state it is submitted on.
+For each method, the worst case over its calls is recorded:
+  - opcode cost;
+  - maximum stack depth;
+  - state value bytes read, by `app_global_get`, `app_local_get` and their `_ex` variants;
+  - state bytes written (keys and values), as found in the global and local state deltas.
+The compiled programs size is recorded as well.
+
+Results are compared with the baseline stored in `costs_baseline.json`: the benchmark fails if any method exceeds it.
+Methods and programs missing from the baseline, e.g. new ones, are reported with a warning until they are recorded.
+With `--update-baseline`, results are stored as the new baseline instead, to be committed along with the change they
+result from.
+
+Run from the `src` directory, provided that a sandbox network is up and running:
+    python -m bench.costs [--update-baseline]
+"""
+import base64
+import json
+import os
+import sys
+import time
+
+from algosdk.future import transaction
+from beaker import sandbox
+
+from bench.common import make_market, make_bettors, wait_for_timestamp
+from client import AlgoBetClient
+from contract import AlgoBet
+
+baseline_path = os.path.join(os.path.dirname(__file__), "costs_baseline.json")
+
+# Recorded metrics of each method
+metric_names = ["cost", "stack_depth", "bytes_read", "bytes_written"]
+
+# State read opcodes, mapped to the stack position of the read value right after their execution
+state_read_ops = {"app_global_get": -1, "app_local_get": -1, "app_global_get_ex": -2, "app_local_get_ex": -2}
+
+# Labels of the bare application calls, by OnComplete
+bare_call_labels = {
+    transaction.OnComplete.OptInOC: "opt_in",
+    transaction.OnComplete.CloseOutOC: "close_out",
+    transaction.OnComplete.DeleteApplicationOC: "delete",
+}
+
+# Seconds granted to each bet placement before the event starts
+bet_time_s = 2
+
+
+def value_size(value: dict) -> int:
+    """ Return the size of a TEAL value, as found in dryrun stack traces and state deltas. """
+    if value.get("type", value.get("action")) == 1:
+        return len(base64.b64decode(value.get("bytes", "")))
+    return 8
+
+
+def state_delta_size(delta: list[dict]) -> int:
+    """ Return the bytes written by a state delta: the key and the value of each set entry. """
+    return sum(len(base64.b64decode(entry["key"])) + value_size(entry["value"])
+               for entry in delta if entry["value"]["action"] != 3)
+
+
+def trace_metrics(txn_result: dict) -> dict:
+    """ Return the metrics of an application call, from its dryrun result. """
+    if "PASS" not in txn_result.get("app-call-messages", []):
+        raise RuntimeError(f"Dryrun failed: {txn_result.get('app-call-messages')}")
+
+    trace = txn_result.get("app-call-trace", [])
+    bytes_read = 0
+    # Each trace step holds the stack before the execution of its opcode, thus a read value is found in the next step
+    for step, next_step in zip(trace, trace[1:]):
+        op = txn_result["disassembly"][step["line"]].split(" ")[0]
+        if op in state_read_ops and len(next_step["stack"]) >= -state_read_ops[op]:
+            # `_ex` variants push a zero flag on top of a zero value when the key is missing
+            if op.endswith("_ex") and next_step["stack"][-1].get("uint", 0) == 0:
+                continue
+            bytes_read += value_size(next_step["stack"][state_read_ops[op]])
+
+    return {
+        "cost": txn_result.get("budget-consumed", txn_result.get("cost", 0)),
+        "stack_depth": max((len(step["stack"]) for step in trace), default=0),
+        "bytes_read": bytes_read,
+        "bytes_written": state_delta_size(txn_result.get("global-delta", [])) + sum(
+            state_delta_size(account["delta"]) for account in txn_result.get("local-deltas", [])
+        ),
+    }
+
+
+class CostProfiler:
+    """ Wrap an algod client so that every application call is evaluated by dryrun, and its metrics recorded.
+
+    Submitted groups are evaluated right before their submission, at the timestamp of the last block. Dryrun requests
+    issued by the client itself (i.e. read-only calls) are recorded as well.
+    """
+
+    def __init__(self, algod_client, app: AlgoBet):
+        self.method_names = {m.get_selector(): m.name for m in app.contract.methods}
+        self.metrics = {}
+
+        dryrun = algod_client.dryrun
+        send_transactions = algod_client.send_transactions
+
+        def _recording_dryrun(drr, **kwargs):
+            result = dryrun(drr, **kwargs)
+            for stxn, txn_result in zip(drr.txns, result["txns"]):
+                if isinstance(stxn.transaction, transaction.ApplicationCallTxn):
+                    self.record(self.label(stxn.transaction), trace_metrics(txn_result))
+            return result
+
+        def _profiling_send_transactions(txns, **kwargs):
+            if any(isinstance(stxn.transaction, transaction.ApplicationCallTxn) for stxn in txns):
+                last_round = algod_client.status()["last-round"]
+                latest_timestamp = algod_client.block_info(last_round)["block"]["ts"]
+                algod_client.dryrun(transaction.create_dryrun(
+                    algod_client, txns, latest_timestamp=latest_timestamp, round=last_round
+                ))
+            return send_transactions(txns, **kwargs)
+
+        algod_client.dryrun = _recording_dryrun
+        algod_client.send_transactions = _profiling_send_transactions
+
+    def label(self, txn: transaction.ApplicationCallTxn) -> str:
+        """ Return the name of the method called by an application call. Non-NoOp ABI calls are suffixed. """
+        selector = txn.app_args[0] if txn.app_args else None
+        if selector in self.method_names:
+            name = self.method_names[selector]
+            if txn.on_complete != transaction.OnComplete.NoOpOC and txn.index != 0:
+                name += f"[{bare_call_labels.get(txn.on_complete, txn.on_complete)}]"
+            return name
+        return bare_call_labels.get(txn.on_complete, "bare")
+
+    def record(self, label: str, metrics: dict):
+        """ Record the metrics of a call, keeping the worst case of each method. """
+        worst = self.metrics.setdefault(label, dict.fromkeys(metric_names, 0))
+        for name in metric_names:
+            worst[name] = max(worst[name], metrics[name])
+
+
+def market_lifecycle(algod_client, funder) -> AlgoBetClient:
+    """ Exercise every AlgoBet method: a market paying 5 winners, and a market resolved with no winners, refunding
+    its 4 participants.
+    """
+    bettors_count = 6
+    event_start_in_s = 10 + 2 * bettors_count * bet_time_s
+    market = make_market(algod_client, funder, event_start_in_s, event_start_in_s + 1)
+    refunded_market = make_market(algod_client, funder, event_start_in_s, event_start_in_s + 1)
+
+    bettors = make_bettors(market, bettors_count)
+    # Opt in with the bare call first, then bet with OnComplete=NoOp
+    bettors[0].opt_in()
+    for i, b in enumerate(bettors):
+        b.place_bet(0 if i < 5 else 1)
+    refunded_bettors = [refunded_market.prepare(signer=b.signer) for b in bettors[:4]]
+    for b in refunded_bettors:
+        b.place_bet(0)
+
+    wait_for_timestamp(market, market.get_application_state()[AlgoBet.event_end_timestamp.str_key()])
+    market.call(AlgoBet.set_event_result, opt=0)  # noqa
+    refunded_market.call(AlgoBet.set_event_result, opt=2)  # noqa
+
+    market.get_market_state()
+    market.get_participant_statuses([b.get_sender() for b in bettors[:4]])
+
+    bettors[0].request_payout()
+    market.settle_payouts([b.get_sender() for b in bettors[1:5]])
+    refunded_market.refund_bets([b.get_sender() for b in refunded_bettors])
+
+    for m in [market, refunded_market]:
+        m.delete()
+
+    return market
+
+
+def compare(results: dict, baseline: dict) -> tuple[list[str], list[str]]:
+    """ Return a description of each metric exceeding its baseline, and of each metric missing from it. """
+    regressions, missing = [], []
+    for name, size in results["program_size"].items():
+        if name not in baseline["program_size"]:
+            missing.append(f"{name} program size")
+        elif size > baseline["program_size"][name]:
+            regressions.append(f"{name} program size: {size} > {baseline['program_size'][name]}")
+    for label, metrics in results["methods"].items():
+        for name in metric_names:
+            limit = baseline["methods"].get(label, {}).get(name)
+            if limit is None:
+                missing.append(f"{label} {name}")
+            elif metrics[name] > limit:
+                regressions.append(f"{label} {name}: {metrics[name]} > {limit}")
+    return regressions, missing
+
+
+def run(update_baseline: bool = False):
+    if not update_baseline and not os.path.exists(baseline_path):
+        sys.exit(f"No baseline stored into {baseline_path}: record it with --update-baseline")
+
+    algod_client = sandbox.get_algod_client()
+    funder = sandbox.get_accounts().pop()
+
+    profiler = CostProfiler(algod_client, AlgoBet())
+    start = time.perf_counter()
+    market = market_lifecycle(algod_client, funder)
+    elapsed = time.perf_counter() - start
+
+    results = {
+        "program_size": {"approval": len(market.approval_binary), "clear": len(market.clear_binary)},
+        "methods": dict(sorted(profiler.metrics.items())),
+    }
+
+    print(f"{'program':<34}{'size [B]':>9}")
+    for name, size in results["program_size"].items():
+        print(f"{name:<34}{size:>9}")
+    print(f"\n{'method':<34}{'cost':>6}{'stack':>7}{'read [B]':>10}{'written [B]':>13}")
+    for label, m in results["methods"].items():
+        print(f"{label:<34}{m['cost']:>6}{m['stack_depth']:>7}{m['bytes_read']:>10}{m['bytes_written']:>13}")
+    print(f"\nLifecycle run in {elapsed:.1f}s")
+
+    if update_baseline:
+        with open(baseline_path, "w") as fp:
+            json.dump(results, fp, indent=2)
+            fp.write("\n")
+        print(f"Baseline stored into {baseline_path}")
+        return
+
+    with open(baseline_path) as fp:
+        regressions, missing = compare(results, json.load(fp))
+    if missing:
+        print("\nWarning: not in the stored baseline, record with --update-baseline:\n  " + "\n  ".join(missing))
+    if regressions:
+        print("\nRegressions against the stored baseline:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("No regressions against the stored baseline")
+
+
+if __name__ == "__main__":
+    run("--update-baseline" in sys.argv[1:])
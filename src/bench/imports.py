@@ -0,0 +1,40 @@
+""" Benchmark of the startup time of the AlgoBet clients: each statement is timed in a fresh interpreter.
+
+Compares the application built from PyTeal (`from contract import AlgoBet`) with the lightweight client, which only
+loads the ABI contract description. Timings are given both for the import alone and for the client being ready to
+build transactions, i.e. with the contract loaded and the algosdk modules imported.
+
+No network is needed. Run from the `src` directory:
+    python -m bench.imports [runs]
+"""
+import subprocess
+import sys
+from statistics import median
+
+statements = [
+    ("contract import", "from contract import AlgoBet"),
+    ("contract ready", "from contract import AlgoBet; from algosdk.atomic_transaction_composer import "
+                       "AtomicTransactionComposer; AlgoBet()"),
+    ("lite import", "from client.lite import AlgoBetLiteClient"),
+    ("lite ready", "from client.lite import load_contract; from algosdk.atomic_transaction_composer import "
+                   "AtomicTransactionComposer; load_contract()"),
+]
+
+timer = "import time; start = time.perf_counter(); {}; print(time.perf_counter() - start)"
+
+
+def startup_time(statement: str) -> float:
+    """ Return the time taken by a statement run in a fresh interpreter, in seconds. """
+    output = subprocess.run([sys.executable, "-c", timer.format(statement)], capture_output=True, check=True, text=True)
+    return float(output.stdout)
+
+
+def run(runs: int = 5):
+    print(f"{'statement':<18}{'median [ms]':>12}{'min [ms]':>10}")
+    for name, statement in statements:
+        times = [startup_time(statement) for _ in range(runs)]
+        print(f"{name:<18}{median(times) * 1000:>12.1f}{min(times) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,60 @@
+""" Benchmark of the bulk bet ingestion against placing each bet in its own group.
+
+A burst of bets is placed with `AsyncAlgoBetClient.place_bets` (a group per bet) and with `BetIngestor.ingest` (up to 8
+bets per group), both with the same number of groups in flight, against the stand-in node of `bench.standin`. The
+number of submitted groups and the throughput are reported.
+
+No network is needed. Run from the `src` directory:
+    python -m bench.ingest [bets] [max_in_flight]
+"""
+import asyncio
+import sys
+import time
+
+from algosdk import account
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+
+from bench.standin import StandInNode
+from client.aio import AsyncAlgoBetClient
+from client.ingest import BetIngestor
+
+# Application id of the stand-in market
+app_id = 1
+
+
+async def place_bets(client: AsyncAlgoBetClient, orders: list) -> list:
+    return await client.place_bets(orders)
+
+
+async def ingest_bets(client: AsyncAlgoBetClient, orders: list) -> list:
+    return await BetIngestor(client).ingest(orders)
+
+
+def measure(place, bets: int, max_in_flight: int) -> tuple[int, float]:
+    """ Place a burst of bets on a fresh stand-in node. Return the submitted groups and the bets placed per second. """
+    orders = [(AccountTransactionSigner(account.generate_account()[0]), i % 2) for i in range(bets)]
+
+    async def burst():
+        async with AsyncAlgoBetClient(node.client(), app_id, max_in_flight=max_in_flight) as client:
+            return await place(client, orders)
+
+    with StandInNode() as node:
+        start = time.perf_counter()
+        results = asyncio.run(burst())
+        elapsed = time.perf_counter() - start
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        raise errors[0]
+    return node.submissions, bets / elapsed
+
+
+def run(bets: int = 1000, max_in_flight: int = 16):
+    print(f"{bets} bets, {max_in_flight} groups in flight")
+    print(f"{'flow':<20}{'submissions':>12}{'bets/s':>10}")
+    for name, place in [("group per bet", place_bets), ("packed groups", ingest_bets)]:
+        submissions, throughput = measure(place, bets, max_in_flight)
+        print(f"{name:<20}{submissions:>12}{throughput:>10.1f}")
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
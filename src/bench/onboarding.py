@@ -0,0 +1,65 @@
+""" Benchmark of the participant onboarding flows against a sandbox network.
+
+Compares, for a number of freshly created bettors:
+  - the two-step flow: `opt_in` bare call, then deposit + `bet` group;
+  - the single-call flow of `AlgoBetClient.place_bet`: deposit and `bet` called with OnComplete=OptIn, in one atomic
+    group.
+
+Run from the `src` directory, provided that a sandbox network is up and running:
+    python -m bench.onboarding [bettors]
+"""
+import sys
+import time
+from statistics import mean
+
+from algosdk.atomic_transaction_composer import TransactionWithSigner
+from algosdk.future import transaction
+from beaker import sandbox
+
+from bench.common import make_market, make_bettors
+from client import AlgoBetClient
+from contract import AlgoBet
+
+
+def two_step_onboarding(c: AlgoBetClient, opt: int) -> tuple[int, int]:
+    """ Opt-in and bet with two submissions. Return the number of transactions and of submitted groups. """
+    c.opt_in()
+    c.call(
+        AlgoBet.bet,  # noqa
+        bet_deposit_tx=TransactionWithSigner(
+            txn=transaction.PaymentTxn(c.get_sender(), c.get_suggested_params(), c.app_addr, c.bet_amount),
+            signer=c.signer
+        ),
+        opt=opt
+    )
+    return 3, 2
+
+
+def single_call_onboarding(c: AlgoBetClient, opt: int) -> tuple[int, int]:
+    """ Opt-in and bet with a single application call. Return the number of transactions and of submitted groups. """
+    c.place_bet(opt)
+    return 2, 1
+
+
+def run(bettors: int = 10):
+    algod_client = sandbox.get_algod_client()
+    funder = sandbox.get_accounts().pop()
+
+    print(f"{'flow':<14}{'bettors':>8}{'txns/bettor':>13}{'groups/bettor':>15}{'latency/bettor [s]':>20}")
+    for name, onboard in [("two-step", two_step_onboarding), ("single-call", single_call_onboarding)]:
+        app_client = make_market(algod_client, funder)
+        clients = make_bettors(app_client, bettors)
+
+        latencies, txns, groups = [], 0, 0
+        for i, c in enumerate(clients):
+            start = time.perf_counter()
+            n_txns, n_groups = onboard(c, i % 3)
+            latencies.append(time.perf_counter() - start)
+            txns += n_txns
+            groups += n_groups
+
+        print(f"{name:<14}{bettors:>8}{txns / bettors:>13.1f}{groups / bettors:>15.1f}{mean(latencies):>20.3f}")
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,66 @@
+""" Benchmark of the latency saved per bet by the shared suggested params provider.
+
+Bets (deposit and `bet` call) are placed one after the other with `AlgoBetLiteClient.execute`, as the synchronous
+clients do, with suggested params either fetched from algod for each bet or served by the provider of `client.params`,
+against the stand-in node of `bench.standin` with the given request latency. The number of suggested params requests,
+the time to build each group (suggested params included) and the time of the whole call (building, signing,
+submission and confirmation) are reported. The latter is mostly the wait for the next round.
+
+No network is needed. Run from the `src` directory:
+    python -m bench.params [bets] [latency_ms]
+"""
+import sys
+import time
+from statistics import mean
+
+from algosdk import account
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+
+from bench.standin import StandInNode
+from client.lite import AlgoBetLiteClient, signer_address
+
+# Application id of the stand-in market
+app_id = 1
+
+
+def bet_latencies(composer: AlgoBetLiteClient, signers: list[AccountTransactionSigner],
+                  fetch: bool) -> tuple[list[float], list[float]]:
+    """ Place the bet of each signer, fetching the suggested params for each bet if `fetch`. Return the time taken to
+    build each group, suggested params included, and to place each bet, in seconds.
+    """
+    build_latencies, latencies = [], []
+    for i, signer in enumerate(signers):
+        start = time.perf_counter()
+        sender = signer_address(signer)
+
+        def compose(sp):
+            atc = composer.compose_bet(i % 2, sender, signer, sp)
+            build_latencies.append(time.perf_counter() - start)
+            return atc
+
+        composer.execute(compose, composer.client.suggested_params() if fetch else None)
+        latencies.append(time.perf_counter() - start)
+    return build_latencies, latencies
+
+
+def run(bets: int = 50, latency_ms: int = 5):
+    signers = [AccountTransactionSigner(account.generate_account()[0]) for _ in range(bets)]
+    with StandInNode(latency_s=latency_ms / 1000) as node:
+        composer = AlgoBetLiteClient(node.client(), app_id)
+        _ = composer.bet_amount
+
+        results = []
+        for name, fetch in [("fetched per bet", True), ("shared provider", False)]:
+            requests = node.params_requests
+            build_latencies, latencies = bet_latencies(composer, signers, fetch)
+            results.append((name, build_latencies, latencies, node.params_requests - requests))
+
+    print(f"{bets} sequential bets, {latency_ms} ms algod latency, {node.round_time_s * 1000:.0f} ms rounds")
+    print(f"{'suggested params':<20}{'requests':>10}{'build [ms]':>12}{'bet [ms]':>10}")
+    for name, build_latencies, latencies, requests in results:
+        print(f"{name:<20}{requests:>10}{mean(build_latencies) * 1000:>12.2f}{mean(latencies) * 1000:>10.2f}")
+    print(f"Saved per bet: {(mean(results[0][2]) - mean(results[1][2])) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
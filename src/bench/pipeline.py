@@ -0,0 +1,61 @@
+""" Benchmark of the bet throughput of the synchronous and asyncio AlgoBet clients.
+
+The synchronous path places the bets one after the other with `AlgoBetMultiSignerClient.place_bet`, waiting for the
+confirmation of each group before building the next one. The asyncio path places them with
+`AsyncAlgoBetClient.place_bets`, keeping up to `max_in_flight` groups in flight. Both run against the stand-in node of
+`bench.standin`, so that the figures depend on the request latency and the round time only.
+
+No network is needed. Run from the `src` directory:
+    python -m bench.pipeline [bets] [max_in_flight]
+"""
+import asyncio
+import sys
+import time
+
+from algosdk import account
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+
+from bench.standin import StandInNode
+from client.aio import AsyncAlgoBetClient
+from client.multi import AlgoBetMultiSignerClient
+
+# Application id of the stand-in market
+app_id = 1
+
+
+def sync_throughput(node: StandInNode, signers: list[AccountTransactionSigner]) -> float:
+    """ Return the bets placed per second by the synchronous client. """
+    client = AlgoBetMultiSignerClient(node.client(), app_id)
+    start = time.perf_counter()
+    for i, signer in enumerate(signers):
+        client.place_bet(signer, i % 2)
+    return len(signers) / (time.perf_counter() - start)
+
+
+async def async_throughput(node: StandInNode, signers: list[AccountTransactionSigner], max_in_flight: int) -> float:
+    """ Return the bets placed per second by the asyncio client. """
+    async with AsyncAlgoBetClient(node.client(), app_id, max_in_flight=max_in_flight) as client:
+        start = time.perf_counter()
+        results = await client.place_bets((signer, i % 2) for i, signer in enumerate(signers))
+        elapsed = time.perf_counter() - start
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        raise errors[0]
+    return len(signers) / elapsed
+
+
+def run(bets: int = 200, max_in_flight: int = 64):
+    signers = [AccountTransactionSigner(account.generate_account()[0]) for _ in range(bets)]
+    with StandInNode() as node:
+        print(f"Stand-in node: {node.latency_s * 1000:.0f} ms per request, {node.round_time_s * 1000:.0f} ms rounds")
+        # The synchronous path is slow: a fraction of the bets is enough
+        sync = sync_throughput(node, signers[:max(1, bets // 10)])
+        pipelined = asyncio.run(async_throughput(node, signers, max_in_flight))
+    print(f"{'client':<30}{'bets/s':>10}")
+    print(f"{'sync':<30}{sync:>10.1f}")
+    print(f"{f'asyncio ({max_in_flight} in flight)':<30}{pipelined:>10.1f}")
+    print(f"Speedup: {pipelined / sync:.1f}x")
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,62 @@
+""" Benchmark of the payout settlement flows against a sandbox network.
+
+Compares, for a number of winning bettors:
+  - the pull flow: each winner requests its own `payout`;
+  - the push flow of `AlgoBetClient.settle_payouts`: a keeper pays batches of winners with `settle_payouts` calls.
+
+Throughput is reported in settled winners per second and per confirmed round.
+
+Run from the `src` directory, provided that a sandbox network is up and running:
+    python -m bench.settlement [winners]
+"""
+import sys
+import time
+
+from beaker import sandbox
+
+from bench.common import make_market, make_bettors, wait_for_timestamp
+from client import AlgoBetClient
+from contract import AlgoBet
+
+# Seconds granted to each bettor for placing its bet before the event starts
+bet_time_per_bettor_s = 2
+
+
+def pull_settlement(keeper: AlgoBetClient, winners: list[AlgoBetClient]) -> list[int]:
+    """ Each winner requests its own payout. Return the confirmed rounds. """
+    return [w.request_payout().tx_info["confirmed-round"] for w in winners]
+
+
+def push_settlement(keeper: AlgoBetClient, winners: list[AlgoBetClient]) -> list[int]:
+    """ The keeper pays all the winners with batched calls. Return the confirmed rounds. """
+    results = keeper.settle_payouts([w.get_sender() for w in winners])
+    return [r.tx_info["confirmed-round"] for r in results]
+
+
+def run(winners_count: int = 64):
+    algod_client = sandbox.get_algod_client()
+    funder = sandbox.get_accounts().pop()
+
+    print(f"{'flow':<8}{'winners':>8}{'elapsed [s]':>13}{'rounds':>8}{'winners/s':>11}{'winners/round':>15}")
+    for name, settle in [("pull", pull_settlement), ("push", push_settlement)]:
+        event_start_in_s = 10 + winners_count * bet_time_per_bettor_s
+        app_client = make_market(algod_client, funder, event_start_in_s, event_start_in_s + 1)
+        winners = make_bettors(app_client, winners_count)
+        for w in winners:
+            w.place_bet(0)
+
+        # Wait for the event end, then set the result
+        wait_for_timestamp(app_client, app_client.get_application_state()[AlgoBet.event_end_timestamp.str_key()])
+        app_client.call(AlgoBet.set_event_result, opt=0)  # noqa
+
+        start = time.perf_counter()
+        rounds = settle(app_client, winners)
+        elapsed = time.perf_counter() - start
+        rounds_count = max(rounds) - min(rounds) + 1
+
+        print(f"{name:<8}{winners_count:>8}{elapsed:>13.3f}{rounds_count:>8}"
+              f"{winners_count / elapsed:>11.1f}{winners_count / rounds_count:>15.1f}")
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
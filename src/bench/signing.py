@@ -0,0 +1,76 @@
+""" Benchmark of the transaction signing throughput, in line and in process pools of increasing size.
+
+Prepared `opt_in`, `bet` (deposit and call) and `payout` groups of distinct accounts are signed with
+`AtomicTransactionComposer.gather_signatures`: one after the other with in-line account signers, and from a thread per
+group in flight with the signers of a `SigningPool`, for 1 worker process up to the number of processors. Groups are
+built beforehand against the stand-in node of `bench.standin`, so that signing only is timed.
+
+No network is needed. Run from the `src` directory:
+    python -m bench.signing [groups]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from algosdk import account
+from algosdk.atomic_transaction_composer import AccountTransactionSigner, AtomicTransactionComposer
+
+from bench.standin import StandInNode
+from client.lite import AlgoBetLiteClient
+from client.signing import SigningPool
+
+# Application id of the stand-in market
+app_id = 1
+
+
+def prepare_groups(composer: AlgoBetLiteClient,
+                   signers: list[AccountTransactionSigner]) -> list[AtomicTransactionComposer]:
+    """ Return opt-in, bet and payout groups, in turn, each sent by one of the signers. """
+    sp = composer.params.get()
+    compose = [
+        lambda sender, signer: composer.compose_opt_in(sender, signer, sp),
+        lambda sender, signer: composer.compose_bet(0, sender, signer, sp),
+        lambda sender, signer: composer.compose_payout(sender, signer, sp),
+    ]
+    return [
+        compose[i % len(compose)](account.address_from_private_key(signer.private_key), signer)
+        for i, signer in enumerate(signers)
+    ]
+
+
+def signatures_per_second(atcs: list[AtomicTransactionComposer], threads: int = None) -> float:
+    """ Sign the groups, from the given number of threads or in line. Return the signatures per second. """
+    start = time.perf_counter()
+    if threads is None:
+        for atc in atcs:
+            atc.gather_signatures()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(AtomicTransactionComposer.gather_signatures, atcs))
+    return sum(len(atc.txn_list) for atc in atcs) / (time.perf_counter() - start)
+
+
+def run(groups: int = 3000):
+    private_keys = [account.generate_account()[0] for _ in range(groups)]
+    with StandInNode(latency_s=0) as node:
+        composer = AlgoBetLiteClient(node.client(), app_id)
+        _ = composer.bet_amount
+
+        print(f"{'signer':<24}{'signatures/s':>14}")
+        inline = signatures_per_second(prepare_groups(composer, [AccountTransactionSigner(sk) for sk in private_keys]))
+        print(f"{'in line':<24}{inline:>14.0f}")
+
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            with SigningPool(max_workers=workers) as pool:
+                # Start the worker processes before timing
+                pool.executor.submit(int).result()
+                atcs = prepare_groups(composer, [pool.signer(sk) for sk in private_keys])
+                pooled = signatures_per_second(atcs, threads=4 * workers)
+            print(f"{f'pool, {workers} process(es)':<24}{pooled:>14.0f}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,97 @@
+""" Benchmark of market state polling against a sandbox network.
+
+Compares, for a number of markets deployed through the factory:
+  - the raw state path: `get_application_state` for each market, decoding the raw key/value pairs and unpacking the
+    option counters pages;
+  - the snapshot path of `fetch_market_states`: `get_market_state` evaluated by dryrun for batches of 16 markets, each
+    state decoded with a single ABI decode.
+
+Both the elapsed time and the number of algod requests are reported. For N markets, the raw path issues N sequential
+application lookups, and the snapshot path N concurrent lookups plus ceil(N / 16) dryrun requests.
+
+Run from the `src` directory, provided that a sandbox network is up and running:
+    python -m bench.snapshot [markets]
+"""
+import struct
+import sys
+import threading
+import time
+
+from beaker import sandbox, consts
+from beaker.client.state_decode import decode_state
+
+from client import AlgoBetFactoryClient
+from client.algobet import fetch_market_states
+from contract import AlgoBet, options_per_page
+
+# State value keys of the scalar market fields
+scalar_keys = [
+    AlgoBet.manager, AlgoBet.oracle_addr, AlgoBet.event_start_timestamp, AlgoBet.event_end_timestamp,
+    AlgoBet.payout_time_window_s, AlgoBet.options_count, AlgoBet.event_result, AlgoBet.bet_amount,
+    AlgoBet.stake_amount, AlgoBet.winning_count, AlgoBet.winning_payout,
+]
+
+
+def raw_state(algod_client, app_id: int) -> dict:
+    """ Read a market as `get_application_state` does, decoding the raw key/value pairs. """
+    state = decode_state(algod_client.application_info(app_id)["params"]["global-state"], raw=True)
+    market = {sv.str_key(): state[sv.str_key().encode()] for sv in scalar_keys}
+    counters = []
+    for page in range(0, market["options_count"], options_per_page):
+        counters.extend(struct.unpack(f">{options_per_page}Q", state[b"opt" + bytes([page // options_per_page])]))
+    market["option_counters"] = counters[:market["options_count"]]
+    return market
+
+
+def count_requests(algod_client):
+    """ Wrap the algod client so that its requests are counted. Return the counter. """
+    counter = {"requests": 0}
+    lock = threading.Lock()
+    algod_request = algod_client.algod_request
+
+    def _counting_request(*args, **kwargs):
+        # The snapshot path issues concurrent requests
+        with lock:
+            counter["requests"] += 1
+        return algod_request(*args, **kwargs)
+
+    algod_client.algod_request = _counting_request
+    return counter
+
+
+def run(markets_count: int = 100):
+    algod_client = sandbox.get_algod_client()
+    funder = sandbox.get_accounts().pop()
+
+    # Deploy the markets through the factory, which pays their funding and minimum balance
+    factory = AlgoBetFactoryClient(client=algod_client, signer=funder.signer)
+    factory.create(manager_addr=funder.address, child_funding=200 * consts.milli_algo)
+    factory.fund(markets_count * consts.algo)
+    app_ids = factory.create_markets([
+        dict(
+            manager_addr=funder.address,
+            oracle_addr=funder.address,
+            event_start_unix_timestamp=int(time.time() + 600),
+            event_end_unix_timestamp=int(time.time() + 1200),
+            payout_time_window_s=0,
+            options_count=3 + i % 58,
+        )
+        for i in range(markets_count)
+    ])
+
+    counter = count_requests(algod_client)
+    print(f"{'path':<10}{'markets':>8}{'elapsed [s]':>13}{'requests':>10}{'markets/s':>11}")
+    for name, poll in [
+        ("raw", lambda: [raw_state(algod_client, app_id) for app_id in app_ids]),
+        ("snapshot", lambda: fetch_market_states(algod_client, app_ids)),
+    ]:
+        counter["requests"] = 0
+        start = time.perf_counter()
+        states = poll()
+        elapsed = time.perf_counter() - start
+        assert len(states) == markets_count
+        print(f"{name:<10}{markets_count:>8}{elapsed:>13.3f}{counter['requests']:>10}{markets_count / elapsed:>11.1f}")
+
+
+if __name__ == "__main__":
+    run(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,165 @@
+""" Local stand-in of an algod node, for the client benchmarks which need no sandbox.
+
+It serves the algod endpoints used by the AlgoBet clients over HTTP, with a fixed latency added to each request and
+rounds forged at a fixed interval: every submitted transaction is accepted and confirmed in the next round. The
+application state is the one of an open market, in which every account is opted in. Programs are not evaluated, thus
+only the client side of a call is measured: building, signing, submission and confirmation round trips.
+"""
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import msgpack
+from algosdk.future.transaction import SignedTransaction
+from algosdk.v2client import algod
+
+# Bet amount of the stand-in market, in microAlgos
+stand_in_bet_amount = 140000
+
+
+class _Server(ThreadingHTTPServer):
+    # Clients open a connection per request, many of them at the same time
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class StandInNode:
+    """ Stand-in algod node, served by a background thread. """
+
+    def __init__(self, latency_s: float = 0.005, round_time_s: float = 0.1):
+        """
+        Args:
+            latency_s: Latency added to each request, in seconds.
+            round_time_s: Interval between two rounds, in seconds.
+        """
+        self.latency_s = latency_s
+        self.round_time_s = round_time_s
+        self.start_time = time.monotonic()
+        # Round in which each submitted transaction is confirmed, by transaction id
+        self.confirmed_rounds: dict[str, int] = {}
+        # Number of submitted groups
+        self.submissions = 0
+        # Number of suggested params requests
+        self.params_requests = 0
+        self.lock = threading.Lock()
+        self.server = _Server(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StandInNode":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def address(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def client(self) -> algod.AlgodClient:
+        """ Return an algod client of the stand-in node. """
+        return algod.AlgodClient("a" * 64, self.address)
+
+    @property
+    def last_round(self) -> int:
+        return 1 + int((time.monotonic() - self.start_time) / self.round_time_s)
+
+    def wait_for_round(self, round_num: int):
+        """ Block until the given round is forged. """
+        time.sleep(max(0., self.start_time + (round_num - 1) * self.round_time_s - time.monotonic()))
+
+    def submit(self, body: bytes) -> str:
+        """ Accept a group of signed transactions, confirmed in the next round. Return the first transaction id. """
+        unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+        unpacker.feed(body)
+        tx_ids = [SignedTransaction.undictify(stxn).get_txid() for stxn in unpacker]
+        with self.lock:
+            for tx_id in tx_ids:
+                self.confirmed_rounds[tx_id] = self.last_round + 1
+            self.submissions += 1
+        return tx_ids[0]
+
+    def pending_transaction_info(self, tx_id: str) -> dict | None:
+        with self.lock:
+            confirmed_round = self.confirmed_rounds.get(tx_id)
+        if confirmed_round is None:
+            return None
+        if confirmed_round > self.last_round:
+            return {"pool-error": "", "txn": {}}
+        return {"confirmed-round": confirmed_round, "pool-error": "", "txn": {}, "logs": []}
+
+    def status(self) -> dict:
+        return {"last-round": self.last_round, "time-since-last-round": 0, "catchup-time": 0}
+
+    def suggested_params(self) -> dict:
+        with self.lock:
+            self.params_requests += 1
+        return {
+            "fee": 0, "min-fee": 1000, "last-round": self.last_round, "genesis-id": "stand-in-v1",
+            "genesis-hash": base64.b64encode(bytes(32)).decode(), "consensus-version": "stand-in",
+        }
+
+    @staticmethod
+    def application_info(app_id: int) -> dict:
+        return {"id": app_id, "params": {"global-state": [
+            {"key": base64.b64encode(b"bet_amount").decode(), "value": {"type": 2, "uint": stand_in_bet_amount}}
+        ]}}
+
+    def _handler(self) -> type:
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def reply(self, body: dict | None, code: int = 200):
+                if body is None:
+                    code, body = 404, {"message": "not found"}
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                time.sleep(node.latency_s)
+                path = urlparse(self.path).path.removeprefix("/v2").split("/")[1:]
+                match path:
+                    case ["status"]:
+                        self.reply(node.status())
+                    case ["status", "wait-for-block-after", round_num]:
+                        node.wait_for_round(int(round_num) + 1)
+                        self.reply(node.status())
+                    case ["transactions", "params"]:
+                        self.reply(node.suggested_params())
+                    case ["transactions", "pending", tx_id]:
+                        self.reply(node.pending_transaction_info(tx_id))
+                    case ["accounts", address, "applications", app_id]:
+                        # Every account is opted in
+                        self.reply({"app-id": int(app_id), "app-local-state": {"key-value": []}})
+                    case ["applications", app_id]:
+                        self.reply(node.application_info(int(app_id)))
+                    case _:
+                        self.reply(None)
+
+            def do_POST(self):
+                time.sleep(node.latency_s)
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if urlparse(self.path).path == "/v2/transactions":
+                    try:
+                        self.reply({"txId": node.submit(body)})
+                    except ValueError as e:
+                        # Group rejected, as by the evaluation of a program
+                        self.reply({"message": str(e)}, 400)
+                else:
+                    self.reply(None)
+
+        return Handler
+
@@ -0,0 +1,70 @@
+""" Microbenchmark of the bet group build time, from scratch and from the bet template of the market.
+
+Bet groups (deposit and `bet` call) of distinct participants are built with the same suggested params, either from
+scratch with `AtomicTransactionComposer.add_method_call`, as `AlgoBetLiteClient.compose_bet` did before the templates,
+or from the `BetTemplate` of the market. The build time is reported alone, and with the group id computation of
+`build_group`, which both flows share. Signing is left out, being the same for both.
+
+No network is needed. Run from the `src` directory:
+    python -m bench.template [groups]
+"""
+import sys
+import time
+
+from algosdk import account
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner, AtomicTransactionComposer, TransactionWithSigner
+)
+from algosdk.future import transaction
+
+from bench.standin import StandInNode
+from client.lite import AlgoBetLiteClient
+
+# Application id of the stand-in market
+app_id = 1
+
+
+def compose_from_scratch(composer: AlgoBetLiteClient, opt: int, sender: str, signer: AccountTransactionSigner,
+                         sp: transaction.SuggestedParams) -> AtomicTransactionComposer:
+    """ Return the bet group built with `add_method_call`. """
+    deposit = TransactionWithSigner(transaction.PaymentTxn(sender, sp, composer.app_addr, composer.bet_amount), signer)
+    return composer.compose_call("bet", [opt, deposit], sender, signer, sp)
+
+
+def compose_from_template(composer: AlgoBetLiteClient, opt: int, sender: str, signer: AccountTransactionSigner,
+                          sp: transaction.SuggestedParams) -> AtomicTransactionComposer:
+    """ Return the bet group built from the bet template. """
+    return composer.bet_template.compose(opt, sender, signer, sp)
+
+
+def build_time_us(compose, composer: AlgoBetLiteClient, bettors: list[tuple[str, AccountTransactionSigner]],
+                  build_group: bool) -> float:
+    """ Return the mean time to build the group of each bettor, in microseconds. """
+    sp = composer.params.get()
+    start = time.perf_counter()
+    for i, (sender, signer) in enumerate(bettors):
+        atc = compose(composer, i % 2, sender, signer, sp)
+        if build_group:
+            atc.build_group()
+    return (time.perf_counter() - start) / len(bettors) * 1e6
+
+
+def run(groups: int = 5000):
+    bettors = []
+    for _ in range(groups):
+        sk, address = account.generate_account()
+        bettors.append((address, AccountTransactionSigner(sk)))
+    with StandInNode(latency_s=0) as node:
+        composer = AlgoBetLiteClient(node.client(), app_id)
+        _ = composer.bet_template
+
+        print(f"{groups} bet groups")
+        print(f"{'build':<16}{'scratch [us]':>14}{'template [us]':>15}{'speedup':>9}")
+        for name, build_group in [("composition", False), ("with group id", True)]:
+            scratch = build_time_us(compose_from_scratch, composer, bettors, build_group)
+            template = build_time_us(compose_from_template, composer, bettors, build_group)
+            print(f"{name:<16}{scratch:>14.1f}{template:>15.1f}{scratch / template:>8.1f}x")
+
+
+if __name__ == "__main__":
+    run(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,17 @@
+# Clients are imported on first access, so that importing the lightweight client does not load PyTeal and beaker
+_clients = {
+    "AlgoBetClient": ".algobet",
+    "AlgoBetFactoryClient": ".factory",
+    "AlgoBetLiteClient": ".lite",
+    "AlgoBetMultiSignerClient": ".multi",
+    "AlgoBetRelayerClient": ".relayer",
+    "AsyncAlgoBetClient": ".aio",
+}
+
+
+def __getattr__(name: str):
+    if name in _clients:
+        import importlib
+
+        return getattr(importlib.import_module(_clients[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
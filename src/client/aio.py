@@ -0,0 +1,263 @@
+""" Asyncio AlgoBet client, keeping many transaction groups in flight.
+
+Groups are submitted as soon as they are built, without waiting for the confirmation of the previous ones. A single
+watcher task follows the rounds of the node and resolves the confirmations of all the groups in flight at once. Algod
+requests are blocking, thus they are run in a thread pool sized as the maximum number of groups in flight.
+
+A group rejected by the node on submission raises `GroupRejectedError`: none of its transactions was committed. Other
+algod errors may be raised once the group was accepted, e.g. while reading its confirmation.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from algosdk import error
+
+from .lite import AlgoBetLiteClient, default_contract_file, signer_address
+
+if TYPE_CHECKING:
+    from algosdk.atomic_transaction_composer import ABIResult, AtomicTransactionComposer, TransactionSigner
+    from algosdk.future import transaction
+    from algosdk.v2client import algod
+
+
+class GroupRejectedError(error.AlgodHTTPError):
+    """ Transaction group rejected by the node on submission, thus with no transaction committed. """
+
+
+class AsyncAlgoBetClient:
+    """ Asyncio client of a deployed AlgoBet market, shared by any number of signers as `AlgoBetMultiSignerClient`.
+
+    At most `max_in_flight` calls are being built, submitted or confirmed at the same time: further calls wait for a
+    slot. The client must be closed, e.g. by using it as an async context manager.
+    """
+
+    def __init__(self, client: "algod.AlgodClient", app_id: int, max_in_flight: int = 64, wait_rounds: int = 4,
+                 contract_file: str = default_contract_file):
+        """
+        Args:
+            client: Algod client.
+            app_id: Application id of the market.
+            max_in_flight: Maximum number of groups submitted and not confirmed yet.
+            wait_rounds: Number of rounds waited for the confirmation of each group.
+            contract_file: ABI contract description of AlgoBet.
+        """
+        self.client = client
+        self.app_id = app_id
+        self.max_in_flight = max_in_flight
+        self.wait_rounds = wait_rounds
+        # Transaction groups are built by the lightweight client
+        self.composer = AlgoBetLiteClient(client, app_id, contract_file=contract_file)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight + 1)
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        # Confirmation futures and last round to be checked, keyed by transaction id
+        self._confirmations: dict[str, tuple[asyncio.Future, int]] = {}
+        self._last_round = None
+        self._watcher = None
+
+    async def __aenter__(self) -> "AsyncAlgoBetClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """ Stop following the rounds and release the thread pool. """
+        if self._watcher is not None:
+            self._watcher.cancel()
+        self._executor.shutdown(wait=False)
+
+    async def _algod(self, request, *args):
+        """ Run a blocking algod request in the thread pool. """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, request, *args)
+
+    ###########################################
+    # Confirmations
+    ###########################################
+
+    async def _confirmation(self, tx_id: str) -> dict:
+        """ Wait for the confirmation of a submitted transaction. Return its pending transaction information. """
+        if self._watcher is None or self._watcher.done():
+            # Rounds are not followed while no transaction is waiting: the last round is stale after an idle time
+            self._last_round = (await self._algod(self.client.status))["last-round"]
+        future = asyncio.get_running_loop().create_future()
+        self._confirmations[tx_id] = (future, self._last_round + self.wait_rounds)
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._watch())
+        return await future
+
+    async def _check(self, tx_id: str):
+        """ Resolve the confirmation of a transaction, if confirmed or rejected. """
+        future, last_round = self._confirmations[tx_id]
+        if future.done():
+            # Cancelled by the caller
+            del self._confirmations[tx_id]
+            return
+        try:
+            info = await self._algod(self.client.pending_transaction_info, tx_id)
+        except error.AlgodHTTPError:
+            # The node may not know the transaction yet, as `wait_for_confirmation`
+            info = {}
+
+        if info.get("pool-error"):
+            future.set_exception(error.TransactionRejectedError("Transaction rejected: " + info["pool-error"]))
+        elif info.get("confirmed-round"):
+            future.set_result(info)
+        elif self._last_round >= last_round:
+            future.set_exception(error.ConfirmationTimeoutError(f"Wait for transaction id {tx_id} timed out"))
+        else:
+            return
+        del self._confirmations[tx_id]
+
+    async def _watch(self):
+        """ Check all the transactions waiting for confirmation at each new round, until none is left. If a request
+        fails, the confirmations still waiting fail with its error instead of waiting for the next watcher.
+        """
+        try:
+            while self._confirmations:
+                checks = await asyncio.gather(*(self._check(tx_id) for tx_id in list(self._confirmations)),
+                                              return_exceptions=True)
+                errors = [e for e in checks if isinstance(e, Exception)]
+                if errors:
+                    raise errors[0]
+                if self._confirmations:
+                    status = await self._algod(self.client.status_after_block, self._last_round)
+                    self._last_round = status["last-round"]
+                    # Transactions built from now on get fresh suggested params
+                    self.composer.params.observe_round(self._last_round)
+        except Exception as e:
+            for future, _ in self._confirmations.values():
+                if not future.done():
+                    future.set_exception(e)
+            self._confirmations.clear()
+
+    async def _submit(self, atc: "AtomicTransactionComposer") -> list["ABIResult"]:
+        """ Sign and submit a transaction group, then wait for its confirmation. Return the ABI results of the method
+        calls of the group.
+
+        Raises:
+            GroupRejectedError: If the node rejected the group on submission.
+        """
+        from algosdk.atomic_transaction_composer import ABIResult
+
+        # Groups are signed in the thread pool too, thus in parallel with signers of a `SigningPool`
+        signed_txns = await self._algod(atc.gather_signatures)
+        try:
+            await self._algod(self.client.send_transactions, signed_txns)
+        except error.AlgodHTTPError as e:
+            raise GroupRejectedError(str(e), e.code) from e
+        await self._confirmation(atc.tx_ids[0])
+
+        # The return values of the methods called by AlgoBet clients are void
+        calls = sorted(atc.method_dict)
+        infos = await asyncio.gather(*(self._algod(self.client.pending_transaction_info, atc.tx_ids[i]) for i in calls))
+        return [
+            ABIResult(tx_id=atc.tx_ids[i], raw_value=None, return_value=None, decode_error=None, tx_info=info,
+                      method=atc.method_dict[i])
+            for i, info in zip(calls, infos)
+        ]
+
+    async def _execute(self, compose: Callable[["transaction.SuggestedParams"], "AtomicTransactionComposer"]
+                       ) -> list["ABIResult"]:
+        """ Build a transaction group with the shared suggested params and submit it, as `AlgoBetLiteClient.execute`:
+        if the params turn out to be dead, they are refreshed and the group is built and submitted once more.
+        """
+        try:
+            return await self._submit(compose(await self._algod(self.composer.params.get)))
+        except GroupRejectedError as e:
+            if not self.composer.params.invalidate_if_dead(e):
+                raise
+            return await self._submit(compose(await self._algod(self.composer.params.get)))
+
+    async def submit(self, atc: "AtomicTransactionComposer") -> list["ABIResult"]:
+        """ Sign and submit a transaction group, then wait for its confirmation, holding a slot in flight.
+
+        Returns:
+            The ABI results of the method calls of the group.
+        """
+        async with self._in_flight:
+            return await self._submit(atc)
+
+    ###########################################
+    # Calls
+    ###########################################
+
+    async def is_opted_in(self, account: str) -> bool:
+        """ Return True if the account is opted in the application. """
+        return await self._algod(self.composer.is_opted_in, account)
+
+    async def opt_in(self, signer: "TransactionSigner") -> str:
+        """ Opt the signer account in the application with the bare opt-in call. Return the transaction id. """
+        atcs = []
+
+        def compose(sp: "transaction.SuggestedParams") -> "AtomicTransactionComposer":
+            atcs.append(self.composer.compose_opt_in(signer_address(signer), signer, sp))
+            return atcs[-1]
+
+        async with self._in_flight:
+            await self._execute(compose)
+        # The group submitted last
+        return atcs[-1].tx_ids[0]
+
+    async def place_bet(self, signer: "TransactionSigner", opt: int) -> "ABIResult":
+        """ Place a bet of the signer account on the given option, opting it in if needed. """
+        sender = signer_address(signer)
+        async with self._in_flight:
+            opted_in, _ = await asyncio.gather(
+                self.is_opted_in(sender),
+                # Read once from the application state
+                self._algod(lambda: self.composer.bet_amount)
+            )
+            return (await self._execute(
+                lambda sp: self.composer.compose_bet(opt, sender, signer, sp, opt_in=not opted_in)
+            )).pop()
+
+    async def place_bet_group(self, bets: list[tuple["TransactionSigner", int]]) -> list["ABIResult"]:
+        """ Place the bets of several participants in a single atomic group, opting them in if needed: either all of
+        them are placed, or none.
+
+        Args:
+            bets: Signer and chosen option of each bet, at most 8 (a deposit and a call each, in a group of 16).
+
+        Returns:
+            The ABI result of each `bet` call, in the same order as `bets`.
+        """
+        senders = [signer_address(signer) for signer, _ in bets]
+        async with self._in_flight:
+            opted_in = await asyncio.gather(*(self.is_opted_in(sender) for sender in senders))
+            # Read once from the application state
+            await self._algod(lambda: self.composer.bet_amount)
+
+            def compose(sp: "transaction.SuggestedParams") -> "AtomicTransactionComposer":
+                atc = None
+                for (signer, opt), sender, is_opted_in in zip(bets, senders, opted_in):
+                    atc = self.composer.compose_bet(opt, sender, signer, sp, opt_in=not is_opted_in, atc=atc)
+                return atc
+
+            return await self._execute(compose)
+
+    async def request_payout(self, signer: "TransactionSigner", fee_per_txn: int = None) -> "ABIResult":
+        """ Request the payout of the signer account, pooling the fee of the payout inner transaction. """
+        async with self._in_flight:
+            return (await self._execute(
+                lambda sp: self.composer.compose_payout(signer_address(signer), signer, sp, fee_per_txn)
+            )).pop()
+
+    async def set_event_result(self, signer: "TransactionSigner", opt: int) -> "ABIResult":
+        """ Set the winning option of the event, on behalf of the oracle account of the signer. """
+        async with self._in_flight:
+            return (await self._execute(
+                lambda sp: self.composer.compose_set_event_result(opt, signer_address(signer), signer, sp)
+            )).pop()
+
+    async def place_bets(self, bets: Iterable[tuple["TransactionSigner", int]]) -> list["ABIResult | Exception"]:
+        """ Place many bets concurrently, with at most `max_in_flight` groups in flight.
+
+        Args:
+            bets: Signer and chosen option of each bet.
+
+        Returns:
+            The ABI result of each `bet` call, or the exception raised by its submission, in the same order as `bets`.
+        """
+        return await asyncio.gather(*(self.place_bet(signer, opt) for signer, opt in bets), return_exceptions=True)
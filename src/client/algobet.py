@@ -0,0 +1,362 @@
+import base64
+from concurrent.futures import ThreadPoolExecutor
+
+from algosdk import abi
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer, ABIResult
+from algosdk.error import AlgodHTTPError
+from algosdk.future import transaction
+from algosdk.v2client import algod, models
+from beaker.application import get_method_spec
+
+from contract import (
+    AlgoBet, MarketState, ParticipantStatus, event_selector, bet_placed_event, event_result_set_event,
+    payout_sent_event, bet_refunded_event, market_deleted_event
+)
+from .cache import ArtifactCache, CachedApplicationClient, cached_application
+from .lite import pooled_fee_params
+from .params import suggested_params_provider
+from .template import BetTemplate
+
+# Prefix of the log holding the return value of an ABI method
+abi_return_prefix = bytes.fromhex("151f7c75")
+
+# Maximum number of read-only calls evaluated by a single dryrun request, as for an atomic group
+calls_per_dryrun = 16
+
+# Name and fields tuple type of the events logged by AlgoBet, keyed by event selector
+event_types = {
+    event_selector(signature): (
+        signature[:signature.index("(")],
+        abi.ABIType.from_string(signature[signature.index("("):])
+    )
+    for signature in [
+        bet_placed_event, event_result_set_event, payout_sent_event, bet_refunded_event, market_deleted_event
+    ]
+}
+
+
+def decode_event_logs(logs: list[str]) -> list[tuple[str, list]]:
+    """ Decode the AlgoBet event records among the logs of a transaction, skipping any other log.
+
+    Args:
+        logs: Base64 encoded logs, as found in the transaction information returned by algod or the indexer.
+
+    Returns:
+        The name and the decoded fields of each event, in the logging order.
+    """
+    events = []
+    for log in logs:
+        raw = base64.b64decode(log)
+        if raw[:4] in event_types:
+            name, fields_type = event_types[raw[:4]]
+            events.append((name, fields_type.decode(raw[4:])))
+    return events
+
+
+def dryrun_read_only(client: algod.AlgodClient, method: abi.Method, txns: list[transaction.ApplicationCallTxn],
+                     apps: list[dict], accounts: list[dict] = None) -> list:
+    """ Evaluate read-only ABI method calls by a single dryrun request, returning their decoded return values.
+
+    Dryrun does not check signatures, thus the calls are left unsigned. The state needed by the calls must be uploaded
+    with the request.
+
+    Args:
+        client: Algod client.
+        method: Read-only ABI method called by all the transactions.
+        txns: Application call transactions, up to 16.
+        apps: Information of the called applications, as returned by algod with decoded programs.
+        accounts: Information of the accounts read by the calls, as returned by algod.
+    """
+    result = client.dryrun(models.DryrunRequest(
+        txns=[transaction.SignedTransaction(txn, None) for txn in txns],
+        apps=apps,
+        accounts=accounts or []
+    ))
+
+    values = []
+    for txn, txn_result in zip(txns, result["txns"]):
+        messages = txn_result.get("app-call-messages", [])
+        if "PASS" not in messages:
+            raise RuntimeError(f"{method.name} dryrun failed for app {txn.index}: {messages}")
+        raw = base64.b64decode(txn_result["logs"][-1])
+        values.append(method.returns.type.decode(raw[len(abi_return_prefix):]))
+    return values
+
+
+def fetch_market_states(client: algod.AlgodClient, app_ids: list[int], max_concurrency: int = 4) -> list[dict]:
+    """ Return the state of many AlgoBet markets, evaluating their `get_market_state` read-only method by dryrun.
+
+    The application of each market is fetched once and uploaded with the dryrun requests, each one evaluating up to 16
+    markets: N markets take N application lookups and ceil(N / 16) dryrun requests, issued with at most
+    `max_concurrency` requests in flight. Each state is decoded with a single ABI decode.
+
+    Args:
+        client: Algod client.
+        app_ids: Application ids of the markets.
+        max_concurrency: Maximum number of concurrent algod requests.
+
+    Returns:
+        The state of each market as a dictionary keyed by `MarketState` field names, in the same order as `app_ids`.
+    """
+    method = get_method_spec(AlgoBet.get_market_state)
+    fields = list(MarketState.__annotations__)
+    sp = suggested_params_provider(client).get()
+
+    def _query(apps: list[dict]) -> list:
+        txns = [
+            transaction.ApplicationNoOpTxn(app["params"]["creator"], sp, app["id"], app_args=[method.get_selector()])
+            for app in apps
+        ]
+        return dryrun_read_only(client, method, txns, apps)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        apps = [transaction.decode_programs(app) for app in pool.map(client.application_info, app_ids)]
+        chunks = [apps[b:b + calls_per_dryrun] for b in range(0, len(apps), calls_per_dryrun)]
+        values = [value for chunk_values in pool.map(_query, chunks) for value in chunk_values]
+
+    return [dict(zip(fields, value)) for value in values]
+
+
+class AlgoBetClient(CachedApplicationClient):
+    """ Application client for AlgoBet, extending beaker's `ApplicationClient` with participant helpers.
+
+    Unless an application instance is given, programs are loaded from the compiled artifacts cache.
+    """
+
+    # Maximum number of participants paid by a single `settle_payouts` or `refund_bets` call, bound by the foreign
+    # accounts array size
+    max_winners_per_call = 4
+
+    # Maximum number of participants queried by a single `get_participant_statuses` call, bound by the foreign
+    # accounts array size
+    max_participants_per_query = 4
+
+    # Maximum number of transactions in an atomic group
+    max_group_size = 16
+
+    def __init__(self, client, app: AlgoBet = None, cache: ArtifactCache = None, **kwargs):
+        super().__init__(
+            client=client, app=app if app is not None else cached_application(AlgoBet, cache), cache=cache, **kwargs
+        )
+        # Fixed bet amount, lazily read from the application state
+        self._bet_amount = None
+        self._bet_template = None
+
+    @property
+    def bet_amount(self) -> int:
+        """ Fixed bet amount of the market, in microAlgos. Read once from the application state. """
+        if self._bet_amount is None:
+            self._bet_amount = self.get_application_state()[AlgoBet.bet_amount.str_key()]
+        return self._bet_amount
+
+    @property
+    def bet_template(self) -> BetTemplate:
+        """ Template of the bet groups of the market, built once. """
+        if self._bet_template is None:
+            self._bet_template = BetTemplate(self.app_id, self.app_addr, self.bet_amount, get_method_spec(AlgoBet.bet))
+        return self._bet_template
+
+    def is_opted_in(self, account: str = None) -> bool:
+        """ Return True if the account (default: the client sender) is opted in the application. """
+        try:
+            self.client.account_application_info(account or self.get_sender(), self.app_id)
+        except AlgodHTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+        return True
+
+    def place_bet(self, opt: int, sender: str = None, signer=None,
+                  suggested_params: transaction.SuggestedParams = None) -> ABIResult:
+        """ Place a bet on the given option, opting the sender in if needed.
+
+        The bet deposit and the `bet` call are submitted as one atomic group. If the sender has not opted in the
+        application yet, the `bet` call is made with OnComplete=OptIn, so that onboarding a new participant takes
+        a single application call, a single submission and a single confirmation wait.
+
+        Args:
+            opt: Chosen option.
+            sender: Participant address. Defaults to the client sender.
+            signer: Participant transaction signer. Defaults to the client signer.
+            suggested_params: Suggested params for all the group transactions.
+
+        Returns:
+            The ABI result of the `bet` call.
+        """
+        sp = self.get_suggested_params(suggested_params)
+        signer = self.get_signer(signer)
+        sender = self.get_sender(sender, signer)
+
+        opt_in = not self.is_opted_in(sender)
+        result = self.execute(self.bet_template.compose(opt, sender, signer, sp, opt_in=opt_in))
+
+        return result.abi_results.pop()
+
+    def get_market_state(self) -> dict:
+        """ Return the whole market state, decoded from a dryrun of `get_market_state`.
+
+        Returns:
+            The market state as a dictionary keyed by `MarketState` field names.
+        """
+        return fetch_market_states(self.client, [self.app_id])[0]
+
+    def get_participant_statuses(self, participants: list[str], max_concurrency: int = 4) -> dict[str, dict]:
+        """ Return the status of a list of participants, decoded by dryrun of `get_participant_statuses`.
+
+        Only the local state of this application is fetched for each participant. Participants are split into calls of
+        up to 4 participants, and up to 16 calls are evaluated by each dryrun request. Lookups and dryrun requests are
+        issued with at most `max_concurrency` requests in flight.
+
+        Args:
+            participants: Addresses of the participants.
+            max_concurrency: Maximum number of concurrent algod requests.
+
+        Returns:
+            The status of each participant as a dictionary keyed by `ParticipantStatus` field names, keyed by address.
+        """
+        method = get_method_spec(AlgoBet.get_participant_statuses)
+        fields = list(ParticipantStatus.__annotations__)
+        app = transaction.decode_programs(self.client.application_info(self.app_id))
+        sp = self.params.get()
+
+        def _account(address: str) -> dict:
+            """ Return the participant account information, holding this application local state only. """
+            try:
+                local_state = self.client.account_application_info(address, self.app_id)["app-local-state"]
+            except AlgodHTTPError as e:
+                if e.code == 404:
+                    return {"address": address, "amount": 0}
+                raise
+            return {"address": address, "amount": 0, "apps-local-state": [local_state]}
+
+        def _query(chunk: list[list[str]]) -> list:
+            txns = [
+                transaction.ApplicationNoOpTxn(
+                    app["params"]["creator"], sp, self.app_id,
+                    app_args=[method.get_selector(), method.args[0].type.encode(batch)],
+                    accounts=batch
+                )
+                for batch in chunk
+            ]
+            accounts = [accounts_info[address] for batch in chunk for address in batch]
+            return dryrun_read_only(self.client, method, txns, [app], accounts)
+
+        participants = list(dict.fromkeys(participants))
+        batches = [participants[i:i + self.max_participants_per_query]
+                   for i in range(0, len(participants), self.max_participants_per_query)]
+        chunks = [batches[i:i + calls_per_dryrun] for i in range(0, len(batches), calls_per_dryrun)]
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            accounts_info = dict(zip(participants, pool.map(_account, participants)))
+            values = [value for chunk_values in pool.map(_query, chunks) for value in chunk_values]
+
+        return {
+            address: dict(zip(fields, status))
+            for batch, statuses in zip(batches, values)
+            for address, status in zip(batch, statuses)
+        }
+
+    def pooled_fee_params(self, inner_txns: int, fee_per_txn: int = None,
+                          suggested_params: transaction.SuggestedParams = None) -> transaction.SuggestedParams:
+        """ Return suggested params with a flat fee covering an application call and its inner transactions.
+
+        Args:
+            inner_txns: Number of inner transactions issued by the call, whose fees are pooled.
+            fee_per_txn: Fee paid for each transaction. Defaults to the minimum fee; may be raised under congestion.
+            suggested_params: Suggested params to start from. Defaults to the client ones.
+        """
+        return pooled_fee_params(self.get_suggested_params(suggested_params), inner_txns, fee_per_txn)
+
+    def request_payout(self, sender: str = None, signer=None, fee_per_txn: int = None,
+                       suggested_params: transaction.SuggestedParams = None) -> ABIResult:
+        """ Request the payout of a winning participant, pooling the fee of the payout inner transaction.
+
+        Args:
+            sender: Participant address. Defaults to the client sender.
+            signer: Participant transaction signer. Defaults to the client signer.
+            fee_per_txn: Fee paid for each transaction. Defaults to the minimum fee.
+            suggested_params: Suggested params for the call. Fee is overridden by the pooled flat fee.
+
+        Returns:
+            The ABI result of the `payout` call.
+        """
+        return self.call(
+            AlgoBet.payout,  # noqa
+            sender=sender,
+            signer=signer,
+            suggested_params=self.pooled_fee_params(1, fee_per_txn, suggested_params)
+        )
+
+    def settle_payouts(self, winners: list[str], sender: str = None, signer=None, fee_per_txn: int = None,
+                       suggested_params: transaction.SuggestedParams = None) -> list[ABIResult]:
+        """ Pay a list of winners, on behalf of the sender (e.g. a settlement keeper).
+
+        Winners are split into `settle_payouts` calls of up to 4 winners each, and calls are submitted in atomic
+        groups of up to 16 calls. Each call pays a flat fee covering its own inner payments.
+
+        Args:
+            winners: Addresses of the winning participants to be paid.
+            sender: Keeper address. Defaults to the client sender.
+            signer: Keeper transaction signer. Defaults to the client signer.
+            fee_per_txn: Fee paid for each transaction. Defaults to the minimum fee; may be raised under congestion.
+            suggested_params: Suggested params for all the calls. Fee is overridden by the pooled flat fee.
+
+        Returns:
+            The ABI results of all the `settle_payouts` calls.
+        """
+        return self._call_in_batches(AlgoBet.settle_payouts, "winners", winners,  # noqa
+                                     sender, signer, fee_per_txn, suggested_params)
+
+    def refund_bets(self, bettors: list[str], sender: str = None, signer=None, fee_per_txn: int = None,
+                    suggested_params: transaction.SuggestedParams = None) -> list[ABIResult]:
+        """ Refund the bet amount to a list of participants of a market resolved with no winners, on behalf of the
+        sender (e.g. a settlement keeper).
+
+        Bettors are batched as in `settle_payouts`, with up to 4 bettors per call and up to 16 calls per group.
+
+        Args:
+            bettors: Addresses of the participants to be refunded.
+            sender: Keeper address. Defaults to the client sender.
+            signer: Keeper transaction signer. Defaults to the client signer.
+            fee_per_txn: Fee paid for each transaction. Defaults to the minimum fee; may be raised under congestion.
+            suggested_params: Suggested params for all the calls. Fee is overridden by the pooled flat fee.
+
+        Returns:
+            The ABI results of all the `refund_bets` calls.
+        """
+        return self._call_in_batches(AlgoBet.refund_bets, "bettors", bettors,  # noqa
+                                     sender, signer, fee_per_txn, suggested_params)
+
+    def _call_in_batches(self, method, arg_name: str, addresses: list[str], sender: str, signer, fee_per_txn: int,
+                         suggested_params: transaction.SuggestedParams) -> list[ABIResult]:
+        """ Call a method paying a list of participants, batching the addresses into calls and the calls into groups.
+
+        Each batch is passed both as the `arg_name` method argument and into the foreign accounts array.
+        """
+        sp = self.get_suggested_params(suggested_params)
+        signer = self.get_signer(signer)
+        sender = self.get_sender(sender, signer)
+
+        batches = [addresses[i:i + self.max_winners_per_call]
+                   for i in range(0, len(addresses), self.max_winners_per_call)]
+
+        results = []
+        for g in range(0, len(batches), self.max_group_size):
+            atc = AtomicTransactionComposer()
+            for batch in batches[g:g + self.max_group_size]:
+                self.add_method_call(
+                    atc,
+                    method,
+                    sender=sender,
+                    signer=signer,
+                    # Pool the fees of the inner payments into the outer call
+                    suggested_params=self.pooled_fee_params(len(batch), fee_per_txn, sp),
+                    accounts=batch,
+                    **{arg_name: batch}
+                )
+
+            result = self.execute(atc)
+
+            results.extend(result.abi_results)
+
+        return results
@@ -0,0 +1,204 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+from base64 import b64decode
+from importlib.metadata import version
+
+from algosdk import abi
+from algosdk.atomic_transaction_composer import ABIResult, AtomicTransactionComposer, AtomicTransactionResponse
+from algosdk.future import transaction
+from algosdk.source_map import SourceMap
+from beaker.application import Application
+from beaker.client import ApplicationClient
+
+from .params import suggested_params_provider
+
+# Default directory of the compiled artifacts cache, overridden by the `ALGOBET_CACHE_DIR` environment variable
+default_cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "algobet")
+
+# Versions of the packages compiling the TEAL programs, part of the cache key
+compiler_versions = {package: version(package) for package in ("pyteal", "beaker-pyteal")}
+
+
+def source_files(app_class: type) -> list[str]:
+    """ Return the source files an application is built from: the modules defining the application class, its project
+    base classes and methods, and the project modules they import from, recursively.
+    """
+    root = os.path.dirname(inspect.getfile(app_class))
+    pending = []
+    for cls in app_class.__mro__:
+        pending.append(sys.modules.get(cls.__module__))
+        # Methods may be attached to the class from other modules
+        pending.extend(inspect.getmodule(value) for value in vars(cls).values() if inspect.isfunction(value))
+
+    files = set()
+    while pending:
+        module = pending.pop()
+        filename = getattr(module, "__file__", None)
+        if filename is None or not filename.startswith(root) or filename in files:
+            continue
+        files.add(filename)
+        for value in vars(module).values():
+            pending.append(value if inspect.ismodule(value) else sys.modules.get(getattr(value, "__module__", None)))
+    return sorted(files)
+
+
+class ArtifactCache:
+    """ On-disk cache of the artifacts of beaker applications: the approval and clear TEAL programs and the ABI
+    contract, keyed by the application source and the compiler versions, and the program bytes compiled by algod, keyed
+    by the TEAL program and the algod version.
+
+    Entries are written atomically, thus the cache may be shared by concurrent processes.
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or os.environ.get("ALGOBET_CACHE_DIR", default_cache_dir)
+
+    def source_key(self, app_class: type, teal_version: int) -> str:
+        """ Return the cache key of the programs of an application class. """
+        digest = hashlib.sha256(json.dumps([compiler_versions, teal_version]).encode())
+        for filename in source_files(app_class):
+            with open(filename, "rb") as fp:
+                digest.update(fp.read())
+        return f"{app_class.__name__}-{digest.hexdigest()}"
+
+    def _read(self, name: str) -> dict | None:
+        try:
+            with open(os.path.join(self.directory, name)) as fp:
+                return json.load(fp)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write(self, name: str, entry: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as fp:
+            json.dump(entry, fp)
+        os.replace(tmp, os.path.join(self.directory, name))
+
+    def load_programs(self, app: Application, key: str) -> bool:
+        """ Set the programs and the contract of an application from the cache. Return False if they are missing. """
+        entry = self._read(f"{key}.json")
+        if entry is None:
+            return False
+        app.approval_program, app.clear_program = entry["approval"], entry["clear"]
+        app.contract = abi.Contract.undictify(entry["contract"])
+        return True
+
+    def store_programs(self, app: Application, key: str):
+        """ Store the programs and the contract of a compiled application. """
+        self._write(f"{key}.json", {
+            "approval": app.approval_program,
+            "clear": app.clear_program,
+            "contract": app.contract.dictify(),
+        })
+
+    @staticmethod
+    def compiled_key(teal: str, algod_version: str) -> str:
+        return hashlib.sha256(f"{algod_version}\n{teal}".encode()).hexdigest()
+
+    def load_compiled(self, teal: str, algod_version: str) -> dict | None:
+        """ Return the algod compile response of a TEAL program, if cached. """
+        return self._read(f"compiled-{self.compiled_key(teal, algod_version)}.json")
+
+    def store_compiled(self, teal: str, algod_version: str, result: dict):
+        """ Store the algod compile response of a TEAL program. """
+        self._write(f"compiled-{self.compiled_key(teal, algod_version)}.json", result)
+
+
+# Cached subclass and instance of each application class, by cache directory
+_cached_classes = {}
+_cached_apps = {}
+
+
+def cached_application(app_class: type, cache: ArtifactCache = None) -> Application:
+    """ Return an instance of a beaker application whose programs and contract are loaded from the artifacts cache,
+    instead of being compiled from PyTeal. Programs missing from the cache are compiled once and stored.
+
+    The instance is shared by all the callers within the process, as clients prepared from one another share their
+    application: it must not be modified.
+    """
+    cache = cache or ArtifactCache()
+    if (app_class, cache.directory) in _cached_apps:
+        return _cached_apps[(app_class, cache.directory)]
+
+    if (app_class, cache.directory) not in _cached_classes:
+        def compile(self):
+            key = cache.source_key(app_class, self.teal_version)
+            if not cache.load_programs(self, key):
+                app_class.compile(self)
+                cache.store_programs(self, key)
+
+        # Same name and description, for the same ABI contract
+        _cached_classes[(app_class, cache.directory)] = type(
+            app_class.__name__, (app_class,), {"compile": compile, "__doc__": app_class.__doc__}
+        )
+
+    app = _cached_classes[(app_class, cache.directory)]()
+    _cached_apps[(app_class, cache.directory)] = app
+    return app
+
+
+class CachedApplicationClient(ApplicationClient):
+    """ Application client loading the programs compiled by algod from the artifacts cache. Only the algod version is
+    requested, once per client, when the cached programs are looked up.
+
+    Unless fixed suggested params are given, transactions are built with the suggested params shared by all the
+    clients of the algod client (see `client.params`), following the rounds confirming the calls.
+    """
+
+    def __init__(self, client, app: Application, cache: ArtifactCache = None, **kwargs):
+        super().__init__(client=client, app=app, **kwargs)
+        self.cache = cache or ArtifactCache()
+        self.params = suggested_params_provider(client)
+        self._algod_version = None
+
+    def get_suggested_params(self, sp: transaction.SuggestedParams = None) -> transaction.SuggestedParams:
+        if sp is not None:
+            return sp
+        if self.suggested_params is not None:
+            return self.suggested_params
+        return self.params.get()
+
+    def execute(self, atc: AtomicTransactionComposer) -> AtomicTransactionResponse:
+        """ Execute a transaction group, as `call` does for a single call: logic errors are wrapped into
+        `LogicException`, and the suggested params are refreshed with the confirmed round.
+        """
+        try:
+            result = atc.execute(self.client, 4)
+        except Exception as e:
+            self.params.invalidate_if_dead(e)
+            if "logic" in str(e):
+                raise self.wrap_approval_exception(e)
+            raise
+        self.params.observe_round(result.confirmed_round)
+        return result
+
+    def call(self, *args, **kwargs) -> ABIResult:
+        try:
+            result = super().call(*args, **kwargs)
+        except Exception as e:
+            self.params.invalidate_if_dead(e)
+            raise
+        # Read-only calls are evaluated by dryrun, thus not confirmed
+        self.params.observe_round((result.tx_info or {}).get("confirmed-round"))
+        return result
+
+    @property
+    def algod_version(self) -> str:
+        """ Version of the algod node compiling the programs. """
+        if self._algod_version is None:
+            build = self.client.versions()["build"]
+            self._algod_version = "{major}.{minor}.{build_number}-{commit_hash}".format(**build)
+        return self._algod_version
+
+    def compile(self, teal: str, source_map: bool = False) -> tuple[bytes, str, SourceMap]:
+        result = self.cache.load_compiled(teal, self.algod_version)
+        if result is None or (source_map and "sourcemap" not in result):
+            result = self.client.compile(teal, source_map=source_map)
+            self.cache.store_compiled(teal, self.algod_version, result)
+        src_map = SourceMap(result["sourcemap"]) if source_map else None
+        return b64decode(result["result"]), result["hash"], src_map
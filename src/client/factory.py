@@ -0,0 +1,66 @@
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+from algosdk.future import transaction
+
+from factory import AlgoBetFactory
+from .algobet import pooled_fee_params
+from .cache import ArtifactCache, CachedApplicationClient, cached_application
+
+
+class AlgoBetFactoryClient(CachedApplicationClient):
+    """ Application client for the AlgoBet factory, extending beaker's `ApplicationClient` with market helpers.
+
+    Unless an application instance is given, programs are loaded from the compiled artifacts cache.
+    """
+
+    # Number of inner transactions issued by each `create_market` call: the application-create and the funding payment
+    create_market_inner_txns = 2
+
+    # Maximum number of transactions in an atomic group
+    max_group_size = 16
+
+    def __init__(self, client, app: AlgoBetFactory = None, cache: ArtifactCache = None, **kwargs):
+        super().__init__(
+            client=client, app=app if app is not None else cached_application(AlgoBetFactory, cache), cache=cache,
+            **kwargs
+        )
+
+    def create_markets(self, markets: list[dict], sender: str = None, signer=None, fee_per_txn: int = None,
+                       suggested_params: transaction.SuggestedParams = None) -> list[int]:
+        """ Create and fund a list of AlgoBet markets, on behalf of the factory manager.
+
+        Markets are created with one `create_market` call each, submitted in atomic groups of up to 16 calls. Each
+        call pays a flat fee covering its own inner transactions.
+
+        Args:
+            markets: `create_market` arguments of each market, e.g. `manager_addr`, `oracle_addr`, timestamps,
+                `payout_time_window_s` and `options_count`.
+            sender: Factory manager address. Defaults to the client sender.
+            signer: Factory manager transaction signer. Defaults to the client signer.
+            fee_per_txn: Fee paid for each transaction. Defaults to the minimum fee; may be raised under congestion.
+            suggested_params: Suggested params for all the calls. Fee is overridden by the pooled flat fee.
+
+        Returns:
+            The application ids of the created markets, in the same order as `markets`.
+        """
+        sp = pooled_fee_params(self.get_suggested_params(suggested_params), self.create_market_inner_txns, fee_per_txn)
+        signer = self.get_signer(signer)
+        sender = self.get_sender(sender, signer)
+
+        app_ids = []
+        for g in range(0, len(markets), self.max_group_size):
+            atc = AtomicTransactionComposer()
+            for market in markets[g:g + self.max_group_size]:
+                self.add_method_call(
+                    atc,
+                    AlgoBetFactory.create_market,  # noqa
+                    sender=sender,
+                    signer=signer,
+                    suggested_params=sp,
+                    **market
+                )
+
+            result = self.execute(atc)
+
+            app_ids.extend(r.return_value for r in result.abi_results)
+
+        return app_ids
@@ -0,0 +1,107 @@
+""" Bulk ingestion of bets, packing the bets of many participants into full atomic groups.
+
+A bet is a deposit and a `bet` call, thus up to 8 participants share a group of 16 transactions: a burst of bets needs
+8 times fewer submissions and confirmation waits than placing each bet on its own. Orders are read from the stream as
+fast as groups are confirmed, i.e. with backpressure: at most `max_queued_groups` groups wait for a submission slot of
+the asyncio client, which bounds the groups in flight.
+"""
+import asyncio
+from typing import TYPE_CHECKING, AsyncIterable, Iterable
+
+from .aio import AsyncAlgoBetClient, GroupRejectedError
+
+if TYPE_CHECKING:
+    from algosdk.atomic_transaction_composer import ABIResult, TransactionSigner
+
+# Maximum number of bets packed into an atomic group: a deposit and a call each, in a group of 16 transactions
+max_bets_per_group = 16 // 2
+
+
+class BetIngestor:
+    """ Places a stream of bets in atomic groups of several participants, through an asyncio client.
+
+    Since a group is atomic, a single failing bet (e.g. of a participant who has already bet) rejects the whole group:
+    the bets of a group rejected by the node are then placed one by one, so that the failure is isolated.
+    """
+
+    def __init__(self, client: AsyncAlgoBetClient, bets_per_group: int = max_bets_per_group,
+                 max_queued_groups: int = None):
+        """
+        Args:
+            client: Asyncio client of the market, bounding the groups in flight.
+            bets_per_group: Number of bets packed into each group, at most `max_bets_per_group`.
+            max_queued_groups: Maximum number of packed groups waiting for submission. Defaults to the maximum number
+                of groups in flight of the client.
+        """
+        if not 0 < bets_per_group <= max_bets_per_group:
+            raise ValueError(f"Bets per group must be between 1 and {max_bets_per_group}")
+        self.client = client
+        self.bets_per_group = bets_per_group
+        self.max_queued_groups = max_queued_groups or client.max_in_flight
+
+    async def place_group(self, bets: list[tuple["TransactionSigner", int]]) -> list["ABIResult | Exception"]:
+        """ Place a group of bets, falling back to placing them one by one if the node rejects the group on submission.
+
+        Returns:
+            The ABI result of each `bet` call, or the exception raised by its submission, in the same order as `bets`.
+        """
+        try:
+            return await self.client.place_bet_group(bets)
+        except GroupRejectedError:
+            # Nothing was committed: isolate the failing bets. Errors raised once the group was accepted, e.g. while
+            # reading its confirmation, are the results of all the bets instead, as the group may have been committed
+            if len(bets) == 1:
+                raise
+            return list(await asyncio.gather(
+                *(self.client.place_bet(signer, opt) for signer, opt in bets), return_exceptions=True
+            ))
+
+    async def ingest(self, orders: Iterable | AsyncIterable) -> list["ABIResult | Exception"]:
+        """ Place a stream of bets, packed into atomic groups.
+
+        Args:
+            orders: Signer and chosen option of each bet, as an iterable or an async iterable. Each participant may bet
+                once only.
+
+        Returns:
+            The ABI result of each `bet` call, or the exception raised by its submission, in the same order as `orders`.
+        """
+        queue = asyncio.Queue(maxsize=self.max_queued_groups)
+        results = {}
+
+        async def pack():
+            group, start = [], 0
+            try:
+                async for order in _aiter(orders):
+                    group.append(order)
+                    if len(group) == self.bets_per_group:
+                        # Wait for a free queue slot: orders are not read faster than groups are submitted
+                        await queue.put((start, group))
+                        group, start = [], start + len(group)
+                if group:
+                    await queue.put((start, group))
+            finally:
+                for _ in range(self.client.max_in_flight):
+                    await queue.put(None)
+
+        async def submit():
+            while (item := await queue.get()) is not None:
+                start, group = item
+                try:
+                    group_results = await self.place_group(group)
+                except Exception as e:
+                    group_results = [e] * len(group)
+                results.update(enumerate(group_results, start))
+
+        await asyncio.gather(pack(), *(submit() for _ in range(self.client.max_in_flight)))
+        return [results[i] for i in range(len(results))]
+
+
+async def _aiter(orders):
+    """ Iterate over an iterable or an async iterable. """
+    if isinstance(orders, AsyncIterable):
+        async for order in orders:
+            yield order
+    else:
+        for order in orders:
+            yield order
@@ -0,0 +1,299 @@
+""" Lightweight AlgoBet client, for processes interacting with already deployed markets only.
+
+It depends on the ABI contract description exported by `src/teal/compile.py` only: neither PyTeal, nor beaker, nor the
+`AlgoBet` application are imported, and the algosdk modules are imported on first use.
+"""
+import base64
+import copy
+import json
+import os
+from typing import TYPE_CHECKING, Callable
+
+from .params import suggested_params_provider
+from .template import BetTemplate
+
+if TYPE_CHECKING:
+    from algosdk import abi
+    from algosdk.atomic_transaction_composer import (
+        ABIResult, AtomicTransactionComposer, AtomicTransactionResponse, TransactionSigner
+    )
+    from algosdk.future import transaction
+    from algosdk.v2client import algod
+
+# ABI contract description exported along with the compiled programs
+default_contract_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "teal", "contract.json")
+
+# Contract of each description file, loaded once per process
+_contracts = {}
+
+
+def load_contract(filename: str = default_contract_file) -> "abi.Contract":
+    """ Return the ABI contract stored in a JSON description file. """
+    if filename not in _contracts:
+        from algosdk import abi
+
+        with open(filename) as fp:
+            _contracts[filename] = abi.Contract.undictify(json.load(fp))
+    return _contracts[filename]
+
+
+def pooled_fee_params(suggested_params: "transaction.SuggestedParams", inner_txns: int,
+                      fee_per_txn: int = None) -> "transaction.SuggestedParams":
+    """ Return a copy of suggested params with a flat fee covering an application call and its inner transactions.
+
+    Args:
+        suggested_params: Suggested params to start from.
+        inner_txns: Number of inner transactions issued by the call, whose fees are pooled.
+        fee_per_txn: Fee paid for each transaction. Defaults to the minimum fee; may be raised under congestion.
+    """
+    from algosdk import constants
+
+    sp = copy.copy(suggested_params)
+    if fee_per_txn is None:
+        fee_per_txn = sp.min_fee or constants.MIN_TXN_FEE
+    sp.flat_fee = True
+    sp.fee = fee_per_txn * (1 + inner_txns)
+    return sp
+
+
+def signer_address(signer: "TransactionSigner") -> str:
+    """ Return the address of the account signing with a transaction signer, as beaker's `ApplicationClient`. """
+    from algosdk.account import address_from_private_key
+    from algosdk.atomic_transaction_composer import (
+        AccountTransactionSigner, LogicSigTransactionSigner, MultisigTransactionSigner
+    )
+
+    match signer:
+        case AccountTransactionSigner():
+            return address_from_private_key(signer.private_key)
+        case MultisigTransactionSigner():
+            return signer.msig.address()
+        case LogicSigTransactionSigner():
+            return signer.lsig.address()
+    raise ValueError(f"Cannot resolve the sender of a {type(signer).__name__}")
+
+
+class AlgoBetLiteClient:
+    """ Client of a deployed AlgoBet market, built on the ABI contract description only. """
+
+    def __init__(self, client: "algod.AlgodClient", app_id: int, signer: "TransactionSigner" = None,
+                 sender: str = None, contract_file: str = default_contract_file):
+        """
+        Args:
+            client: Algod client.
+            app_id: Application id of the market.
+            signer: Default transaction signer. If not given, a signer must be given to each call.
+            sender: Default sender address. Defaults to the address of the default signer.
+            contract_file: ABI contract description of AlgoBet.
+        """
+        self.client = client
+        self.app_id = app_id
+        self.signer = signer
+        self.sender = sender if sender is not None or signer is None else signer_address(signer)
+        self.contract_file = contract_file
+        # Suggested params shared by all the clients of the algod client
+        self.params = suggested_params_provider(client)
+        # Application address and fixed bet amount, lazily computed
+        self._app_addr = None
+        self._bet_amount = None
+        self._bet_template = None
+
+    @property
+    def contract(self) -> "abi.Contract":
+        return load_contract(self.contract_file)
+
+    @property
+    def app_addr(self) -> str:
+        if self._app_addr is None:
+            from algosdk.logic import get_application_address
+
+            self._app_addr = get_application_address(self.app_id)
+        return self._app_addr
+
+    @property
+    def bet_amount(self) -> int:
+        """ Fixed bet amount of the market, in microAlgos. Read once from the application state. """
+        if self._bet_amount is None:
+            global_state = self.client.application_info(self.app_id)["params"]["global-state"]
+            self._bet_amount = next(
+                kv["value"]["uint"] for kv in global_state if base64.b64decode(kv["key"]) == b"bet_amount"
+            )
+        return self._bet_amount
+
+    @property
+    def bet_template(self) -> BetTemplate:
+        """ Template of the bet groups of the market, built once. """
+        if self._bet_template is None:
+            self._bet_template = BetTemplate(self.app_id, self.app_addr, self.bet_amount,
+                                             self.contract.get_method_by_name("bet"))
+        return self._bet_template
+
+    def get_sender_and_signer(self, sender: str = None,
+                              signer: "TransactionSigner" = None) -> tuple[str, "TransactionSigner"]:
+        """ Return the sender and the signer of a call: the given ones, or the client defaults. The sender defaults to
+        the address of a given signer.
+        """
+        if signer is None:
+            if self.signer is None:
+                raise ValueError("No signer provided")
+            return sender or self.sender, self.signer
+        return sender or signer_address(signer), signer
+
+    def is_opted_in(self, account: str = None) -> bool:
+        """ Return True if the account (default: the client sender) is opted in the application. """
+        from algosdk.error import AlgodHTTPError
+
+        try:
+            self.client.account_application_info(account or self.sender, self.app_id)
+        except AlgodHTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+        return True
+
+    ###########################################
+    # Transaction groups
+    ###########################################
+
+    def compose_call(self, method: str, args: list, sender: str, signer: "TransactionSigner",
+                     suggested_params: "transaction.SuggestedParams", on_complete=None,
+                     atc: "AtomicTransactionComposer" = None, **kwargs) -> "AtomicTransactionComposer":
+        """ Return the transaction group of an AlgoBet ABI method call, ready to be signed and submitted.
+
+        Args:
+            method: Method name.
+            args: Method arguments, transactions with signer included.
+            sender: Sender address.
+            signer: Transaction signer.
+            suggested_params: Suggested params.
+            on_complete: OnComplete of the application call. Defaults to NoOp.
+            atc: Transaction group the call is appended to. Defaults to a new group.
+            kwargs: Further `AtomicTransactionComposer.add_method_call` arguments, e.g. `accounts`.
+        """
+        from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+        from algosdk.future import transaction
+
+        if atc is None:
+            atc = AtomicTransactionComposer()
+        atc.add_method_call(
+            app_id=self.app_id,
+            method=self.contract.get_method_by_name(method),
+            sender=sender,
+            sp=suggested_params,
+            signer=signer,
+            method_args=args,
+            on_complete=on_complete or transaction.OnComplete.NoOpOC,
+            **kwargs
+        )
+        return atc
+
+    def compose_opt_in(self, sender: str, signer: "TransactionSigner",
+                       suggested_params: "transaction.SuggestedParams") -> "AtomicTransactionComposer":
+        """ Return the transaction group of the bare opt-in call. """
+        from algosdk.atomic_transaction_composer import AtomicTransactionComposer, TransactionWithSigner
+        from algosdk.future import transaction
+
+        atc = AtomicTransactionComposer()
+        atc.add_transaction(TransactionWithSigner(
+            txn=transaction.ApplicationOptInTxn(sender, suggested_params, self.app_id),
+            signer=signer
+        ))
+        return atc
+
+    def compose_bet(self, opt: int, sender: str, signer: "TransactionSigner",
+                    suggested_params: "transaction.SuggestedParams",
+                    opt_in: bool = False, atc: "AtomicTransactionComposer" = None) -> "AtomicTransactionComposer":
+        """ Return the transaction group of a bet: the deposit and the `bet` call, opting the sender in if `opt_in`.
+        The bet is appended to `atc` if given, so that the bets of several participants may share an atomic group.
+        The group is built from the bet template of the market.
+        """
+        return self.bet_template.compose(opt, sender, signer, suggested_params, opt_in=opt_in, atc=atc)
+
+    def compose_payout(self, sender: str, signer: "TransactionSigner", suggested_params: "transaction.SuggestedParams",
+                       fee_per_txn: int = None) -> "AtomicTransactionComposer":
+        """ Return the transaction group of a `payout` call, pooling the fee of the payout inner transaction. """
+        sp = pooled_fee_params(suggested_params, 1, fee_per_txn)
+        return self.compose_call("payout", [], sender, signer, sp)
+
+    def compose_set_event_result(self, opt: int, sender: str, signer: "TransactionSigner",
+                                 suggested_params: "transaction.SuggestedParams") -> "AtomicTransactionComposer":
+        """ Return the transaction group of a `set_event_result` call. """
+        return self.compose_call("set_event_result", [opt], sender, signer, suggested_params)
+
+    ###########################################
+    # Calls
+    ###########################################
+
+    def execute(self, compose: Callable[["transaction.SuggestedParams"], "AtomicTransactionComposer"],
+                suggested_params: "transaction.SuggestedParams" = None) -> "AtomicTransactionResponse":
+        """ Build a transaction group with the given suggested params, or else the shared ones, and execute it.
+
+        If the shared params turn out to be dead, they are refreshed and the group is built and executed once more.
+
+        Args:
+            compose: Function building the transaction group from suggested params.
+            suggested_params: Suggested params. Defaults to the shared ones.
+        """
+        from algosdk.error import AlgodHTTPError
+
+        try:
+            result = compose(suggested_params or self.params.get()).execute(self.client, 4)
+        except AlgodHTTPError as e:
+            if suggested_params is not None or not self.params.invalidate_if_dead(e):
+                raise
+            result = compose(self.params.get()).execute(self.client, 4)
+        self.params.observe_round(result.confirmed_round)
+        return result
+
+    def call(self, method: str, args: list = None, sender: str = None, signer: "TransactionSigner" = None,
+             suggested_params: "transaction.SuggestedParams" = None, on_complete=None, **kwargs) -> "ABIResult":
+        """ Call an AlgoBet ABI method by name, waiting for its confirmation.
+
+        Args:
+            method: Method name.
+            args: Method arguments, transactions with signer included.
+            sender: Sender address. Defaults to the client sender.
+            signer: Transaction signer. Defaults to the client signer.
+            suggested_params: Suggested params. Defaults to the shared ones.
+            on_complete: OnComplete of the application call. Defaults to NoOp.
+            kwargs: Further `AtomicTransactionComposer.add_method_call` arguments, e.g. `accounts`.
+
+        Returns:
+            The ABI result of the call.
+        """
+        sender, signer = self.get_sender_and_signer(sender, signer)
+        return self.execute(
+            lambda sp: self.compose_call(method, args or [], sender, signer, sp, on_complete, **kwargs),
+            suggested_params
+        ).abi_results.pop()
+
+    def opt_in(self, sender: str = None, signer: "TransactionSigner" = None,
+               suggested_params: "transaction.SuggestedParams" = None) -> str:
+        """ Opt the sender in the application with the bare opt-in call. Return the transaction id. """
+        sender, signer = self.get_sender_and_signer(sender, signer)
+        return self.execute(lambda sp: self.compose_opt_in(sender, signer, sp), suggested_params).tx_ids.pop()
+
+    def place_bet(self, opt: int, sender: str = None, signer: "TransactionSigner" = None,
+                  suggested_params: "transaction.SuggestedParams" = None) -> "ABIResult":
+        """ Place a bet on the given option, opting the sender in if needed, as `AlgoBetClient.place_bet`. """
+        sender, signer = self.get_sender_and_signer(sender, signer)
+        opt_in = not self.is_opted_in(sender)
+        return self.execute(
+            lambda sp: self.compose_bet(opt, sender, signer, sp, opt_in=opt_in), suggested_params
+        ).abi_results.pop()
+
+    def request_payout(self, sender: str = None, signer: "TransactionSigner" = None, fee_per_txn: int = None,
+                       suggested_params: "transaction.SuggestedParams" = None) -> "ABIResult":
+        """ Request the payout of a winning participant, pooling the fee of the payout inner transaction. """
+        sender, signer = self.get_sender_and_signer(sender, signer)
+        return self.execute(
+            lambda sp: self.compose_payout(sender, signer, sp, fee_per_txn), suggested_params
+        ).abi_results.pop()
+
+    def set_event_result(self, opt: int, sender: str = None, signer: "TransactionSigner" = None,
+                         suggested_params: "transaction.SuggestedParams" = None) -> "ABIResult":
+        """ Set the winning option of the event, on behalf of the oracle. """
+        sender, signer = self.get_sender_and_signer(sender, signer)
+        return self.execute(
+            lambda sp: self.compose_set_event_result(opt, sender, signer, sp), suggested_params
+        ).abi_results.pop()
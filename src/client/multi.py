@@ -0,0 +1,45 @@
+from typing import TYPE_CHECKING
+
+from .lite import AlgoBetLiteClient, default_contract_file
+
+if TYPE_CHECKING:
+    from algosdk.atomic_transaction_composer import ABIResult, TransactionSigner
+    from algosdk.future import transaction
+    from algosdk.v2client import algod
+
+
+class AlgoBetMultiSignerClient(AlgoBetLiteClient):
+    """ Client of a deployed AlgoBet market shared by any number of participants.
+
+    The ABI contract and its method objects (loaded once per process), the application address and the bet amount are
+    held once per market, instead of once per participant as with clients prepared for each signer. The signer is
+    given to each call, and the sender is the signer address.
+    """
+
+    def __init__(self, client: "algod.AlgodClient", app_id: int, contract_file: str = default_contract_file):
+        """
+        Args:
+            client: Algod client.
+            app_id: Application id of the market.
+            contract_file: ABI contract description of AlgoBet.
+        """
+        super().__init__(client, app_id, contract_file=contract_file)
+
+    def opt_in(self, signer: "TransactionSigner", suggested_params: "transaction.SuggestedParams" = None) -> str:
+        """ Opt the signer account in the application with the bare opt-in call. Return the transaction id. """
+        return super().opt_in(signer=signer, suggested_params=suggested_params)
+
+    def place_bet(self, signer: "TransactionSigner", opt: int,
+                  suggested_params: "transaction.SuggestedParams" = None) -> "ABIResult":
+        """ Place a bet of the signer account on the given option, opting it in if needed. """
+        return super().place_bet(opt, signer=signer, suggested_params=suggested_params)
+
+    def request_payout(self, signer: "TransactionSigner", fee_per_txn: int = None,
+                       suggested_params: "transaction.SuggestedParams" = None) -> "ABIResult":
+        """ Request the payout of the signer account, pooling the fee of the payout inner transaction. """
+        return super().request_payout(signer=signer, fee_per_txn=fee_per_txn, suggested_params=suggested_params)
+
+    def set_event_result(self, signer: "TransactionSigner", opt: int,
+                         suggested_params: "transaction.SuggestedParams" = None) -> "ABIResult":
+        """ Set the winning option of the event, on behalf of the oracle account of the signer. """
+        return super().set_event_result(opt, signer=signer, suggested_params=suggested_params)
@@ -0,0 +1,95 @@
+""" Suggested transaction params shared by all the AlgoBet clients of an algod client.
+
+Fetching suggested params costs an algod round trip, while the params of a round stay valid for about 1000 rounds: a
+provider fetches them once and serves copies until they are stale, i.e. when:
+  - a round observed by the callers, e.g. as the confirmed round of a transaction, nears their last valid round;
+  - their time to live has expired, so that fee changes are followed;
+  - they are invalidated, e.g. after a submission rejected with a "txn dead" error (last valid round passed).
+
+The first valid round of the copies follows the observed rounds, so that identical transactions built after a
+confirmation, e.g. the same call made twice, still get distinct transaction ids.
+"""
+import copy
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from algosdk.future import transaction
+    from algosdk.v2client import algod
+
+# Default time to live of suggested params, in seconds
+default_params_ttl_s = 60.0
+
+# Number of rounds before their last valid round at which suggested params are refreshed, leaving transactions built
+# from them the time to be confirmed
+refresh_margin_rounds = 20
+
+
+def is_txn_dead(e: Exception) -> bool:
+    """ Return True if a submission error is due to transactions whose validity rounds have passed. """
+    return "txn dead" in str(e)
+
+
+class SuggestedParamsProvider:
+    """ Provider of the suggested params of an algod client, refreshed when they near their last valid round. Thread
+    safe: concurrent callers needing fresh params wait for a single request.
+    """
+
+    def __init__(self, client: "algod.AlgodClient", ttl_s: float = default_params_ttl_s):
+        """
+        Args:
+            client: Algod client.
+            ttl_s: Time to live of the suggested params, in seconds.
+        """
+        self.client = client
+        self.ttl_s = ttl_s
+        self._params = None
+        self._fetched_at = 0.
+        # Last round observed, either by fetching the params or by callers
+        self._last_round = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> "transaction.SuggestedParams":
+        """ Return a copy of the current suggested params, fetching them if stale. """
+        with self._lock:
+            if (self._params is None or self._last_round + refresh_margin_rounds > self._params.last
+                    or time.monotonic() - self._fetched_at > self.ttl_s):
+                self._params = self.client.suggested_params()
+                self._fetched_at = time.monotonic()
+                self._last_round = max(self._last_round, self._params.first)
+            # Callers may change the fee of their copy
+            params = copy.copy(self._params)
+            params.first = self._last_round
+            return params
+
+    def observe_round(self, round_num: int):
+        """ Record a round reached by the network, e.g. the confirmed round of a transaction. """
+        with self._lock:
+            self._last_round = max(self._last_round, round_num or 0)
+
+    def invalidate(self):
+        """ Fetch the suggested params again on the next request. """
+        with self._lock:
+            self._params = None
+
+    def invalidate_if_dead(self, e: Exception) -> bool:
+        """ Invalidate the suggested params if a submission error is due to dead transactions. Return True if so. """
+        if is_txn_dead(e):
+            self.invalidate()
+            return True
+        return False
+
+
+# Provider of each algod client
+_providers = weakref.WeakKeyDictionary()
+_providers_lock = threading.Lock()
+
+
+def suggested_params_provider(client: "algod.AlgodClient") -> SuggestedParamsProvider:
+    """ Return the suggested params provider shared by all the users of an algod client. """
+    with _providers_lock:
+        if client not in _providers:
+            _providers[client] = SuggestedParamsProvider(client)
+        return _providers[client]
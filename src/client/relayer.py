@@ -0,0 +1,133 @@
+""" Relayer mode: a fee payer submits the bets of many participants and pays all their fees.
+
+The relayer builds an atomic group made of its own fee payment followed by the deposit and the `bet` call of each
+participant, both with a zero fee: the fee payment covers the fees of the whole group, as fees are pooled across the
+transactions of a group. The participants sign their own transactions of the group (e.g. in their wallets) and hand
+them back to the relayer, which submits the group. Participants thus only need the bet amount and the minimum balance
+of the application opt-in, and the relayer aggregates the submissions of all of them.
+
+The contract asserts that each deposit is sent by the participant placing the bet, so that the relayer cannot credit a
+deposit to another participant.
+"""
+import copy
+from typing import TYPE_CHECKING
+
+from algosdk import error
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer, TransactionSigner, TransactionWithSigner
+)
+from algosdk.future import transaction
+
+from .lite import AlgoBetLiteClient, default_contract_file, pooled_fee_params
+
+if TYPE_CHECKING:
+    from algosdk.atomic_transaction_composer import ABIResult
+    from algosdk.v2client import algod
+
+# Maximum number of bets relayed in a group of 16 transactions: the fee payment, then a deposit and a call for each bet
+max_relayed_bets = (16 - 1) // 2
+
+
+class PresignedTransactionSigner(TransactionSigner):
+    """ Signer of transactions signed beforehand by their senders, e.g. in their wallets. """
+
+    def __init__(self):
+        super().__init__()
+        # Signed transactions, by transaction id
+        self.signed_txns: dict[str, transaction.SignedTransaction] = {}
+
+    def sign_transactions(self, txn_group: list[transaction.Transaction],
+                          indexes: list[int]) -> list[transaction.SignedTransaction]:
+        missing = [i for i in indexes if txn_group[i].get_txid() not in self.signed_txns]
+        if missing:
+            raise error.AtomicTransactionComposerError(f"Transactions {missing} of the group are not signed")
+        return [self.signed_txns[txn_group[i].get_txid()] for i in indexes]
+
+
+class RelayedBets:
+    """ Group of bets relayed by a fee payer, waiting for the signatures of the participants. """
+
+    def __init__(self, atc: AtomicTransactionComposer, presigned: PresignedTransactionSigner):
+        self.atc = atc
+        self.presigned = presigned
+        self.txns = [t.txn for t in atc.build_group()]
+
+    def transactions(self, sender: str) -> list[transaction.Transaction]:
+        """ Return the transactions of the group to be signed by a participant: its deposit and its `bet` call. """
+        return [txn for txn in self.txns[1:] if txn.sender == sender]
+
+    def add_signed(self, signed_txns: list[transaction.SignedTransaction]):
+        """ Add transactions of the group signed by a participant. """
+        txids = {txn.get_txid() for txn in self.txns[1:]}
+        for stxn in signed_txns:
+            if stxn.transaction.get_txid() not in txids:
+                raise ValueError(f"Transaction {stxn.transaction.get_txid()} is not part of the group")
+            self.presigned.signed_txns[stxn.transaction.get_txid()] = stxn
+
+    @property
+    def signed(self) -> bool:
+        """ True if all the participants have signed their transactions. """
+        return all(txn.get_txid() in self.presigned.signed_txns for txn in self.txns[1:])
+
+
+class AlgoBetRelayerClient(AlgoBetLiteClient):
+    """ Client of a deployed AlgoBet market, relaying the bets of participants and paying their fees. The signer of
+    the client is the fee payer.
+    """
+
+    def __init__(self, client: "algod.AlgodClient", app_id: int, signer: TransactionSigner, sender: str = None,
+                 contract_file: str = default_contract_file):
+        """
+        Args:
+            client: Algod client.
+            app_id: Application id of the market.
+            signer: Transaction signer of the fee payer.
+            sender: Address of the fee payer. Defaults to the address of the signer.
+            contract_file: ABI contract description of AlgoBet.
+        """
+        super().__init__(client, app_id, signer=signer, sender=sender, contract_file=contract_file)
+
+    def compose_relayed_bets(self, bets: list[tuple[str, int]], suggested_params: transaction.SuggestedParams = None,
+                             fee_per_txn: int = None) -> RelayedBets:
+        """ Return the group relaying the bets of participants, opting them in if needed, to be signed by them.
+
+        Args:
+            bets: Participant address and chosen option of each bet, at most `max_relayed_bets`.
+            suggested_params: Suggested params. Defaults to the shared ones.
+            fee_per_txn: Fee paid for each transaction of the group. Defaults to the minimum fee.
+        """
+        if not 0 < len(bets) <= max_relayed_bets:
+            raise ValueError(f"A group relays from 1 to {max_relayed_bets} bets")
+        sp = suggested_params or self.params.get()
+
+        # The fee payment covers the fees of the whole group
+        atc = AtomicTransactionComposer()
+        atc.add_transaction(TransactionWithSigner(
+            txn=transaction.PaymentTxn(self.sender, pooled_fee_params(sp, 2 * len(bets), fee_per_txn), self.sender, 0),
+            signer=self.signer
+        ))
+        zero_fee_sp = copy.copy(sp)
+        zero_fee_sp.flat_fee = True
+        zero_fee_sp.fee = 0
+        presigned = PresignedTransactionSigner()
+        for sender, opt in bets:
+            self.compose_bet(opt, sender, presigned, zero_fee_sp, opt_in=not self.is_opted_in(sender), atc=atc)
+        return RelayedBets(atc, presigned)
+
+    def relay_bets(self, bets: RelayedBets) -> list["ABIResult"]:
+        """ Submit a group of relayed bets signed by all the participants, waiting for its confirmation. A group
+        rejected with a "txn dead" error must be composed and signed again.
+
+        Returns:
+            The ABI result of each `bet` call.
+        """
+        if not bets.signed:
+            raise ValueError("The group is not signed by all the participants")
+        try:
+            result = bets.atc.execute(self.client, 4)
+        except error.AlgodHTTPError as e:
+            # Groups composed from now on get fresh suggested params
+            self.params.invalidate_if_dead(e)
+            raise
+        self.params.observe_round(result.confirmed_round)
+        return result.abi_results
@@ -0,0 +1,70 @@
+""" Transaction signing in a process pool, for processes signing for many accounts at a high rate.
+
+Signing a transaction (encoding it and computing its Ed25519 signature) is CPU bound and holds the GIL for most of its
+time, thus signing in the calling thread serializes with the other work of the process, e.g. network I/O. Signers of a
+`SigningPool` are account signers signing in the worker processes of the pool instead: they can be given to any
+AlgoBet client in place of `AccountTransactionSigner`. The calling thread only waits for the signatures, so that the
+groups signed concurrently by several threads (e.g. by `AsyncAlgoBetClient`) are signed in parallel.
+"""
+import base64
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from algosdk import account
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+from algosdk.future import transaction
+
+
+def _sign_transactions(private_key: str, txns: list[transaction.Transaction]) -> list[bytes]:
+    """ Sign transactions with a private key, in a worker process. Return the signatures only, which are cheaper to
+    send back than the signed transactions.
+    """
+    return [txn.raw_sign(private_key) for txn in txns]
+
+
+class SigningPool:
+    """ Pool of worker processes signing transactions, shared by the signers of any number of accounts. """
+
+    def __init__(self, max_workers: int = None):
+        """
+        Args:
+            max_workers: Number of worker processes. Defaults to the number of processors.
+        """
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self) -> "SigningPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ Stop the worker processes. """
+        self.executor.shutdown()
+
+    def sign(self, private_key: str, txns: list[transaction.Transaction]) -> Future:
+        """ Sign transactions in a worker process. Return the future of their signatures. """
+        return self.executor.submit(_sign_transactions, private_key, txns)
+
+    def signer(self, private_key: str) -> "PoolTransactionSigner":
+        """ Return the signer of an account, signing in the pool. """
+        return PoolTransactionSigner(self, private_key)
+
+
+class PoolTransactionSigner(AccountTransactionSigner):
+    """ Account signer signing in the worker processes of a `SigningPool`. """
+
+    def __init__(self, pool: SigningPool, private_key: str):
+        super().__init__(private_key)
+        self.pool = pool
+        self.address = account.address_from_private_key(private_key)
+
+    def sign_transactions(self, txn_group: list[transaction.Transaction],
+                          indexes: list[int]) -> list[transaction.SignedTransaction]:
+        txns = [txn_group[i] for i in indexes]
+        signatures = self.pool.sign(self.private_key, txns).result()
+        return [
+            # The signer is the authorizing address of transactions sent by rekeyed accounts, as `Transaction.sign`
+            transaction.SignedTransaction(txn, base64.b64encode(sig).decode(),
+                                          None if txn.sender == self.address else self.address)
+            for txn, sig in zip(txns, signatures)
+        ]
@@ -0,0 +1,87 @@
+""" Transaction templates of the bets on a market.
+
+The transactions of a bet only differ from a bet to another on the same market by their sender, the chosen option,
+the suggested params (validity rounds, fee, genesis) and the OnComplete of the opt-in: the method selector, the
+application id, the application address and the bet amount are fixed by the market. A `BetTemplate` builds the deposit
+and the `bet` call once, with the ABI encodings done, and composes each bet from copies of them, patching the fields of
+the bet only, instead of validating and encoding everything again with `AtomicTransactionComposer.add_method_call`.
+
+The algosdk modules are imported on first use, as in `client.lite`.
+"""
+import copy
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from algosdk import abi
+    from algosdk.atomic_transaction_composer import AtomicTransactionComposer, TransactionSigner
+    from algosdk.future import transaction
+
+
+class BetTemplate:
+    """ Template of the transaction group of a bet on a market: the deposit then the `bet` call. """
+
+    def __init__(self, app_id: int, app_addr: str, bet_amount: int, method: "abi.Method"):
+        """
+        Args:
+            app_id: Application id of the market.
+            app_addr: Application address of the market, receiving the deposits.
+            bet_amount: Fixed bet amount of the market, in microAlgos.
+            method: ABI method of `bet`, taking the chosen option then the deposit.
+        """
+        from algosdk.future import transaction
+
+        self.method = method
+        self.opt_type = method.args[0].type
+        self.selector = method.get_selector()
+        # Transactions built once with placeholder params: the fields of each bet are patched on copies of them
+        sp = transaction.SuggestedParams(0, 0, 0, None, flat_fee=True)
+        self.deposit = transaction.PaymentTxn(app_addr, sp, app_addr, bet_amount)
+        self.call = transaction.ApplicationCallTxn(app_addr, sp, app_id, transaction.OnComplete.NoOpOC,
+                                                   app_args=[self.selector, self.opt_type.encode(0)])
+
+    @staticmethod
+    def patch(prototype: "transaction.Transaction", sender: str, suggested_params: "transaction.SuggestedParams",
+              **fields) -> "transaction.Transaction":
+        """ Return a copy of a template transaction with the given sender, suggested params and further fields. """
+        from algosdk import constants
+
+        txn = copy.copy(prototype)
+        txn.sender = sender
+        txn.fee = suggested_params.fee
+        txn.first_valid_round = suggested_params.first
+        txn.last_valid_round = suggested_params.last
+        txn.genesis_id = suggested_params.gen
+        txn.genesis_hash = suggested_params.gh
+        for name, value in fields.items():
+            setattr(txn, name, value)
+        if not suggested_params.flat_fee:
+            # Fee per byte, as in the algosdk transaction constructors; the size is only estimated under congestion
+            txn.fee = max(txn.estimate_size() * txn.fee, constants.min_txn_fee) if txn.fee else constants.min_txn_fee
+        return txn
+
+    def compose(self, opt: int, sender: str, signer: "TransactionSigner",
+                suggested_params: "transaction.SuggestedParams", opt_in: bool = False,
+                atc: "AtomicTransactionComposer" = None) -> "AtomicTransactionComposer":
+        """ Return the transaction group of a bet, identical to the one built with `add_method_call`. The bet is
+        appended to `atc` if given.
+        """
+        from algosdk import error
+        from algosdk.atomic_transaction_composer import AtomicTransactionComposer, TransactionWithSigner
+        from algosdk.future import transaction
+
+        if atc is None:
+            atc = AtomicTransactionComposer()
+        if len(atc.txn_list) + 2 > atc.MAX_GROUP_SIZE:
+            raise error.AtomicTransactionComposerError(
+                "AtomicTransactionComposer cannot exceed MAX_GROUP_SIZE transactions"
+            )
+        call = self.patch(
+            self.call, sender, suggested_params,
+            app_args=[self.selector, self.opt_type.encode(opt)],
+            on_complete=transaction.OnComplete.OptInOC if opt_in else transaction.OnComplete.NoOpOC
+        )
+        atc.add_transaction(TransactionWithSigner(self.patch(self.deposit, sender, suggested_params), signer))
+        atc.add_transaction(TransactionWithSigner(call, signer))
+        # Decode the return value of the call as `add_method_call` does
+        atc.method_dict[len(atc.txn_list) - 1] = self.method
+        return atc
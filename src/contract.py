@@ -1,8 +1,9 @@
 import time
 from math import ceil
-from typing import Final
+from typing import Callable, Final
 
 from algosdk.atomic_transaction_composer import TransactionWithSigner
+from algosdk.encoding import checksum
 from algosdk.future import transaction
 from beaker import (
     consts,
@@ -10,20 +11,72 @@ from beaker import (
     sandbox,
     opt_in,
     ApplicationStateValue,
+    DynamicApplicationStateValue,
     AccountStateValue,
     Authorize,
     delete,
 )
 from beaker.application import Application
-from beaker.client import ApplicationClient
 from beaker.decorators import external, internal
 from pyteal import (
-    Assert, TealType, Global, Int, Approve, abi, Seq, Cond, InnerTxnBuilder, TxnField, TxnType,
-    Txn, Div, Minus, If
+    Assert, TealType, Global, Int, Approve, abi, Seq, InnerTxnBuilder, TxnField, TxnType,
+    Txn, Div, If, Expr, BytesZero, ExtractUint64, Replace, Itob, Bytes, Concat, Extract, For,
+    ScratchVar, And, GetBit, SetBit, ShiftLeft, ShiftRight, BitwiseOr, MethodConfig, CallConfig, Suffix, App,
+    Log, Balance
 )
 
-# microAlgos minimum fee for transactions
-network_min_trans_fee = Int(1000)
+# Number of bet options used when none is given at creation (1, X, 2)
+default_options_count = 3
+
+# Maximum number of bet options supported by an AlgoBet instance
+max_options_count = 60
+
+# Number of option counters packed into each `option_counters` page
+options_per_page = 15
+
+# Size in bytes of each option counter packed into `option_counters`
+option_counter_size = Int(8)
+
+# Layout of the packed `participant_record` account state value
+record_bet_placed_bit = Int(0)
+record_payout_requested_bit = Int(1)
+record_chosen_opt_shift = Int(8)
+
+# ARC-28 signatures of the events logged by AlgoBet. Each log record is the event selector, i.e. the first 4 bytes of
+# the SHA-512/256 hash of the signature, followed by the event fields packed as a static ABI tuple
+bet_placed_event = "BetPlaced(address,uint64)"
+event_result_set_event = "EventResultSet(uint64,uint64,uint64)"
+payout_sent_event = "PayoutSent(address,uint64)"
+bet_refunded_event = "BetRefunded(address,uint64)"
+market_deleted_event = "MarketDeleted(address,uint64)"
+
+
+def event_selector(signature: str) -> bytes:
+    """ Return the ARC-28 selector of an event signature. """
+    return checksum(signature.encode())[:4]
+
+
+class MarketState(abi.NamedTuple):
+    """ Snapshot of the whole state of an AlgoBet market, returned by `AlgoBet.get_market_state`. """
+    manager: abi.Field[abi.Address]
+    oracle_addr: abi.Field[abi.Address]
+    event_start_timestamp: abi.Field[abi.Uint64]
+    event_end_timestamp: abi.Field[abi.Uint64]
+    payout_time_window_s: abi.Field[abi.Uint64]
+    options_count: abi.Field[abi.Uint64]
+    event_result: abi.Field[abi.Uint64]
+    bet_amount: abi.Field[abi.Uint64]
+    stake_amount: abi.Field[abi.Uint64]
+    winning_count: abi.Field[abi.Uint64]
+    winning_payout: abi.Field[abi.Uint64]
+    option_counters: abi.Field[abi.DynamicArray[abi.Uint64]]
+
+
+class ParticipantStatus(abi.NamedTuple):
+    """ Status of a participant, decoded from its record. Returned by `AlgoBet.get_participant_statuses`. """
+    has_placed_bet: abi.Field[abi.Bool]
+    has_requested_payout: abi.Field[abi.Bool]
+    chosen_opt: abi.Field[abi.Uint64]
 
 
 # Create an app subclassing `beaker.Application`
@@ -61,22 +114,17 @@ class AlgoBet(Application):
         descr="Fixed bet amount"
     )
 
-    counter_opt_0: Final[ApplicationStateValue] = ApplicationStateValue(
+    options_count: Final[ApplicationStateValue] = ApplicationStateValue(
         stack_type=TealType.uint64,
-        default=Int(0),
-        descr="Number of bet on '0' event. can be used as a total budget since bet amount is fixed"
+        default=Int(default_options_count),
+        descr="Number of valid bet options"
     )
 
-    counter_opt_1: Final[ApplicationStateValue] = ApplicationStateValue(
-        stack_type=TealType.uint64,
-        default=Int(0),
-        descr="Number of bet on '1' event. can be used as a total budget since bet amount is fixed"
-    )
-
-    counter_opt_2: Final[ApplicationStateValue] = ApplicationStateValue(
-        stack_type=TealType.uint64,
-        default=Int(0),
-        descr="Number of bet on '2' event. can be used as a total budget since bet amount is fixed"
+    option_counters: Final[DynamicApplicationStateValue] = DynamicApplicationStateValue(
+        stack_type=TealType.bytes,
+        max_keys=max_options_count // options_per_page,
+        descr="Number of bets on each option, packed as big-endian uint64 counters into pages of "
+              f"{options_per_page} options. Can be used as a total budget since bet amount is fixed"
     )
 
     stake_amount: Final[ApplicationStateValue] = ApplicationStateValue(
@@ -119,19 +167,10 @@ class AlgoBet(Application):
     # Account State
     ###########################################
 
-    chosen_opt: Final[AccountStateValue] = AccountStateValue(
-        stack_type=TealType.uint64,
-        descr="Bet option chosen by the participant user"
-    )
-
-    has_placed_bet: Final[AccountStateValue] = AccountStateValue(
+    participant_record: Final[AccountStateValue] = AccountStateValue(
         stack_type=TealType.uint64, default=Int(0),
-        descr="Flag to check if the account has already placed a bet"
-    )
-
-    has_requested_payout: Final[AccountStateValue] = AccountStateValue(
-        stack_type=TealType.uint64, default=Int(0),
-        descr="Flag to check if the account has already requested the payout"
+        descr="Participant record: bit 0 flags a placed bet, bit 1 flags a requested payout, "
+              "bits from 8 on hold the bet option chosen by the participant"
     )
 
     ###########################################
@@ -144,7 +183,8 @@ class AlgoBet(Application):
                oracle_addr: abi.Address,
                event_start_unix_timestamp: abi.Uint64,
                event_end_unix_timestamp: abi.Uint64,
-               payout_time_window_s: abi.Uint64):
+               payout_time_window_s: abi.Uint64,
+               options_count: abi.Uint64 = default_options_count):
         """ Create an AlgoBet contract instance, bound to a particular event.
 
         Args:
@@ -153,6 +193,7 @@ class AlgoBet(Application):
             event_start_unix_timestamp: Unix timestamp of event start.
             event_end_unix_timestamp: Unix timestamp of event end.
             payout_time_window_s: Payout time interval, expressed in seconds.
+            options_count: Number of possible event outcomes, between 2 and 60. Defaults to 3.
         """
         return Seq(
             self.initialize_application_state(),
@@ -167,6 +208,12 @@ class AlgoBet(Application):
             self.set_event_start_time(event_start_unix_timestamp),
             self.set_event_end_time(event_end_unix_timestamp),
             self.set_payout_time(payout_time_window_s),
+            # Assert that the number of options fits the option counters pages
+            Assert(
+                And(options_count.get() >= Int(2), options_count.get() <= Int(max_options_count)),
+                comment="Options count must be between 2 and 60."
+            ),
+            self.set_options_count(options_count),
         )
 
     # Authorize only the manager account to request this transaction
@@ -181,43 +228,29 @@ class AlgoBet(Application):
             Assert(Global.latest_timestamp() >= self.event_end_timestamp.get(),
                    comment="Event expiry time not reached, yet."),
             # Assert that the option is valid
-            Assert(
-                Cond(
-                    [opt.get() == Int(0), Int(1)],
-                    [opt.get() == Int(1), Int(1)],
-                    [opt.get() == Int(2), Int(1)],
-                ),
-                comment="Valid options are: 0, 1, 2"
-            ),
+            Assert(opt.get() < self.options_count.get(), comment="Valid options are: 0 to options_count - 1"),
             # Put the winning option into Global State variable "event_result"
             self.event_result.set(opt.get()),
             # Compute the number of winning participants
-            Cond(
-                [opt.get() == Int(0), self.winning_count.set(self.counter_opt_0.get())],
-                [opt.get() == Int(1), self.winning_count.set(self.counter_opt_1.get())],
-                [opt.get() == Int(2), self.winning_count.set(self.counter_opt_2.get())],
-            ),
+            self.winning_count.set(self.option_counter(opt.get())),
             # To avoid division by zero, check if there is a non-zero number of winners
+            # Payout inner transactions fees are pooled from the callers' transactions, thus they are not subtracted
             If(
                 self.winning_count.get() == Int(0),
-                # Compute the (dummy) winning payout as: total_stake - network_min_trans_fee
+                # Compute the (dummy) winning payout as: total_stake. Bets are returned through refund_bets
+                self.winning_payout.set(self.stake_amount.get()),
+                # Compute the winning payout as: total_stake / number_of_winners
                 self.winning_payout.set(
-                    Minus(
+                    Div(
                         self.stake_amount.get(),
-                        network_min_trans_fee
-                    )
-                ),
-                # Compute the winning payout as: (total_stake / number_of_winners) - network_min_trans_fee
-                self.winning_payout.set(
-                    Minus(
-                        Div(
-                            self.stake_amount.get(),
-                            self.winning_count.get()
-                        ),
-                        network_min_trans_fee
+                        self.winning_count.get()
                     )
                 )
             ),
+            self.emit_event(
+                event_result_set_event,
+                Itob(opt.get()), Itob(self.winning_count.get()), Itob(self.winning_payout.get())
+            ),
         )
 
     @delete(authorize=Authorize.only(manager))
@@ -230,6 +263,8 @@ class AlgoBet(Application):
             # Assert that the payout time elapsed
             Assert(Global.latest_timestamp() >= self.event_end_timestamp.get() + self.payout_time_window_s.get(),
                    comment="Payout time not expired, yet."),
+            # Log the balance to be closed out, before the close-out transaction fee
+            self.emit_event(market_deleted_event, Txn.sender(), Itob(Balance(Global.current_application_address()))),
             # Make a transaction for closing out the smart contract account
             InnerTxnBuilder.Execute(
                 {
@@ -282,13 +317,174 @@ class AlgoBet(Application):
         """ Change the time at which deletion is enabled since event end. """
         return self.payout_time_window_s.set(time_s.get())
 
+    @internal(TealType.none)
+    def set_options_count(self, count: abi.Uint64):
+        """ Set the number of bet options and allocate the zeroed option counters pages. """
+        page = ScratchVar(TealType.uint64)
+        return Seq(
+            self.options_count.set(count.get()),
+            For(
+                page.store(Int(0)),
+                page.load() * Int(options_per_page) < count.get(),
+                page.store(page.load() + Int(1))
+            ).Do(
+                self.option_counters[self.option_counters_page_key(page.load())].set(
+                    BytesZero(Int(options_per_page) * option_counter_size)
+                )
+            ),
+        )
+
+    ###########################################
+    # Option counters
+    ###########################################
+
+    @staticmethod
+    def option_counters_page_key(page: Expr) -> Expr:
+        """ Global state key of an `option_counters` page: "opt" followed by the page index byte. """
+        return Concat(Bytes("opt"), Extract(Itob(page), Int(7), Int(1)))
+
+    def option_counters_page(self, opt: Expr) -> ApplicationStateValue:
+        """ Return the `option_counters` page holding the counter of an option. """
+        return self.option_counters[self.option_counters_page_key(opt / Int(options_per_page))]
+
+    @staticmethod
+    def option_counter_offset(opt: Expr) -> Expr:
+        """ Byte offset of the counter of an option within its `option_counters` page. """
+        return (opt % Int(options_per_page)) * option_counter_size
+
+    def option_counter(self, opt: Expr) -> Expr:
+        """ Read the counter of an option from the packed `option_counters` pages. """
+        return ExtractUint64(self.option_counters_page(opt).get(), self.option_counter_offset(opt))
+
+    def increment_option_counter(self, opt: Expr) -> Expr:
+        """ Increase by one the counter of an option, in place within its `option_counters` page. """
+        # Resolve the page key and the offset once, then do a single read-modify-write of the page
+        key = ScratchVar(TealType.bytes)
+        page = ScratchVar(TealType.bytes)
+        offset = ScratchVar(TealType.uint64)
+        return Seq(
+            key.store(self.option_counters_page_key(opt / Int(options_per_page))),
+            page.store(self.option_counters[key.load()].get()),
+            offset.store(self.option_counter_offset(opt)),
+            self.option_counters[key.load()].set(
+                Replace(page.load(), offset.load(), Itob(ExtractUint64(page.load(), offset.load()) + Int(1)))
+            ),
+        )
+
+    ###########################################
+    # Participant records
+    ###########################################
+
+    @staticmethod
+    def record_has_placed_bet(record: Expr) -> Expr:
+        """ Flag telling whether a participant record holds a placed bet. """
+        return GetBit(record, record_bet_placed_bit)
+
+    @staticmethod
+    def record_has_requested_payout(record: Expr) -> Expr:
+        """ Flag telling whether a participant record holds a requested payout. """
+        return GetBit(record, record_payout_requested_bit)
+
+    @staticmethod
+    def record_chosen_opt(record: Expr) -> Expr:
+        """ Bet option stored into a participant record. """
+        return ShiftRight(record, record_chosen_opt_shift)
+
+    @staticmethod
+    def new_bet_record(opt: Expr) -> Expr:
+        """ Participant record of a freshly placed bet on the given option. """
+        return BitwiseOr(ShiftLeft(opt, record_chosen_opt_shift), Int(1))
+
+    def assert_payout_due(self, record: Expr) -> Expr:
+        """ Assert that a participant record is entitled to a payout which has not been paid yet. """
+        return Seq(
+            # Assert that the participant has placed a bet on the winning option
+            Assert(
+                self.record_has_placed_bet(record),
+                comment="You did not place any bet"
+            ),
+            Assert(
+                self.event_result == self.record_chosen_opt(record),
+                comment="You did not choose the winning option"
+            ),
+            # Assert that the participant is not requesting the payout a second time
+            Assert(
+                self.record_has_requested_payout(record) == Int(0),
+                comment="You already requested your payout"
+            ),
+        )
+
+    def assert_refund_due(self, record: Expr) -> Expr:
+        """ Assert that a participant record is entitled to a bet refund which has not been paid yet. """
+        return Seq(
+            Assert(
+                self.record_has_placed_bet(record),
+                comment="You did not place any bet"
+            ),
+            Assert(
+                self.record_has_requested_payout(record) == Int(0),
+                comment="You already requested your refund"
+            ),
+        )
+
+    def pay_participants(self, participants: abi.DynamicArray[abi.Address],
+                         assert_due: Callable[[Expr], Expr], amount: Expr, event: str) -> Expr:
+        """ Pay the same amount to a batch of participants with a single group of inner payments.
+
+        Each participant record is checked with `assert_due`, then flagged as paid out, and each payment is logged as
+        `event`. Inner payments fees are pooled from the outer transaction.
+        """
+        i = ScratchVar(TealType.uint64)
+        record = ScratchVar(TealType.uint64)
+        participant = abi.Address()
+        return Seq(
+            InnerTxnBuilder.Begin(),
+            For(i.store(Int(0)), i.load() < participants.length(), i.store(i.load() + Int(1))).Do(
+                participants[i.load()].store_into(participant),
+                record.store(self.participant_record[participant.get()].get()),
+                # A participant listed twice fails here, since its payout flag has just been set
+                assert_due(record.load()),
+                # Set the 'payout already requested' flag into the participant's record
+                self.participant_record[participant.get()].set(
+                    SetBit(record.load(), record_payout_requested_bit, Int(1))
+                ),
+                self.emit_event(event, participant.get(), Itob(amount)),
+                # Append the participant payment to the inner transactions group
+                If(i.load() > Int(0), InnerTxnBuilder.Next()),
+                InnerTxnBuilder.SetFields(
+                    {
+                        TxnField.type_enum: TxnType.Payment,
+                        TxnField.receiver: participant.get(),
+                        TxnField.amount: amount,
+                        # Fee is pooled from the outer transaction
+                        TxnField.fee: Int(0),
+                    }
+                ),
+            ),
+            InnerTxnBuilder.Submit(),
+        )
+
+    ###########################################
+    # Event logs
+    ###########################################
+
+    @staticmethod
+    def emit_event(signature: str, *fields: Expr) -> Expr:
+        """ Log an ARC-28 event record: the event selector followed by the fields, already encoded as bytes. """
+        return Log(Concat(Bytes(event_selector(signature)), *fields))
+
     ###########################################
     # Exposed Application Calls
     ###########################################
 
-    @external(authorize=Authorize.opted_in(app_id=Application.id))
+    # Callable with OnComplete=OptIn too, so that new participants can opt-in and bet with a single application call.
+    # The participant record is fully written by the bet, thus it needs no separate account state initialization.
+    @external(
+        authorize=Authorize.opted_in(app_id=Application.id),
+        method_config=MethodConfig(no_op=CallConfig.CALL, opt_in=CallConfig.CALL)
+    )
     def bet(self, opt: abi.Uint64, bet_deposit_tx: abi.PaymentTransaction):
-        """ Place a bet.
+        """ Place a bet. May be called with OnComplete=OptIn to opt-in the participant in the same call.
 
         Args:
             opt: Chosen option.
@@ -308,56 +504,54 @@ class AlgoBet(Application):
                 bet_deposit_tx.get().receiver() == self.address,
                 comment="Receiver must be the smart contract"
             ),
+            # Assert that the deposit is paid by the participant, whose transactions may be submitted by a relayer
+            # paying their fees: a deposit cannot be credited to the bet of another participant
+            Assert(
+                bet_deposit_tx.get().sender() == Txn.sender(),
+                comment="Deposit must be sent by the participant"
+            ),
             # Assert that the user has not placed any bet yet
             Assert(
-                self.has_placed_bet.get() == Int(0),
+                self.record_has_placed_bet(self.participant_record.get()) == Int(0),
                 comment="User has already placed a bet"
             ),
             # Assert that the option is valid
-            Assert(
-                Cond(
-                    [opt.get() == Int(0), Int(1)],
-                    [opt.get() == Int(1), Int(1)],
-                    [opt.get() == Int(2), Int(1)],
-                ),
-                comment="Valid options are: 0, 1, 2"
-            ),
-            # Store the chosen option into Local State
-            self.chosen_opt.set(opt.get()),
+            Assert(opt.get() < self.options_count.get(), comment="Valid options are: 0 to options_count - 1"),
+            # Store the chosen option and set the 'bet already placed' flag into the sender's record
+            self.participant_record.set(self.new_bet_record(opt.get())),
             # Increase the chosen option counter
-            Cond(
-                [opt.get() == Int(0), self.counter_opt_0.set(self.counter_opt_0.get() + Int(1))],
-                [opt.get() == Int(1), self.counter_opt_1.set(self.counter_opt_1.get() + Int(1))],
-                [opt.get() == Int(2), self.counter_opt_2.set(self.counter_opt_2.get() + Int(1))],
-            ),
-            # Set the 'bet already placed' flag for the sender account
-            self.has_placed_bet.set(Int(1)),
+            self.increment_option_counter(opt.get()),
             # Increase the stake amount
-            self.stake_amount.set(self.stake_amount.get() + self.bet_amount.get())
+            self.stake_amount.set(self.stake_amount.get() + self.bet_amount.get()),
+            self.emit_event(bet_placed_event, Txn.sender(), Itob(opt.get())),
         )
 
     @external(authorize=Authorize.opted_in(app_id=Application.id))
     def payout(self):
-        """ Request the payout. Only works for winning participants. """
+        """ Request the payout. Only works for winning participants.
+
+        If this transaction pays a fee covering two transactions, the payout inner transaction fee is pooled from it
+        and winners receive the full winning payout. Otherwise, the payout pays its own minimum fee out of the winning
+        payout, as for callers paying a single transaction fee.
+        """
+        record = ScratchVar(TealType.uint64)
+        fee = ScratchVar(TealType.uint64)
         return Seq(
-            # Assert that the participant has chosen the winning option
-            Assert(
-                self.event_result == self.chosen_opt,
-                comment="You did not choose the winning option"
-            ),
-            # Assert that the participant is not requesting the payout a second time
-            Assert(
-                self.has_requested_payout == Int(0),
-                comment="You already requested your payout"
-            ),
-            # Set the 'payout already requested' flag for the sender account
-            self.has_requested_payout.set(Int(1)),
+            record.store(self.participant_record.get()),
+            self.assert_payout_due(record.load()),
+            # Set the 'payout already requested' flag into the sender's record
+            self.participant_record.set(SetBit(record.load(), record_payout_requested_bit, Int(1))),
+            fee.store(If(Txn.fee() >= Global.min_txn_fee() * Int(2), Int(0), Global.min_txn_fee())),
+            self.emit_event(payout_sent_event, Txn.sender(), Itob(self.winning_payout.get() - fee.load())),
             # Make a transaction for payout
             InnerTxnBuilder.Execute(
                 {
                     TxnField.type_enum: TxnType.Payment,
                     TxnField.receiver: Txn.sender(),
-                    TxnField.amount: self.winning_payout.get(),
+                    # The contract pays out the winning payout in both modes, the fee included
+                    TxnField.amount: self.winning_payout.get() - fee.load(),
+                    # Either pooled from the outer transaction or paid out of the winning payout
+                    TxnField.fee: fee.load(),
                     # If close_remainder_to is defined, the Sender account will be closed, and all the
                     # remaining funds, after the fee and amount are paid, will be transferred to it
                     # TxnField.close_remainder_to: Txn.sender(),
@@ -365,8 +559,162 @@ class AlgoBet(Application):
             ),
         )
 
+    @external
+    def settle_payouts(self, winners: abi.DynamicArray[abi.Address]):
+        """ Pay the payout to a batch of winning participants. May be requested by any account, e.g. a keeper.
+
+        Winners must be provided into the foreign accounts array too, thus up to 4 winners may be settled per call.
+        Payouts are sent as a single group of inner payments, whose fees are pooled from the outer transaction:
+        the caller must pay a fee covering 1 + len(winners) transactions.
+
+        Args:
+            winners: Addresses of the winning participants to be paid.
+        """
+        return Seq(
+            Assert(winners.length() > Int(0), comment="No winners to settle"),
+            self.pay_participants(winners, self.assert_payout_due, self.winning_payout.get(), payout_sent_event),
+        )
+
+    @external
+    def refund_bets(self, bettors: abi.DynamicArray[abi.Address]):
+        """ Refund the bet amount to a batch of participants of a market resolved with no winners. May be requested
+        by any account, e.g. a keeper.
+
+        As for `settle_payouts`, up to 4 bettors may be refunded per call with a single group of inner payments,
+        whose fees are pooled from the outer transaction. Refunded bettors are flagged as paid out.
+
+        Args:
+            bettors: Addresses of the participants to be refunded.
+        """
+        return Seq(
+            Assert(bettors.length() > Int(0), comment="No bettors to refund"),
+            # Assert that the event result has been set and no participant chose it
+            Assert(self.event_result.get() < self.options_count.get(), comment="Event result not set, yet."),
+            Assert(self.winning_count.get() == Int(0), comment="The event has winners, refunds are not allowed"),
+            self.pay_participants(bettors, self.assert_refund_due, self.bet_amount.get(), bet_refunded_event),
+            # Keep the stake consistent with the funds still held by the contract
+            self.stake_amount.set(self.stake_amount.get() - self.bet_amount.get() * bettors.length()),
+        )
+
+    ###########################################
+    # Read-only Calls
+    ###########################################
+
+    @external(read_only=True)
+    def get_market_state(self, *, output: MarketState):
+        """ Return the whole market state as a single ABI tuple. Meant to be evaluated off-chain, e.g. by dryrun.
+
+        Returns:
+            The market state, holding one counter per option.
+        """
+        page = ScratchVar(TealType.uint64)
+        packed_counters = ScratchVar(TealType.bytes)
+        manager = abi.Address()
+        oracle_addr = abi.Address()
+        event_start_timestamp = abi.Uint64()
+        event_end_timestamp = abi.Uint64()
+        payout_time_window_s = abi.Uint64()
+        options_count = abi.Uint64()
+        event_result = abi.Uint64()
+        bet_amount = abi.Uint64()
+        stake_amount = abi.Uint64()
+        winning_count = abi.Uint64()
+        winning_payout = abi.Uint64()
+        option_counters = abi.make(abi.DynamicArray[abi.Uint64])
+        return Seq(
+            manager.set(self.manager.get()),
+            oracle_addr.set(self.oracle_addr.get()),
+            event_start_timestamp.set(self.event_start_timestamp.get()),
+            event_end_timestamp.set(self.event_end_timestamp.get()),
+            payout_time_window_s.set(self.payout_time_window_s.get()),
+            options_count.set(self.options_count.get()),
+            event_result.set(self.event_result.get()),
+            bet_amount.set(self.bet_amount.get()),
+            stake_amount.set(self.stake_amount.get()),
+            winning_count.set(self.winning_count.get()),
+            winning_payout.set(self.winning_payout.get()),
+            # Join the option counters pages, which are already encoded as an array of uint64
+            packed_counters.store(Bytes("")),
+            For(
+                page.store(Int(0)),
+                page.load() * Int(options_per_page) < options_count.get(),
+                page.store(page.load() + Int(1))
+            ).Do(
+                packed_counters.store(
+                    Concat(packed_counters.load(), self.option_counters[self.option_counters_page_key(page.load())])
+                )
+            ),
+            # Prefix the array length as uint16 and drop the unused counters of the last page
+            option_counters.decode(
+                Concat(
+                    Suffix(Itob(options_count.get()), Int(6)),
+                    Extract(packed_counters.load(), Int(0), options_count.get() * option_counter_size)
+                )
+            ),
+            output.set(
+                manager,
+                oracle_addr,
+                event_start_timestamp,
+                event_end_timestamp,
+                payout_time_window_s,
+                options_count,
+                event_result,
+                bet_amount,
+                stake_amount,
+                winning_count,
+                winning_payout,
+                option_counters,
+            ),
+        )
+
+    @external(read_only=True)
+    def get_participant_statuses(self, participants: abi.DynamicArray[abi.Address], *,
+                                 output: abi.DynamicArray[ParticipantStatus]):
+        """ Return the status of a batch of participants. Meant to be evaluated off-chain, e.g. by dryrun.
+
+        Participants must be provided into the foreign accounts array too, thus up to 4 participants may be queried per
+        call. Participants which did not opt-in are returned with an empty status.
+
+        Args:
+            participants: Addresses of the participants.
+
+        Returns:
+            The status of each participant, in the same order as `participants`.
+        """
+        i = ScratchVar(TealType.uint64)
+        record = ScratchVar(TealType.uint64)
+        packed_statuses = ScratchVar(TealType.bytes)
+        participant = abi.Address()
+        has_placed_bet = abi.Bool()
+        has_requested_payout = abi.Bool()
+        chosen_opt = abi.Uint64()
+        status = ParticipantStatus()
+        return Seq(
+            packed_statuses.store(Bytes("")),
+            For(i.store(Int(0)), i.load() < participants.length(), i.store(i.load() + Int(1))).Do(
+                participants[i.load()].store_into(participant),
+                record.store(
+                    If(
+                        App.optedIn(participant.get(), Global.current_application_id()),
+                        self.participant_record[participant.get()].get(),
+                        Int(0)
+                    )
+                ),
+                has_placed_bet.set(self.record_has_placed_bet(record.load())),
+                has_requested_payout.set(self.record_has_requested_payout(record.load())),
+                chosen_opt.set(self.record_chosen_opt(record.load())),
+                status.set(has_placed_bet, has_requested_payout, chosen_opt),
+                packed_statuses.store(Concat(packed_statuses.load(), status.encode())),
+            ),
+            # Prefix the array length as uint16
+            output.decode(Concat(Suffix(Itob(participants.length()), Int(6)), packed_statuses.load())),
+        )
+
 
 def demo():
+    from client.cache import CachedApplicationClient, cached_application
+    from client.lite import pooled_fee_params
+
     ###################################
     # Setup of clients and app creation
     ###################################
@@ -382,11 +730,11 @@ def demo():
 
     # Create an Application client containing both an algod client and app
     print("Creating application client 2...")
-    app_client_acct_2 = ApplicationClient(
+    app_client_acct_2 = CachedApplicationClient(
         # Use the sandbox client
         client=sandbox_client,
-        # Instantiate app with the program version (default is MAX_TEAL_VERSION)
-        app=AlgoBet(),
+        # Load the app programs from the compiled artifacts cache
+        app=cached_application(AlgoBet),
         # Set the Transaction Signer of acct_1 account
         signer=acct_2.signer
     )
@@ -442,7 +790,7 @@ def demo():
         bet_deposit_tx=TransactionWithSigner(
             txn=transaction.PaymentTxn(
                 acct_1.address,
-                app_client_acct_1.client.suggested_params(),
+                app_client_acct_1.get_suggested_params(),
                 app_addr,
                 140 * consts.milli_algo),
             signer=acct_1.signer
@@ -467,7 +815,7 @@ def demo():
         bet_deposit_tx=TransactionWithSigner(
             txn=transaction.PaymentTxn(
                 acct_2.address,
-                app_client_acct_2.client.suggested_params(),
+                app_client_acct_2.get_suggested_params(),
                 app_addr,
                 140 * consts.milli_algo),
             signer=acct_2.signer
@@ -504,10 +852,11 @@ def demo():
     print("Smart contract account balance: ", sc_bal_before)
     print("Account 1 balance: ", acct_1_bal_before)
 
-    # Try to payout
+    # Try to payout, paying the fee of the payout inner transaction too
     print("Requesting payout() transaction...")
     app_client_acct_1.call(
         AlgoBet.payout,  # noqa
+        suggested_params=pooled_fee_params(app_client_acct_1.get_suggested_params(), 1)
     )
 
     # Print balances after payout
@@ -517,7 +866,7 @@ def demo():
     print("Account 1 balance: ", acct_1_bal_after)
     print("Smart contract account balance difference: ", sc_bal_after - sc_bal_before)
     print("Account 1 balance difference: ", acct_1_bal_after - acct_1_bal_before)
-    print("(remember: the minimum fee on Algorand is currently 1000 microAlgos)")
+    print("(remember: the call pays the minimum fee on Algorand, currently 1000 microAlgos, for itself and the payout)")
 
     spacer("Manager account deletes the smart contract after event end")
 
@@ -0,0 +1,139 @@
+from typing import Final
+
+from beaker import (
+    consts,
+    create,
+    ApplicationStateValue,
+    Authorize,
+    Precompile,
+)
+from beaker.application import Application
+from beaker.decorators import external
+from pyteal import (
+    TealType, Global, Int, abi, Seq, InnerTxnBuilder, TxnField, TxnType, Txn, If, Bytes, Concat, Itob,
+    Sha512_256, InnerTxn, ScratchVar, OnComplete, MethodSignature
+)
+
+from contract import AlgoBet
+
+# AlgoBet instance whose programs and state schema are used for deploying children
+child_app = AlgoBet()
+
+# Signature of the AlgoBet creation method, called by the inner application-create transactions
+child_create_signature = child_app.contract.get_method_by_name("create").get_signature()
+
+
+class AlgoBetFactory(Application):
+    """ AlgoBet factory smart contract definition: deploys and funds AlgoBet instances through inner transactions.
+
+    All the children share the AlgoBet approval program, which is compiled along with the factory. The factory pays
+    both the minimum balance funding of each child and the fees of its inner transactions, which are pooled from the
+    caller's transaction.
+    """
+
+    ###########################################
+    # Application State
+    ###########################################
+
+    manager: Final[ApplicationStateValue] = ApplicationStateValue(
+        stack_type=TealType.bytes,
+        # Default to the application creator address
+        default=Global.creator_address(),
+        descr="Manager account, the only one allowed to create markets"
+    )
+
+    child_funding: Final[ApplicationStateValue] = ApplicationStateValue(
+        stack_type=TealType.uint64,
+        # Defaults to 200 milliAlgos
+        default=consts.MilliAlgos(200),
+        descr="Algos sent to each AlgoBet child for its minimum balance"
+    )
+
+    child_approval: Final[Precompile] = Precompile(child_app.approval_program)
+    child_clear: Final[Precompile] = Precompile(child_app.clear_program)
+
+    ###########################################
+    # Administrative Actions
+    ###########################################
+
+    @create
+    def create(self, manager_addr: abi.Address, child_funding: abi.Uint64):
+        """ Create an AlgoBet factory.
+
+        Args:
+            manager_addr: Address of the account to be set as manager.
+            child_funding: Algos sent to each created AlgoBet instance, expressed in microAlgos.
+        """
+        return Seq(
+            self.initialize_application_state(),
+            If(manager_addr.get() != Txn.sender(), self.manager.set(manager_addr.get())),
+            self.child_funding.set(child_funding.get()),
+        )
+
+    @external(authorize=Authorize.only(manager))
+    def create_market(self,
+                      manager_addr: abi.Address,
+                      oracle_addr: abi.Address,
+                      event_start_unix_timestamp: abi.Uint64,
+                      event_end_unix_timestamp: abi.Uint64,
+                      payout_time_window_s: abi.Uint64,
+                      options_count: abi.Uint64,
+                      *,
+                      output: abi.Uint64):
+        """ Create an AlgoBet instance and fund it with `child_funding`. Only the manager account is authorized to
+        request this transaction.
+
+        The two inner transactions fees are pooled from this transaction, thus the caller must pay a fee covering
+        three transactions.
+
+        Args:
+            manager_addr: Address of the account to be set as manager of the AlgoBet instance.
+            oracle_addr: Address of the account to be set as oracle of the AlgoBet instance.
+            event_start_unix_timestamp: Unix timestamp of event start.
+            event_end_unix_timestamp: Unix timestamp of event end.
+            payout_time_window_s: Payout time interval, expressed in seconds.
+            options_count: Number of possible event outcomes, between 2 and 60.
+
+        Returns:
+            The application id of the created AlgoBet instance.
+        """
+        app_id = ScratchVar(TealType.uint64)
+        return Seq(
+            # Create the AlgoBet instance, calling its creation method. The application id field is left unset, since
+            # setting it to 0 is rejected as an unavailable application
+            InnerTxnBuilder.Execute(
+                {
+                    TxnField.type_enum: TxnType.ApplicationCall,
+                    TxnField.on_completion: OnComplete.NoOp,
+                    TxnField.application_args: [
+                        MethodSignature(child_create_signature),
+                        manager_addr.encode(),
+                        oracle_addr.encode(),
+                        event_start_unix_timestamp.encode(),
+                        event_end_unix_timestamp.encode(),
+                        payout_time_window_s.encode(),
+                        options_count.encode(),
+                    ],
+                    TxnField.approval_program: self.child_approval.binary_bytes,
+                    TxnField.clear_state_program: self.child_clear.binary_bytes,
+                    TxnField.global_num_uints: Int(child_app.app_state.schema().num_uints),
+                    TxnField.global_num_byte_slices: Int(child_app.app_state.schema().num_byte_slices),
+                    TxnField.local_num_uints: Int(child_app.acct_state.schema().num_uints),
+                    TxnField.local_num_byte_slices: Int(child_app.acct_state.schema().num_byte_slices),
+                    # Fee is pooled from the outer transaction
+                    TxnField.fee: Int(0),
+                }
+            ),
+            app_id.store(InnerTxn.created_application_id()),
+            # Fund the AlgoBet instance account, whose address is the hash of its application id
+            InnerTxnBuilder.Execute(
+                {
+                    TxnField.type_enum: TxnType.Payment,
+                    TxnField.receiver: Sha512_256(Concat(Bytes("appID"), Itob(app_id.load()))),
+                    TxnField.amount: self.child_funding.get(),
+                    # Fee is pooled from the outer transaction
+                    TxnField.fee: Int(0),
+                }
+            ),
+            output.set(app_id.load()),
+        )
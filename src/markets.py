@@ -0,0 +1,410 @@
+from typing import Final
+
+from beaker import (
+    consts,
+    create,
+    opt_in,
+    ApplicationStateValue,
+    DynamicApplicationStateValue,
+    DynamicAccountStateValue,
+    Authorize,
+    delete,
+)
+from beaker.application import Application
+from beaker.decorators import external
+from pyteal import (
+    Assert, TealType, Global, Int, Approve, abi, Seq, InnerTxnBuilder, TxnField, TxnType, Txn, Div, If, Expr,
+    BytesZero, ExtractUint64, Replace, Itob, Concat, ScratchVar, And, Or, Not, SetBit, MethodConfig, CallConfig
+)
+
+from contract import AlgoBet, record_payout_requested_bit
+
+# Maximum number of events hosted at the same time, bound by the global state keys left by the static values
+max_events_count = 59
+
+# Maximum number of open bets per participant, i.e. events with a record in the participant local state
+max_participant_events = 16
+
+# Maximum number of bet options of each event, bound by the event state value size
+max_event_options_count = 7
+
+# Event result of events whose result has not been set, yet
+event_result_not_set = 99
+
+# Layout of the event state value: a header of big-endian uint64 fields, followed by the option counters
+event_start_offset = 0
+event_end_offset = 8
+event_payout_window_offset = 16
+event_options_count_offset = 24
+event_result_offset = 32
+event_stake_offset = 40
+event_winning_count_offset = 48
+event_winning_payout_offset = 56
+event_counters_offset = 64
+event_field_size = 8
+
+# Size in bytes of the event state value: 8 bytes of key and 120 bytes of value fit a global state entry
+event_size = event_counters_offset + max_event_options_count * event_field_size
+
+
+class AlgoBetMarkets(Application):
+    """ AlgoBet multi-event smart contract definition: a single application hosting many betting events.
+
+    Each event is stored into a global state value keyed by the event id, while each participant keeps one record per
+    event into the local state, keyed by the event id too. Records share the layout of `AlgoBet.participant_record`.
+    """
+
+    ###########################################
+    # Application State
+    ###########################################
+
+    manager: Final[ApplicationStateValue] = ApplicationStateValue(
+        stack_type=TealType.bytes,
+        # Default to the application creator address
+        default=Global.creator_address(),
+        descr="Manager account, which will have particular privileges"
+    )
+
+    oracle_addr: Final[ApplicationStateValue] = ApplicationStateValue(
+        stack_type=TealType.bytes,
+        # Default to the application creator address
+        default=Global.creator_address(),
+        descr="Oracle account address"
+    )
+
+    bet_amount: Final[ApplicationStateValue] = ApplicationStateValue(
+        stack_type=TealType.uint64,
+        # Defaults to 140 milliAlgos
+        default=consts.MilliAlgos(140),
+        descr="Fixed bet amount, shared by all the events"
+    )
+
+    events_count: Final[ApplicationStateValue] = ApplicationStateValue(
+        stack_type=TealType.uint64,
+        default=Int(0),
+        descr="Number of hosted events"
+    )
+
+    last_event_id: Final[ApplicationStateValue] = ApplicationStateValue(
+        stack_type=TealType.uint64,
+        default=Int(0),
+        descr="Id of the last created event: ids are strictly increasing, so that deleted events are never re-created"
+    )
+
+    events: Final[DynamicApplicationStateValue] = DynamicApplicationStateValue(
+        stack_type=TealType.bytes,
+        max_keys=max_events_count,
+        descr="Events state, keyed by event id: start and end timestamps, payout time window, options count, result, "
+              "stake, winning count and winning payout as big-endian uint64, followed by the option counters"
+    )
+
+    ###########################################
+    # Account State
+    ###########################################
+
+    participant_records: Final[DynamicAccountStateValue] = DynamicAccountStateValue(
+        stack_type=TealType.uint64,
+        max_keys=max_participant_events,
+        descr="Participant records, keyed by event id: bit 0 flags a placed bet, bit 1 flags a requested payout, "
+              "bits from 8 on hold the bet option chosen by the participant"
+    )
+
+    ###########################################
+    # Administrative Actions
+    ###########################################
+
+    @create
+    def create(self, manager_addr: abi.Address, oracle_addr: abi.Address):
+        """ Create an AlgoBet multi-event contract instance, hosting no events.
+
+        Args:
+            manager_addr: Address of the account to be set as manager.
+            oracle_addr: Address of the account to be set as oracle.
+        """
+        return Seq(
+            self.initialize_application_state(),
+            If(manager_addr.get() != Txn.sender(), self.manager.set(manager_addr.get())),
+            If(oracle_addr.get() != Txn.sender(), self.oracle_addr.set(oracle_addr.get())),
+        )
+
+    @external(authorize=Authorize.only(manager))
+    def create_event(self,
+                     event_id: abi.Uint64,
+                     event_start_unix_timestamp: abi.Uint64,
+                     event_end_unix_timestamp: abi.Uint64,
+                     payout_time_window_s: abi.Uint64,
+                     options_count: abi.Uint64):
+        """ Host a new event. Only the manager account is authorized to request this transaction.
+
+        Event ids must be strictly increasing: the records of a deleted event are left in the local state of the
+        participants who did not clear them, and would count on an event re-created with the same id.
+
+        Args:
+            event_id: Id of the new event, greater than the ids of all the events created before.
+            event_start_unix_timestamp: Unix timestamp of event start.
+            event_end_unix_timestamp: Unix timestamp of event end.
+            payout_time_window_s: Payout time interval, expressed in seconds.
+            options_count: Number of possible event outcomes, between 2 and 7.
+        """
+        event = self.events[event_id]
+        return Seq(
+            Assert(event_id.get() > self.last_event_id.get(), comment="Event id already used"),
+            Assert(self.events_count.get() < Int(max_events_count), comment="Too many events"),
+            # Checks that the provided event timestamp represents a future period
+            Assert(event_end_unix_timestamp.get() > Global.latest_timestamp(),
+                   comment="Event end time must be in the future."),
+            Assert(event_end_unix_timestamp.get() > event_start_unix_timestamp.get(),
+                   comment="Event end must occur after the event start."),
+            # Assert that the number of options fits the event state value
+            Assert(
+                And(options_count.get() >= Int(2), options_count.get() <= Int(max_event_options_count)),
+                comment="Options count must be between 2 and 7."
+            ),
+            event.set(
+                Concat(
+                    Itob(event_start_unix_timestamp.get()),
+                    Itob(event_end_unix_timestamp.get()),
+                    Itob(payout_time_window_s.get()),
+                    Itob(options_count.get()),
+                    Itob(Int(event_result_not_set)),
+                    # Zeroed stake, winning count, winning payout and option counters
+                    BytesZero(Int(event_size - event_stake_offset)),
+                )
+            ),
+            self.last_event_id.set(event_id.get()),
+            self.events_count.increment(),
+        )
+
+    @external(authorize=Authorize.only(oracle_addr))
+    def set_event_result(self, event_id: abi.Uint64, opt: abi.Uint64):
+        """ Set the result of an event. Only the oracle account is authorized to request this transaction.
+
+        Args:
+            event_id: Id of the event.
+            opt: Winning option.
+        """
+        event = self.events[event_id]
+        winning_count = ScratchVar(TealType.uint64)
+        stake = ScratchVar(TealType.uint64)
+        return Seq(
+            Assert(event.exists(), comment="Event does not exist"),
+            Assert(Global.latest_timestamp() >= self.event_field(event, event_end_offset),
+                   comment="Event expiry time not reached, yet."),
+            # Payouts are accounted on the event stake, thus the result cannot be changed once set
+            Assert(self.event_field(event, event_result_offset) == Int(event_result_not_set),
+                   comment="Event result already set"),
+            Assert(opt.get() < self.event_field(event, event_options_count_offset),
+                   comment="Valid options are: 0 to options_count - 1"),
+            winning_count.store(
+                self.event_field(event, Int(event_counters_offset) + opt.get() * Int(event_field_size))
+            ),
+            stake.store(self.event_field(event, event_stake_offset)),
+            self.set_event_field(event, event_result_offset, opt.get()),
+            self.set_event_field(event, event_winning_count_offset, winning_count.load()),
+            # With no winners, participants are refunded with the bet amount through the payout
+            self.set_event_field(
+                event,
+                event_winning_payout_offset,
+                If(winning_count.load() == Int(0), self.bet_amount.get(), Div(stake.load(), winning_count.load()))
+            ),
+        )
+
+    @external(authorize=Authorize.only(manager))
+    def delete_event(self, event_id: abi.Uint64):
+        """ Stop hosting an event after its payout time, transferring the unclaimed stake to the manager. Only the
+        manager account is authorized to request this transaction.
+
+        The transfer inner transaction fee is pooled from this transaction, thus the caller must pay a fee covering
+        two transactions.
+
+        Args:
+            event_id: Id of the event.
+        """
+        event = self.events[event_id]
+        return Seq(
+            Assert(event.exists(), comment="Event does not exist"),
+            # Assert that the payout time elapsed
+            Assert(
+                Global.latest_timestamp() >= self.event_field(event, event_end_offset)
+                + self.event_field(event, event_payout_window_offset),
+                comment="Payout time not expired, yet."
+            ),
+            InnerTxnBuilder.Execute(
+                {
+                    TxnField.type_enum: TxnType.Payment,
+                    TxnField.receiver: Txn.sender(),
+                    TxnField.amount: self.event_field(event, event_stake_offset),
+                    # Fee is pooled from the outer transaction
+                    TxnField.fee: Int(0),
+                }
+            ),
+            event.delete(),
+            self.events_count.decrement(),
+        )
+
+    @delete(authorize=Authorize.only(manager))
+    def delete(self):
+        """ Delete the AlgoBet multi-event smart contract instance. Allowed once no events are hosted. """
+        return Seq(
+            Assert(self.events_count.get() == Int(0), comment="Events still hosted"),
+            # Make a transaction for closing out the smart contract account
+            InnerTxnBuilder.Execute(
+                {
+                    TxnField.type_enum: TxnType.Payment,
+                    TxnField.receiver: Txn.sender(),
+                    TxnField.amount: Int(0),
+                    TxnField.close_remainder_to: Txn.sender(),
+                },
+            ),
+            Approve()
+        )
+
+    ###########################################
+    # Bare Calls
+    ###########################################
+
+    @opt_in
+    def opt_in(self):
+        """ Opt-in the sender account. Records are written by bets, thus no state is initialized. """
+        return Approve()
+
+    ###########################################
+    # Events
+    ###########################################
+
+    @staticmethod
+    def event_field(event: ApplicationStateValue, offset: int | Expr) -> Expr:
+        """ Read a uint64 field of an event state value. """
+        return ExtractUint64(event.get(), offset if isinstance(offset, Expr) else Int(offset))
+
+    @staticmethod
+    def set_event_field(event: ApplicationStateValue, offset: int | Expr, value: Expr) -> Expr:
+        """ Write a uint64 field of an event state value. """
+        return event.set(Replace(event.get(), offset if isinstance(offset, Expr) else Int(offset), Itob(value)))
+
+    def participant_record(self, event_id: abi.Uint64) -> Expr:
+        """ Read the sender record of an event, or an empty record if the sender did not bet on it. """
+        return Seq(
+            record := self.participant_records[event_id].get_maybe(),
+            If(record.hasValue(), record.value(), Int(0)),
+        )
+
+    ###########################################
+    # Exposed Application Calls
+    ###########################################
+
+    # Callable with OnComplete=OptIn too, so that new participants can opt-in and bet with a single application call
+    @external(
+        authorize=Authorize.opted_in(app_id=Application.id),
+        method_config=MethodConfig(no_op=CallConfig.CALL, opt_in=CallConfig.CALL)
+    )
+    def bet(self, event_id: abi.Uint64, opt: abi.Uint64, bet_deposit_tx: abi.PaymentTransaction):
+        """ Place a bet on an event. May be called with OnComplete=OptIn to opt-in the participant in the same call.
+
+        Args:
+            event_id: Id of the event.
+            opt: Chosen option.
+            bet_deposit_tx: Payment transaction of the bet deposit.
+        """
+        event = self.events[event_id]
+        record = self.participant_records[event_id]
+        counter_offset = ScratchVar(TealType.uint64)
+        return Seq(
+            Assert(event.exists(), comment="Event does not exist"),
+            # Assert that the event has not started
+            Assert(Global.latest_timestamp() < self.event_field(event, event_start_offset),
+                   comment="Event has already started"),
+            # Check if the bet is equal to the fixed amount
+            Assert(
+                bet_deposit_tx.get().amount() == self.bet_amount.get(),
+                comment="Bet amount is wrong"
+            ),
+            # Assert that the deposit targets the smart contract
+            Assert(
+                bet_deposit_tx.get().receiver() == self.address,
+                comment="Receiver must be the smart contract"
+            ),
+            # Assert that the deposit is paid by the participant, as in `AlgoBet.bet`
+            Assert(
+                bet_deposit_tx.get().sender() == Txn.sender(),
+                comment="Deposit must be sent by the participant"
+            ),
+            # Assert that the user has not placed any bet on the event yet
+            Assert(Not(record.exists()), comment="User has already placed a bet"),
+            # Assert that the option is valid
+            Assert(opt.get() < self.event_field(event, event_options_count_offset),
+                   comment="Valid options are: 0 to options_count - 1"),
+            # Store the chosen option and set the 'bet already placed' flag into the sender's record
+            record.set(AlgoBet.new_bet_record(opt.get())),
+            # Increase the chosen option counter and the stake amount
+            counter_offset.store(Int(event_counters_offset) + opt.get() * Int(event_field_size)),
+            self.set_event_field(event, counter_offset.load(),
+                                 self.event_field(event, counter_offset.load()) + Int(1)),
+            self.set_event_field(event, event_stake_offset,
+                                 self.event_field(event, event_stake_offset) + self.bet_amount.get()),
+        )
+
+    @external(authorize=Authorize.opted_in(app_id=Application.id))
+    def payout(self, event_id: abi.Uint64):
+        """ Request the payout of an event. Only works for winning participants, or for any participant of an event
+        resolved with no winners, who gets the bet amount refunded.
+
+        The payout inner transaction fee is pooled from this transaction, thus the caller must pay a fee covering
+        two transactions.
+
+        Args:
+            event_id: Id of the event.
+        """
+        event = self.events[event_id]
+        record = ScratchVar(TealType.uint64)
+        payout = ScratchVar(TealType.uint64)
+        return Seq(
+            Assert(event.exists(), comment="Event does not exist"),
+            Assert(self.event_field(event, event_result_offset) != Int(event_result_not_set),
+                   comment="Event result not set, yet."),
+            record.store(self.participant_record(event_id)),
+            Assert(AlgoBet.record_has_placed_bet(record.load()), comment="You did not place any bet"),
+            Assert(
+                Or(
+                    self.event_field(event, event_winning_count_offset) == Int(0),
+                    AlgoBet.record_chosen_opt(record.load()) == self.event_field(event, event_result_offset)
+                ),
+                comment="You did not choose the winning option"
+            ),
+            Assert(AlgoBet.record_has_requested_payout(record.load()) == Int(0),
+                   comment="You already requested your payout"),
+            # Set the 'payout already requested' flag into the sender's record
+            self.participant_records[event_id].set(SetBit(record.load(), record_payout_requested_bit, Int(1))),
+            # Keep the event stake equal to the funds still held for the event
+            payout.store(self.event_field(event, event_winning_payout_offset)),
+            self.set_event_field(event, event_stake_offset,
+                                 self.event_field(event, event_stake_offset) - payout.load()),
+            InnerTxnBuilder.Execute(
+                {
+                    TxnField.type_enum: TxnType.Payment,
+                    TxnField.receiver: Txn.sender(),
+                    TxnField.amount: payout.load(),
+                    # Fee is pooled from the outer transaction
+                    TxnField.fee: Int(0),
+                }
+            ),
+        )
+
+    @external(authorize=Authorize.opted_in(app_id=Application.id))
+    def clear_record(self, event_id: abi.Uint64):
+        """ Delete the sender record of an event, freeing a local state slot for further bets. Allowed once the
+        payout has been requested, or once the event has been deleted.
+
+        Args:
+            event_id: Id of the event.
+        """
+        return Seq(
+            Assert(
+                Or(
+                    Not(self.events[event_id].exists()),
+                    AlgoBet.record_has_requested_payout(self.participant_record(event_id)) != Int(0)
+                ),
+                comment="Event still open for the participant"
+            ),
+            self.participant_records[event_id].delete(),
+        )
@@ -1,14 +1,64 @@
+import argparse
 import json
+import os
 
 from src.contract import AlgoBet as App
+from src.teal.optimize import optimize
+from src.teal.report import static_report
+from src.teal.router import dispatch_profile, expected_cost, reorder_dispatch
+
+
+def read_previous(filename: str) -> str | None:
+    """ Return the content of a previously compiled artifact, if any. """
+    if not os.path.exists(filename):
+        return None
+    with open(filename) as fp:
+        return fp.read()
+
+
+def read_profile(filename: str, teal: str) -> dict[str, int]:
+    """ Return the call-frequency profile stored in a JSON file: either a mapping of method names to call counts, or
+    application call transactions (an algod/indexer transactions list, or the indexer search response).
+    """
+    with open(filename) as fp:
+        profile = json.load(fp)
+    if isinstance(profile, dict) and "transactions" in profile:
+        profile = profile["transactions"]
+    if isinstance(profile, list):
+        return dispatch_profile(teal, profile)
+    return profile
+
+
+parser = argparse.ArgumentParser(description="Export the TEAL programs and the ABI contract of AlgoBet")
+parser.add_argument("--no-optimize", action="store_true", help="export the PyTeal output unchanged")
+parser.add_argument("--profile", help="JSON call-frequency profile used to order the router, hot methods first")
+args = parser.parse_args()
 
 app = App()
-print(app.approval_program)
+approval_program = app.approval_program
+if not args.no_optimize:
+    approval_program = optimize(app.approval_program)
+if args.profile:
+    profile = read_profile(args.profile, approval_program)
+    reordered = reorder_dispatch(approval_program, profile)
+    print(f"Expected cost per call: {expected_cost(approval_program, profile):.1f} (declaration order), "
+          f"{expected_cost(reordered, profile):.1f} (hot path first)")
+    approval_program = reordered
+print(approval_program)
 print(app.clear_program)
 print(json.dumps(app.contract.dictify()))
 
+# Cost saved on each method by the TEAL optimizer and the router layout
+if approval_program != app.approval_program:
+    print("Optimization savings:")
+    print(static_report(approval_program, app.clear_program, app.approval_program, app.clear_program))
+
+# Static cost and size report, compared with the previously compiled programs
+previous_approval, previous_clear = read_previous("approval_program.teal"), read_previous("clear_program.teal")
+print(static_report(approval_program, app.clear_program, previous_approval, previous_clear))
+
 for filename, content in [
-    ("approval_program.teal", app.approval_program),
+    ("approval_program.teal", approval_program),
     ("clear_program.teal", app.clear_program),
     ("contract.json", json.dumps(app.contract.dictify()))
 ]:
@@ -0,0 +1,265 @@
+""" Post-compile optimization of TEAL programs, applied to the PyTeal output before assembly.
+
+Passes are run until no further change is possible:
+  - peephole simplifications: constant folding, identity operations, redundant negations and comparisons with zero
+    feeding a condition, constant conditions, jumps to the next instruction and branch inversions;
+  - jump threading: branches to an unconditional jump are retargeted to its destination;
+  - unreachable code removal, after unconditional jumps and exits;
+  - forwarding of scratch values stored and loaded just once, kept on the stack instead;
+  - caching of repeated global state reads of the same key in a scratch slot, when it saves opcodes.
+
+Every pass preserves the program behavior: comments are kept, and only instruction lines are rewritten.
+"""
+from collections import Counter
+
+from .report import parse
+
+# Binary operations on uint64 folded at compile time, returning None when they would fail at run time
+folded_ops = {
+    "+": lambda a, b: a + b if a + b < 2 ** 64 else None,
+    "-": lambda a, b: a - b if a >= b else None,
+    "*": lambda a, b: a * b if a * b < 2 ** 64 else None,
+    "/": lambda a, b: a // b if b else None,
+    "%": lambda a, b: a % b if b else None,
+    "==": lambda a, b: int(a == b),
+    "!=": lambda a, b: int(a != b),
+    "<": lambda a, b: int(a < b),
+    ">": lambda a, b: int(a > b),
+    "<=": lambda a, b: int(a <= b),
+    ">=": lambda a, b: int(a >= b),
+    "&&": lambda a, b: int(bool(a and b)),
+    "||": lambda a, b: int(bool(a or b)),
+    "&": lambda a, b: a & b,
+    "|": lambda a, b: a | b,
+    "^": lambda a, b: a ^ b,
+    "shl": lambda a, b: (a << b) % 2 ** 64 if b < 64 else None,
+    "shr": lambda a, b: a >> b if b < 64 else None,
+}
+
+# Operations left unchanged by a constant right operand
+identity_ops = {("+", 0), ("-", 0), ("*", 1), ("/", 1), ("|", 0), ("^", 0), ("shl", 0), ("shr", 0)}
+
+# Opcodes consuming a condition from the stack
+condition_ops = {"assert", "bz", "bnz"}
+
+# Opcodes ending the execution of a block
+exit_ops = {"b", "return", "err", "retsub"}
+
+# Opcodes which may change the global state read by a cached `app_global_get`
+global_state_writers = {"app_global_put", "app_global_del", "callsub"}
+
+
+class Line:
+    """ A TEAL source line. Lines which are not instructions (comments, blank lines, pragmas) have no opcode. """
+
+    def __init__(self, text: str):
+        self.text = text
+        parsed = parse(text)
+        self.op, self.args, self.comment = parsed[0] if parsed else (None, [], "")
+
+    @classmethod
+    def instruction(cls, op: str, *args, comment: str = "") -> "Line":
+        return cls(" ".join([op, *map(str, args)]) + (f" // {comment}" if comment else ""))
+
+
+class Optimizer:
+    """ Optimizer of a TEAL program. """
+
+    def __init__(self, teal: str):
+        self.lines = [Line(text) for text in teal.splitlines()]
+        block = next((line for line in self.lines if line.op == "intcblock"), None)
+        self.int_constants = [int(a, 0) for a in block.args] if block else []
+
+    def constant(self, line: Line) -> int | None:
+        """ Return the value pushed by an integer constant instruction, if the line is one. """
+        if line.op in ("pushint", "int") and line.args[0][0].isdigit():
+            return int(line.args[0], 0)
+        if line.op == "intc":
+            return self.int_constants[int(line.args[0])]
+        if line.op and line.op.startswith("intc_"):
+            return self.int_constants[int(line.op[5:])]
+        return None
+
+    def push_constant(self, value: int) -> Line:
+        """ Return the cheapest instruction pushing an integer constant. """
+        if value in self.int_constants:
+            i = self.int_constants.index(value)
+            return Line.instruction(f"intc_{i}" if i < 4 else f"intc {i}", comment=str(value))
+        return Line.instruction("pushint", value, comment=str(value))
+
+    def instructions(self) -> list[int]:
+        """ Return the indexes of the instruction lines, labels included. """
+        return [i for i, line in enumerate(self.lines) if line.op is not None]
+
+    def replace(self, indexes: list[int], new_lines: list[Line]):
+        """ Replace the instruction lines at `indexes` (in order) with `new_lines`, keeping comments in between. """
+        for i in indexes[len(new_lines):]:
+            self.lines[i] = None
+        for i, line in zip(indexes, new_lines):
+            self.lines[i] = line
+        self.lines = [line for line in self.lines if line is not None]
+
+    ###########################################
+    # Passes
+    ###########################################
+
+    def peephole(self) -> bool:
+        """ Apply the first matching peephole simplification. Return True if the program changed. """
+        code = self.instructions()
+        for n in range(len(code)):
+            window = [self.lines[i] for i in code[n:n + 3]]
+            ops = [line.op for line in window] + [None] * (3 - len(window))
+            first = self.constant(window[0])
+            second = self.constant(window[1]) if len(window) > 1 else None
+
+            # Constant folding
+            if first is not None and second is not None and ops[2] in folded_ops:
+                value = folded_ops[ops[2]](first, second)
+                if value is not None:
+                    self.replace(code[n:n + 3], [self.push_constant(value)])
+                    return True
+            # Identity operations
+            if first is not None and (ops[1], first) in identity_ops:
+                self.replace(code[n:n + 2], [])
+                return True
+            if ops[:2] == ["itob", "btoi"]:
+                self.replace(code[n:n + 2], [])
+                return True
+            # Comparisons with zero
+            if first == 0 and ops[1] == "==":
+                self.replace(code[n:n + 2], [Line.instruction("!")])
+                return True
+            if first == 0 and ops[1] == "!=" and ops[2] in condition_ops:
+                self.replace(code[n:n + 2], [])
+                return True
+            # Negated conditions
+            if ops[:2] == ["!", "!"] and ops[2] in condition_ops:
+                self.replace(code[n:n + 2], [])
+                return True
+            if ops[0] == "!" and ops[1] in ("bz", "bnz"):
+                inverted = "bnz" if ops[1] == "bz" else "bz"
+                self.replace(code[n:n + 2], [Line.instruction(inverted, window[1].args[0])])
+                return True
+            # Constant conditions
+            if first is not None and ops[1] in condition_ops:
+                taken = (first != 0) == (ops[1] == "bnz")
+                if ops[1] == "assert":
+                    if first != 0:
+                        self.replace(code[n:n + 2], [])
+                        return True
+                else:
+                    self.replace(code[n:n + 2], [Line.instruction("b", window[1].args[0])] if taken else [])
+                    return True
+            # Jumps to the next instruction
+            if ops[0] == "b" and ops[1] == "label:" and window[0].args == window[1].args:
+                self.replace(code[n:n + 1], [])
+                return True
+            # Conditional jumps over an unconditional jump
+            if ops[0] in ("bz", "bnz") and ops[1] == "b" and ops[2] == "label:" and window[0].args == window[2].args:
+                inverted = "bnz" if ops[0] == "bz" else "bz"
+                self.replace(code[n:n + 2], [Line.instruction(inverted, window[1].args[0])])
+                return True
+        return False
+
+    def thread_jumps(self) -> bool:
+        """ Retarget branches to a label followed by an unconditional jump. Return True if the program changed. """
+        code = self.instructions()
+        jumps = {}
+        for n, i in enumerate(code[:-1]):
+            if self.lines[i].op == "label:":
+                following = self.lines[code[n + 1]]
+                if following.op == "b" and following.args != self.lines[i].args:
+                    jumps[self.lines[i].args[0]] = following.args[0]
+
+        changed = False
+        for i in code:
+            line = self.lines[i]
+            if line.op in ("b", "bz", "bnz") and line.args[0] in jumps:
+                self.lines[i] = Line.instruction(line.op, jumps[line.args[0]])
+                changed = True
+        return changed
+
+    def remove_unreachable(self) -> bool:
+        """ Remove the instructions following an exit, up to the next label. Return True if the program changed. """
+        code = self.instructions()
+        unreachable, reachable = [], True
+        for i in code:
+            op = self.lines[i].op
+            if op == "label:":
+                reachable = True
+            elif not reachable:
+                unreachable.append(i)
+            elif op in exit_ops:
+                reachable = False
+        unreachable = set(unreachable)
+        self.lines = [line for i, line in enumerate(self.lines) if i not in unreachable]
+        return bool(unreachable)
+
+    def forward_scratch(self) -> bool:
+        """ Keep on the stack the values stored into a scratch slot which is loaded just once, right after the store.
+        Return True if the program changed.
+        """
+        code = self.instructions()
+        lines = [self.lines[i] for i in code]
+        if any(line.op in ("loads", "stores") for line in lines):
+            return False
+        stores = Counter(line.args[0] for line in lines if line.op == "store")
+        loads = Counter(line.args[0] for line in lines if line.op == "load")
+        for n in range(len(code) - 1):
+            store, load = lines[n], lines[n + 1]
+            if store.op == "store" and load.op == "load" and store.args == load.args \
+                    and stores[store.args[0]] == 1 and loads[store.args[0]] == 1:
+                self.replace(code[n:n + 2], [])
+                return True
+        return False
+
+    def cache_global_reads(self) -> bool:
+        """ Cache the global state reads of a key repeated within a block in a scratch slot, when they are more than
+        the 3 extra opcodes needed. Return True if the program changed.
+        """
+        code = self.instructions()
+        lines = [self.lines[i] for i in code]
+        if any(line.op in ("loads", "stores") for line in lines):
+            return False
+        used_slots = {int(line.args[0]) for line in lines if line.op in ("load", "store")}
+        free_slots = [s for s in range(255, -1, -1) if s not in used_slots]
+
+        # Group the reads of each key between state writes, subroutine calls and block boundaries
+        reads, groups = {}, []
+        for n, line in enumerate(lines):
+            if line.op in global_state_writers or line.op == "label:" or line.op in exit_ops \
+                    or line.op in ("bz", "bnz"):
+                groups.extend(reads.values())
+                reads = {}
+            elif line.op == "app_global_get" and n > 0 and lines[n - 1].op in ("bytec", "pushbytes", "byte") \
+                    or line.op == "app_global_get" and n > 0 and (lines[n - 1].op or "").startswith("bytec_"):
+                key = (lines[n - 1].op, tuple(lines[n - 1].args))
+                reads.setdefault(key, []).append(n)
+        groups.extend(reads.values())
+
+        for group in groups:
+            if len(group) > 3 and free_slots:
+                slot = free_slots[0]
+                first, *others = group
+                # The first read stores the value, the following ones load it
+                replacements = {code[first]: [lines[first], Line.instruction("dup"), Line.instruction("store", slot)]}
+                for n in others:
+                    replacements[code[n - 1]] = [Line.instruction("load", slot)]
+                    replacements[code[n]] = []
+                self.lines = [new_line for i, line in enumerate(self.lines)
+                              for new_line in replacements.get(i, [line])]
+                return True
+        return False
+
+    def run(self) -> str:
+        """ Run all the passes until the program is stable. Return the optimized program. """
+        passes = [self.peephole, self.thread_jumps, self.remove_unreachable, self.forward_scratch,
+                  self.cache_global_reads]
+        while any(p() for p in passes):
+            pass
+        return "\n".join(line.text for line in self.lines) + "\n"
+
+
+def optimize(teal: str) -> str:
+    """ Return the optimized version of a TEAL program. """
+    return Optimizer(teal).run()
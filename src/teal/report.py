@@ -0,0 +1,327 @@
+""" Static analysis of TEAL programs: bytecode size, worst-case opcode cost and state accesses of each router branch.
+
+The analysis works on the TEAL source only, so that the cost of a contract change can be seen without compiling it
+through a node. Sizes follow the assembler encoding of opcodes and immediates; costs follow the AVM opcode costs,
+counting a single iteration of each loop, since loop bounds are only known at run time.
+"""
+from base64 import b32decode, b64decode
+
+# Opcodes whose cost differs from 1
+op_costs = {
+    "sha256": 35, "keccak256": 130, "sha512_256": 45, "sha3_256": 130,
+    "ed25519verify": 1900, "ed25519verify_bare": 1900,
+    "ecdsa_verify": 1700, "ecdsa_pk_decompress": 650, "ecdsa_pk_recover": 2000, "vrf_verify": 5700,
+    "divmodw": 20, "sqrt": 4, "expw": 10,
+    "b+": 10, "b-": 10, "b*": 20, "b/": 20, "b%": 20, "bsqrt": 40,
+    "b|": 6, "b&": 6, "b^": 6, "b~": 4,
+}
+
+# Size of the immediates of each opcode, when they are fixed
+immediate_sizes = {
+    "txn": 1, "global": 1, "gtxns": 1, "itxn_field": 1, "itxn": 1, "gitxn": 2, "gtxn": 2, "txna": 2, "gtxnsa": 2,
+    "gtxna": 3, "itxna": 2, "gitxna": 3, "txnas": 1, "gtxnas": 2, "gtxnsas": 1, "itxnas": 1, "gitxnas": 2,
+    "load": 1, "store": 1, "gload": 2, "gloads": 1, "gaid": 1, "arg": 1, "intc": 1, "bytec": 1,
+    "extract": 2, "substring": 2, "replace2": 1, "dig": 1, "cover": 1, "uncover": 1, "bury": 1, "popn": 1, "dupn": 1,
+    "asset_holding_get": 1, "asset_params_get": 1, "app_params_get": 1, "acct_params_get": 1,
+    "ecdsa_verify": 1, "ecdsa_pk_decompress": 1, "ecdsa_pk_recover": 1, "base64_decode": 1, "json_ref": 1,
+    "vrf_verify": 1, "block": 1, "frame_dig": 1, "frame_bury": 1, "proto": 2,
+    "b": 2, "bz": 2, "bnz": 2, "callsub": 2,
+}
+
+# State access opcodes, by kind
+state_accesses = {
+    "global_reads": {"app_global_get", "app_global_get_ex"},
+    "global_writes": {"app_global_put", "app_global_del"},
+    "local_reads": {"app_local_get", "app_local_get_ex"},
+    "local_writes": {"app_local_put", "app_local_del"},
+}
+
+# Names of the OnComplete values, as commented by PyTeal
+on_complete_names = {"NoOp", "OptIn", "CloseOut", "ClearState", "UpdateApplication", "DeleteApplication"}
+
+# Opcodes ending a basic block without a fall-through successor
+terminal_ops = {"return", "err", "retsub", "b"}
+
+
+def varuint_size(value: int) -> int:
+    """ Return the size of an unsigned integer encoded as a varuint. """
+    size = 1
+    while value >= 0x80:
+        value >>= 7
+        size += 1
+    return size
+
+
+def bytes_size(literal: str) -> int:
+    """ Return the size of a TEAL byte string literal. """
+    if literal.startswith("0x"):
+        return len(literal[2:]) // 2
+    if literal.startswith('"'):
+        return len(literal[1:-1].encode().decode("unicode_escape"))
+    if literal.startswith(("base64(", "b64(")):
+        return len(b64decode(literal[literal.index("(") + 1:-1]))
+    if literal.startswith(("base32(", "b32(")):
+        encoded = literal[literal.index("(") + 1:-1]
+        return len(b32decode(encoded + "=" * (-len(encoded) % 8)))
+    return len(literal)
+
+
+def parse(teal: str) -> list[tuple[str, list[str], str]]:
+    """ Parse a TEAL program into (opcode, immediates, comment) instructions. Labels are parsed as `label:` opcodes,
+    whose only immediate is the label name.
+    """
+    instructions = []
+    for line in teal.splitlines():
+        code, comment, quoted = line, "", False
+        for i, char in enumerate(line):
+            if char == '"' and (i == 0 or line[i - 1] != "\\"):
+                quoted = not quoted
+            elif not quoted and line.startswith("//", i):
+                code, comment = line[:i], line[i + 2:].strip()
+                break
+        tokens = code.split()
+        if not tokens or tokens[0].startswith("#"):
+            continue
+        if len(tokens) == 1 and tokens[0].endswith(":"):
+            instructions.append(("label:", [tokens[0][:-1]], comment))
+        else:
+            instructions.append((tokens[0], tokens[1:], comment))
+    return instructions
+
+
+def instruction_size(op: str, args: list[str]) -> int:
+    """ Return the size of an assembled instruction. Constant pseudo-opcodes are sized as their push variants. """
+    if op == "label:":
+        return 0
+    if op == "intcblock":
+        return 1 + varuint_size(len(args)) + sum(varuint_size(int(a, 0)) for a in args)
+    if op == "bytecblock":
+        return 1 + varuint_size(len(args)) + sum(varuint_size(bytes_size(a)) + bytes_size(a) for a in args)
+    if op in ("pushint", "int"):
+        value = int(args[0], 0) if args[0][0].isdigit() else 0
+        return 1 + varuint_size(value)
+    if op in ("pushbytes", "byte"):
+        return 1 + varuint_size(bytes_size(args[0])) + bytes_size(args[0])
+    if op == "addr":
+        return 1 + 1 + 32
+    if op == "method":
+        return 1 + 1 + 4
+    return 1 + immediate_sizes.get(op, 0)
+
+
+def program_size(teal: str) -> int:
+    """ Return the size in bytes of the assembled program, including the version prefix. """
+    return 1 + sum(instruction_size(op, args) for op, args, _ in parse(teal))
+
+
+class Program:
+    """ Control flow graph of a TEAL program, split into basic blocks. """
+
+    def __init__(self, teal: str):
+        self.instructions = parse(teal)
+        self.labels = {args[0]: i for i, (op, args, _) in enumerate(self.instructions) if op == "label:"}
+
+        # Split the program into basic blocks, starting at labels and after branches
+        starts = {0} | set(self.labels.values()) | {
+            i + 1 for i, (op, _, _) in enumerate(self.instructions) if op in terminal_ops or op in ("bz", "bnz")
+        }
+        starts = sorted(s for s in starts if s < len(self.instructions))
+        self.blocks = [range(s, e) for s, e in zip(starts, starts[1:] + [len(self.instructions)])]
+        self.block_at = {b.start: n for n, b in enumerate(self.blocks)}
+
+        self._longest = {}
+        self._accesses = {}
+
+    def block_of_label(self, label: str) -> int:
+        return self.block_at[self.labels[label]]
+
+    def successors(self, n: int) -> list[int]:
+        """ Return the successors of a block. Subroutine calls are not edges: they are accounted within the block. """
+        op, args, _ = self.instructions[self.blocks[n].stop - 1]
+        successors = []
+        if op not in terminal_ops and n + 1 < len(self.blocks):
+            successors.append(n + 1)
+        if op in ("b", "bz", "bnz"):
+            successors.append(self.block_of_label(args[0]))
+        return successors
+
+    def block_cost(self, n: int) -> int:
+        """ Return the cost of a block, including the worst-case cost of the subroutines it calls. """
+        cost = 0
+        for op, args, _ in (self.instructions[i] for i in self.blocks[n]):
+            if op != "label:":
+                cost += op_costs.get(op, 1)
+            if op == "callsub":
+                cost += self.longest_path(self.block_of_label(args[0]))[0]
+        return cost
+
+    def longest_path(self, n: int) -> tuple[int | None, bool]:
+        """ Return the worst-case cost from the start of a block to a successful exit (`return`, `retsub` or the
+        program end), and whether a loop was met. Loops are counted for a single iteration. The cost is None if every
+        path fails.
+        """
+        cost, _, looping = self._walk(n, frozenset())
+        return cost, looping
+
+    def _walk(self, n: int, visiting: frozenset) -> tuple[int | None, dict[int, int], bool]:
+        """ Return the worst-case cost from the start of a block to a successful exit, the worst-case cost to each
+        loop header reached by a back edge from the blocks being visited, and whether a loop was met.
+        """
+        if n in self._longest:
+            return self._longest[n]
+        if self.instructions[self.blocks[n].stop - 1][0] == "err":
+            return None, {}, False
+
+        visiting = visiting | {n}
+        exit_cost, back_costs, looping = None, {}, self.calls_loop(n)
+        if not self.successors(n):
+            exit_cost = 0
+        for s in self.successors(n):
+            if s in visiting:
+                # Back edge to a loop header
+                successor_exit, successor_back, looping = None, {s: 0}, True
+            else:
+                successor_exit, successor_back, successor_looping = self._walk(s, visiting)
+                looping |= successor_looping
+            if successor_exit is not None:
+                exit_cost = max(exit_cost or 0, successor_exit)
+            for header, cost in successor_back.items():
+                back_costs[header] = max(back_costs.get(header, 0), cost)
+
+        block_cost = self.block_cost(n)
+        if exit_cost is not None:
+            exit_cost += block_cost
+        back_costs = {header: cost + block_cost for header, cost in back_costs.items()}
+        if n in back_costs and exit_cost is not None:
+            # Loop header: run one iteration, then exit
+            exit_cost += back_costs.pop(n)
+
+        result = (exit_cost, back_costs, looping)
+        # Results depending on the blocks being visited are not cached
+        if not back_costs:
+            self._longest[n] = result
+        return result
+
+    def calls_loop(self, n: int) -> bool:
+        """ Return True if a subroutine called by a block contains a loop. """
+        return any(
+            self.longest_path(self.block_of_label(args[0]))[1]
+            for op, args, _ in (self.instructions[i] for i in self.blocks[n]) if op == "callsub"
+        )
+
+    def accesses(self, n: int) -> dict[str, int]:
+        """ Return the number of state access opcodes reachable from a block, expanding each subroutine call. """
+        counts = dict.fromkeys(state_accesses, 0)
+        seen, stack = set(), [n]
+        while stack:
+            b = stack.pop()
+            if b in seen:
+                continue
+            seen.add(b)
+            stack.extend(self.successors(b))
+            for op, args, _ in (self.instructions[i] for i in self.blocks[b]):
+                for kind, ops in state_accesses.items():
+                    counts[kind] += op in ops
+                if op == "callsub":
+                    label = args[0]
+                    if label not in self._accesses:
+                        self._accesses[label] = self.accesses(self.block_of_label(label))
+                    for kind, count in self._accesses[label].items():
+                        counts[kind] += count
+        return counts
+
+    def arrival_costs(self) -> dict[int, int]:
+        """ Return the worst-case cost of reaching each block of the main program from its start. """
+        order, seen = [], set()
+
+        def _visit(n: int):
+            seen.add(n)
+            for s in self.successors(n):
+                if s not in seen:
+                    _visit(s)
+            order.append(n)
+
+        _visit(0)
+        order.reverse()
+        position = {n: i for i, n in enumerate(order)}
+        arrival = {0: 0}
+        for n in order:
+            for s in self.successors(n):
+                # Back edges are skipped, as for the longest paths
+                if position[s] > position[n]:
+                    arrival[s] = max(arrival.get(s, 0), arrival[n] + self.block_cost(n))
+        return arrival
+
+    def routes(self) -> dict[str, int]:
+        """ Return the router branches, as the block whose last instruction jumps to each branch, keyed by route:
+        the ABI method name, or the OnComplete of bare calls.
+        """
+        routes = {}
+        for n, block in enumerate(self.blocks):
+            if len(block) < 3 or self.instructions[block.stop - 1][0] != "bnz":
+                continue
+            (key_op, _, comment), (cmp_op, _, _) = self.instructions[block.stop - 3], self.instructions[block.stop - 2]
+            if cmp_op != "==":
+                continue
+            if key_op in ("pushbytes", "method") and comment.startswith('"') and "(" in comment:
+                routes[comment.strip('"').split("(")[0]] = n
+            elif comment in on_complete_names and self.instructions[block.stop - 4][1] == ["OnCompletion"]:
+                routes[f"<bare {comment}>"] = n
+        return routes
+
+
+def analyze(teal: str) -> dict:
+    """ Return the static analysis of an approval program: its size and, for each router branch, the worst-case cost
+    (router dispatch included), whether it loops and its state accesses.
+    """
+    program = Program(teal)
+    arrival = program.arrival_costs()
+    routes = {}
+    for name, n in program.routes().items():
+        target = program.block_of_label(program.instructions[program.blocks[n].stop - 1][1][0])
+        cost, looping = program.longest_path(target)
+        routes[name] = {
+            "cost": None if cost is None else arrival.get(n, 0) + program.block_cost(n) + cost,
+            "loop": looping,
+            **program.accesses(target),
+        }
+    return {"size": program_size(teal), "routes": routes}
+
+
+def format_delta(value, previous) -> str:
+    if previous is None:
+        return "new"
+    if value is None or previous == value:
+        return ""
+    return f"{value - previous:+d}"
+
+
+def static_report(approval: str, clear: str, previous_approval: str = None, previous_clear: str = None) -> str:
+    """ Return a printable report of the static analysis of the programs, compared with the previous ones if given.
+
+    Costs count a single iteration of each loop: branches running loops are flagged.
+    """
+    current, previous = analyze(approval), analyze(previous_approval) if previous_approval else None
+    no_previous = {"routes": {}}
+
+    lines = [f"{'program':<30}{'size [B]':>10}{'delta':>8}"]
+    for name, teal, previous_teal in [("approval", approval, previous_approval), ("clear", clear, previous_clear)]:
+        size = program_size(teal)
+        delta = format_delta(size, program_size(previous_teal)) if previous_teal else ""
+        lines.append(f"{name:<30}{size:>10}{delta:>8}")
+
+    lines.append("")
+    lines.append(f"{'route':<30}{'cost':>6}{'delta':>8}{'loop':>6}"
+                 f"{'global r/w':>12}{'local r/w':>11}")
+    for name, route in sorted(current["routes"].items()):
+        previous_route = (previous or no_previous)["routes"].get(name)
+        delta = format_delta(route["cost"], previous_route["cost"] if previous_route else None) if previous else ""
+        lines.append(
+            f"{name:<30}{route['cost'] if route['cost'] is not None else '-':>6}{delta:>8}"
+            f"{'yes' if route['loop'] else '':>6}"
+            f"{route['global_reads']:>7}/{route['global_writes']:<4}"
+            f"{route['local_reads']:>6}/{route['local_writes']:<4}"
+        )
+    for name in sorted(set((previous or no_previous)["routes"]) - set(current["routes"])):
+        lines.append(f"{name:<30}{'-':>6}{'removed':>8}")
+    return "\n".join(lines)
@@ -0,0 +1,79 @@
+""" Hot-path-first layout of the ABI router of an approval program.
+
+Beaker dispatches ABI calls by comparing the method selector with each method of the application, in declaration
+order: every comparison costs 4 opcodes (`txna ApplicationArgs 0; pushbytes <selector>; ==; bnz <branch>`), so a call
+pays for the comparisons of all the methods checked before its own. Given a call-frequency profile, the comparisons
+are reordered from the most to the least frequent method, which minimizes the expected dispatch cost per call.
+"""
+import base64
+from collections import Counter
+
+from .optimize import Line
+from .report import analyze
+
+# Instructions of a selector comparison of the router, before the branch
+selector_check = ["txna", "pushbytes", "=="]
+
+
+def dispatch_chain(lines: list[Line]) -> list[list[int]]:
+    """ Return the selector comparisons of the router, as the indexes of the 4 instruction lines of each. """
+    code = [i for i, line in enumerate(lines) if line.op is not None]
+    chain = []
+    for n in range(len(code) - 3):
+        check = [lines[i] for i in code[n:n + 4]]
+        if [line.op for line in check] == selector_check + ["bnz"] and check[0].args == ["ApplicationArgs", "0"] \
+                and check[1].comment.startswith('"'):
+            # Comparisons must be contiguous, only comments are allowed in between
+            if chain and chain[-1][-1] != code[n - 1]:
+                break
+            chain.append(code[n:n + 4])
+    return chain
+
+
+def method_name(check: list[Line]) -> str:
+    """ Return the name of the ABI method dispatched by a selector comparison, from the selector comment. """
+    return check[1].comment.strip('"').split("(")[0]
+
+
+def dispatch_profile(teal: str, transactions: list[dict]) -> Counter:
+    """ Return the call-frequency profile of the ABI methods of an approval program, counted from application call
+    transactions (as returned by algod or the indexer), inner transactions included.
+    """
+    lines = [Line(text) for text in teal.splitlines()]
+    methods = {}
+    for indexes in dispatch_chain(lines):
+        check = [lines[i] for i in indexes]
+        methods[bytes.fromhex(check[1].args[0][2:])] = method_name(check)
+
+    profile = Counter()
+    pending = list(transactions)
+    while pending:
+        txn = pending.pop()
+        pending.extend(txn.get("inner-txns", []))
+        args = txn.get("application-transaction", {}).get("application-args", [])
+        if args and base64.b64decode(args[0]) in methods:
+            profile[methods[base64.b64decode(args[0])]] += 1
+    return profile
+
+
+def reorder_dispatch(teal: str, profile: dict[str, int]) -> str:
+    """ Return the approval program with the router selector comparisons ordered by decreasing call frequency.
+    Methods missing from the profile keep their relative order, after the profiled ones.
+    """
+    lines = [Line(text) for text in teal.splitlines()]
+    chain = dispatch_chain(lines)
+    checks = [[lines[i] for i in check] for check in chain]
+    ordered = sorted(checks, key=lambda check: -profile.get(method_name(check), 0))
+    for indexes, check in zip(chain, ordered):
+        for i, line in zip(indexes, check):
+            lines[i] = line
+    return "\n".join(line.text for line in lines) + "\n"
+
+
+def expected_cost(teal: str, profile: dict[str, int]) -> float | None:
+    """ Return the expected worst-case opcode cost per call of the profiled methods, None for an empty profile. """
+    routes = analyze(teal)["routes"]
+    calls = {name: count for name, count in profile.items() if name in routes and routes[name]["cost"] is not None}
+    if not sum(calls.values()):
+        return None
+    return sum(routes[name]["cost"] * count for name, count in calls.items()) / sum(calls.values())
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+from algosdk import account, encoding
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+from algosdk.error import AlgodHTTPError, ConfirmationTimeoutError
+
+from bench.standin import StandInNode
+from client import AsyncAlgoBetClient
+from client.aio import GroupRejectedError
+from client.algobet import decode_event_logs
+from client.ingest import BetIngestor
+from client.lite import signer_address
+from test.test_contract import TestContractBase
+
+
+@pytest.fixture
+def node() -> StandInNode:
+    with StandInNode(latency_s=0.001, round_time_s=0.05) as node:
+        yield node
+
+
+def test_place_bets(node):
+    signers = [AccountTransactionSigner(account.generate_account()[0]) for _ in range(20)]
+
+    async def place_bets():
+        async with AsyncAlgoBetClient(node.client(), 1, max_in_flight=8) as client:
+            return await client.place_bets((signer, i % 2) for i, signer in enumerate(signers))
+
+    results = asyncio.run(place_bets())
+    assert [r.method.name for r in results] == ["bet"] * len(signers)
+    assert all(r.tx_info["confirmed-round"] for r in results)
+    # Each group has its own transaction ids
+    assert len({r.tx_id for r in results}) == len(signers)
+
+
+def test_confirmation_timeout(node, monkeypatch):
+    # Transactions are never confirmed
+    monkeypatch.setattr(node, "pending_transaction_info", lambda tx_id: {"pool-error": "", "txn": {}})
+    signer = AccountTransactionSigner(account.generate_account()[0])
+
+    async def place_bet():
+        async with AsyncAlgoBetClient(node.client(), 1, wait_rounds=2) as client:
+            return await client.place_bet(signer, 0)
+
+    with pytest.raises(ConfirmationTimeoutError):
+        asyncio.run(place_bet())
+
+
+def test_confirmation_after_idle_rounds(node):
+    signers = [AccountTransactionSigner(account.generate_account()[0]) for _ in range(2)]
+
+    async def place_bets():
+        async with AsyncAlgoBetClient(node.client(), 1, wait_rounds=2) as client:
+            first = await client.place_bet(signers[0], 0)
+            # No round is followed meanwhile
+            await asyncio.sleep(10 * node.round_time_s)
+            return first, await client.place_bet(signers[1], 1)
+
+    first, second = asyncio.run(place_bets())
+    assert second.tx_info["confirmed-round"] >= first.tx_info["confirmed-round"] + 10
+
+
+def test_watcher_error(node):
+    signer = AccountTransactionSigner(account.generate_account()[0])
+
+    def status_after_block(round_num):
+        raise ConnectionError("Connection reset by peer")
+
+    async def place_bet():
+        async with AsyncAlgoBetClient(node.client(), 1) as client:
+            client.client.status_after_block = status_after_block
+            # The confirmation fails rather than hanging
+            return await asyncio.wait_for(client.place_bet(signer, 0), 5)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(place_bet())
+
+
+def test_ingest_bets(node):
+    signers = [AccountTransactionSigner(account.generate_account()[0]) for _ in range(20)]
+
+    async def ingest():
+        async with AsyncAlgoBetClient(node.client(), 1, max_in_flight=2) as client:
+            return await BetIngestor(client).ingest((signer, i % 2) for i, signer in enumerate(signers))
+
+    results = asyncio.run(ingest())
+    assert [r.method.name for r in results] == ["bet"] * len(signers)
+    # Groups of 8, 8 and 4 bets
+    assert node.submissions == 3
+    assert len({r.tx_info["confirmed-round"] for r in results[:8]}) == 1
+
+
+def test_ingest_rejected_bet(node, monkeypatch):
+    signers = [AccountTransactionSigner(account.generate_account()[0]) for _ in range(8)]
+    rejected = encoding.decode_address(signer_address(signers[3]))
+    submit = node.submit
+
+    def reject_sender(body: bytes) -> str:
+        if rejected in body:
+            raise ValueError("logic eval error: User has already placed a bet")
+        return submit(body)
+
+    monkeypatch.setattr(node, "submit", reject_sender)
+
+    async def ingest():
+        async with AsyncAlgoBetClient(node.client(), 1) as client:
+            return await BetIngestor(client).ingest((signer, 0) for signer in signers)
+
+    results = asyncio.run(ingest())
+    # The group is rejected, then the bets are placed one by one
+    assert isinstance(results[3], GroupRejectedError)
+    assert all(r.method.name == "bet" for i, r in enumerate(results) if i != 3)
+    assert node.submissions == 7
+
+
+def test_ingest_error_after_submission(node):
+    signers = [AccountTransactionSigner(account.generate_account()[0]) for _ in range(8)]
+
+    async def ingest():
+        async with AsyncAlgoBetClient(node.client(), 1) as client:
+            pending_transaction_info = client.client.pending_transaction_info
+            watched = []
+
+            def fail_after_confirmation(tx_id, **kwargs):
+                # The results of the confirmed group cannot be read
+                if watched and tx_id != watched[0]:
+                    raise AlgodHTTPError("Service unavailable", 503)
+                watched.append(tx_id)
+                return pending_transaction_info(tx_id, **kwargs)
+
+            client.client.pending_transaction_info = fail_after_confirmation
+            return await BetIngestor(client).ingest((signer, 0) for signer in signers)
+
+    results = asyncio.run(ingest())
+    # The accepted group is not placed again bet by bet
+    assert all(isinstance(r, AlgodHTTPError) and not isinstance(r, GroupRejectedError) for r in results)
+    assert node.submissions == 1
+
+
+class TestBetIngestor(TestContractBase):
+    """ The bets of all the participants are placed in a single atomic group. """
+
+    def test_ingest_bets(self, app_addr, creator_app_client, participant_accounts):
+        orders = [(a.signer, opt) for a, opt in zip(participant_accounts, [0, 0, 1, 2])]
+
+        async def ingest(bets):
+            async with AsyncAlgoBetClient(creator_app_client.client, creator_app_client.app_id) as client:
+                return await BetIngestor(client).ingest(bets)
+
+        results = asyncio.run(ingest(orders))
+        assert len({r.tx_info["confirmed-round"] for r in results}) == 1
+        for r, a, opt in zip(results, participant_accounts, [0, 0, 1, 2]):
+            assert decode_event_logs(r.tx_info["logs"]) == [("BetPlaced", [a.address, opt])]
+
+        # A second bet is rejected
+        assert isinstance(asyncio.run(ingest(orders[:1])).pop(), AlgodHTTPError)
@@ -0,0 +1,59 @@
+import base64
+
+import pytest
+from pyteal import Router
+
+from client.cache import ArtifactCache, CachedApplicationClient, cached_application, source_files, _cached_apps
+from contract import AlgoBet
+
+
+class PatchedAlgoBet(AlgoBet):
+    """ AlgoBet subclass defined in the tests, whose programs depend on this module as well. """
+
+
+def test_source_files():
+    assert any(filename.endswith("contract.py") for filename in source_files(AlgoBet))
+    assert __file__ in source_files(PatchedAlgoBet)
+
+
+def test_cached_application(tmp_path, monkeypatch):
+    cache = ArtifactCache(str(tmp_path))
+    app = cached_application(AlgoBet, cache)
+    assert app is cached_application(AlgoBet, cache)
+    assert (app.approval_program, app.clear_program) == (AlgoBet().approval_program, AlgoBet().clear_program)
+
+    # A new process loads the programs from disk, without compiling them
+    _cached_apps.pop((AlgoBet, cache.directory))
+    monkeypatch.setattr(Router, "compile_program", lambda self, **kwargs: pytest.fail("programs compiled again"))
+    loaded = cached_application(AlgoBet, cache)
+    assert loaded is not app
+    assert loaded.approval_program == app.approval_program
+    assert loaded.contract.dictify() == app.contract.dictify()
+    assert type(loaded).__name__ == "AlgoBet"
+
+
+class Algod:
+    """ Algod client compiling programs to their own source bytes. """
+
+    def __init__(self):
+        self.compiled = 0
+
+    def versions(self):
+        return {"build": {"major": 3, "minor": 12, "build_number": 2, "commit_hash": "abc"}}
+
+    def compile(self, teal: str, source_map: bool = False):
+        self.compiled += 1
+        return {"result": base64.b64encode(teal.encode()).decode(), "hash": "HASH", "sourcemap": {
+            "version": 3, "sources": [], "names": [], "mappings": ";"
+        }}
+
+
+def test_cached_compile(tmp_path):
+    cache, algod = ArtifactCache(str(tmp_path)), Algod()
+    app = cached_application(AlgoBet, cache)
+    for _ in range(2):
+        client = CachedApplicationClient(client=algod, app=app, cache=cache)
+        client.build()
+        assert client.approval_binary == app.approval_program.encode()
+    # Approval and clear programs compiled by the first client only
+    assert algod.compiled == 2
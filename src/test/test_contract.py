@@ -3,7 +3,8 @@ import time
 from pprint import pformat
 
 import pytest
-from algosdk.atomic_transaction_composer import TransactionWithSigner
+from algosdk import account
+from algosdk.atomic_transaction_composer import TransactionWithSigner, AccountTransactionSigner
 from algosdk.encoding import decode_address
 from algosdk.future import transaction
 from beaker import (
@@ -14,6 +15,10 @@ from beaker.client import ApplicationClient, LogicException
 from beaker.sandbox import SandboxAccount
 from pyteal import Approve
 
+from client import AlgoBetClient
+from client.cache import CachedApplicationClient, cached_application
+from client.algobet import decode_event_logs
+from client.lite import pooled_fee_params
 from contract import AlgoBet as App
 from test import TestBase
 from test.conftest import logger
@@ -32,6 +37,11 @@ def dummy(self):
 App.dummy = dummy
 
 
+def pooled_payout_params(app_client: ApplicationClient) -> transaction.SuggestedParams:
+    """ Return suggested params whose flat fee also covers the payout inner transaction. """
+    return pooled_fee_params(app_client.get_suggested_params(), 1)
+
+
 class TestContractBase(TestBase):
     """
     Base class for AlgoBet testing routines.
@@ -138,10 +148,10 @@ class TestContractBase(TestBase):
         """
         creator_acct = get_account()
 
-        return ApplicationClient(
+        return CachedApplicationClient(
             client=algod_client,
-            # Instantiate app with the program version (default is MAX_TEAL_VERSION)
-            app=App(),
+            # Programs are loaded from the compiled artifacts cache, shared by all the test classes
+            app=cached_application(App),
             # Set the Transaction Signer as creator account
             signer=creator_acct.signer
         )
@@ -214,6 +224,7 @@ class TestContractBase(TestBase):
             event_start_unix_timestamp=int(time.time() + self.config["event_start_since_test_start_s"]),
             event_end_unix_timestamp=int(time.time() + self.config["event_end_since_test_start_s"]),
             payout_time_window_s=self.config["payout_time_s"],
+            options_count=self.config.get("options_count", 3),
         )
         logger.debug(f"Created app with id: {app_id} and address: {app_addr} in tx: {tx_id}")
         app_state = creator_app_client.get_application_state()
@@ -266,7 +277,7 @@ class TestContractPermissions(TestContractBase):
                 bet_deposit_tx=TransactionWithSigner(
                     txn=transaction.PaymentTxn(
                         creator_app_client.get_sender(),
-                        creator_app_client.client.suggested_params(),
+                        creator_app_client.get_suggested_params(),
                         app_addr,
                         140 * consts.milli_algo),
                     signer=creator_app_client.signer
@@ -285,7 +296,7 @@ class TestContractPermissions(TestContractBase):
             bet_deposit_tx=TransactionWithSigner(
                 txn=transaction.PaymentTxn(
                     creator_app_client.get_sender(),
-                    creator_app_client.client.suggested_params(),
+                    creator_app_client.get_suggested_params(),
                     app_addr,
                     140 * consts.milli_algo),
                 signer=creator_app_client.signer
@@ -304,7 +315,7 @@ class TestContractPermissions(TestContractBase):
                 bet_deposit_tx=TransactionWithSigner(
                     txn=transaction.PaymentTxn(
                         c.get_sender(),
-                        c.client.suggested_params(),
+                        c.get_suggested_params(),
                         app_addr,
                         140 * consts.milli_algo),
                     signer=c.signer
@@ -323,7 +334,7 @@ class TestContractPermissions(TestContractBase):
             bet_deposit_tx=TransactionWithSigner(
                 txn=transaction.PaymentTxn(
                     c.get_sender(),
-                    c.client.suggested_params(),
+                    c.get_suggested_params(),
                     app_addr,
                     140 * consts.milli_algo),
                 signer=c.signer
@@ -342,7 +353,7 @@ class TestContractPermissions(TestContractBase):
                 bet_deposit_tx=TransactionWithSigner(
                     txn=transaction.PaymentTxn(
                         c.get_sender(),
-                        c.client.suggested_params(),
+                        c.get_suggested_params(),
                         app_addr,
                         140 * consts.milli_algo),
                     signer=c.signer
@@ -361,7 +372,7 @@ class TestContractPermissions(TestContractBase):
             bet_deposit_tx=TransactionWithSigner(
                 txn=transaction.PaymentTxn(
                     c.get_sender(),
-                    c.client.suggested_params(),
+                    c.get_suggested_params(),
                     app_addr,
                     140 * consts.milli_algo),
                 signer=c.signer
@@ -417,7 +428,7 @@ class TestContractFlow(TestContractBase):
         bet_deposit_tx = TransactionWithSigner(
             txn=transaction.PaymentTxn(
                 c.get_sender(),
-                c.client.suggested_params(),
+                c.get_suggested_params(),
                 app_addr,
                 348 * consts.milli_algo),
             signer=c.signer
@@ -444,7 +455,7 @@ class TestContractFlow(TestContractBase):
         bet_deposit_tx = TransactionWithSigner(
             txn=transaction.PaymentTxn(
                 c.get_sender(),
-                c.client.suggested_params(),
+                c.get_suggested_params(),
                 app_addr,
                 140 * consts.milli_algo),
             signer=c.signer
@@ -462,24 +473,52 @@ class TestContractFlow(TestContractBase):
 
         assert balance_2 == balance_1
 
+    def test_make_bet_deposit_from_other_sender(self, app_addr, creator_app_client, participant_clients):
+        balance_1 = creator_app_client.get_application_account_info()['amount']
+
+        c, other = participant_clients[:2]
+
+        # TX for paying the bet quote, sent by another participant
+        bet_deposit_tx = TransactionWithSigner(
+            txn=transaction.PaymentTxn(
+                other.get_sender(),
+                c.get_suggested_params(),
+                app_addr,
+                140 * consts.milli_algo),
+            signer=other.signer
+        )
+
+        # Make a bet
+        with pytest.raises(LogicException):
+            c.call(
+                App.bet,  # noqa
+                bet_deposit_tx=bet_deposit_tx,
+                opt=0
+            )
+
+        balance_2 = creator_app_client.get_application_account_info()['amount']
+
+        assert balance_2 == balance_1
+
     def test_make_bets(self, app_addr, creator_app_client, participant_clients):
         def _make_bet(c: ApplicationClient, opt):
             # TX for paying the bet quote
             bet_deposit_tx = TransactionWithSigner(
                 txn=transaction.PaymentTxn(
                     c.get_sender(),
-                    c.client.suggested_params(),
+                    c.get_suggested_params(),
                     app_addr,
                     140 * consts.milli_algo),
                 signer=c.signer
             )
 
             # Make a bet
-            c.call(
+            res = c.call(
                 App.bet,  # noqa
                 bet_deposit_tx=bet_deposit_tx,
                 opt=opt
             )
+            assert decode_event_logs(res.tx_info["logs"]) == [("BetPlaced", [c.get_sender(), opt])]
 
         balance_1 = creator_app_client.get_application_account_info()['amount']
 
@@ -501,7 +540,7 @@ class TestContractFlow(TestContractBase):
         bet_deposit_tx = TransactionWithSigner(
             txn=transaction.PaymentTxn(
                 c.get_sender(),
-                c.client.suggested_params(),
+                c.get_suggested_params(),
                 app_addr,
                 140 * consts.milli_algo),
             signer=c.signer
@@ -529,7 +568,7 @@ class TestContractFlow(TestContractBase):
         bet_deposit_tx = TransactionWithSigner(
             txn=transaction.PaymentTxn(
                 c.get_sender(),
-                c.client.suggested_params(),
+                c.get_suggested_params(),
                 app_addr,
                 140 * consts.milli_algo),
             signer=c.signer
@@ -554,6 +593,7 @@ class TestContractFlow(TestContractBase):
         with pytest.raises(LogicException):
             c.call(
                 App.payout,  # noqa
+                suggested_params=pooled_payout_params(c)
             )
 
     def test_oracle_set_result_before_event_end(self, app_addr, oracle_app_client):
@@ -570,16 +610,18 @@ class TestContractFlow(TestContractBase):
         with pytest.raises(LogicException):
             c.call(
                 App.payout,  # noqa
+                suggested_params=pooled_payout_params(c)
             )
 
     def test_oracle_set_result_after_event_end(self, app_addr, oracle_app_client, safe_wait_to_payout):
         safe_wait_to_payout()
 
         c = oracle_app_client
-        c.call(
+        res = c.call(
             App.set_event_result,  # noqa
             opt=0
         )
+        assert decode_event_logs(res.tx_info["logs"]) == [("EventResultSet", [0, 2, 140000 * 3 // 2])]
 
     def test_request_payout_looser(self, app_addr, participant_clients):
         c = participant_clients[2]
@@ -587,26 +629,30 @@ class TestContractFlow(TestContractBase):
         with pytest.raises(LogicException):
             c.call(
                 App.payout,  # noqa
+                suggested_params=pooled_payout_params(c)
             )
 
     def test_request_payout_winners(self, app_addr, participant_clients):
-        for c in [participant_clients[0], participant_clients[1]]:
+        # The first winner pools the payout fee, the second one pays a single transaction fee
+        for c, sp, fee in [(participant_clients[0], pooled_payout_params(participant_clients[0]), 0),
+                           (participant_clients[1], None, 1000)]:
             res = c.call(
                 App.payout,  # noqa
+                suggested_params=sp
             )
             tx_amount = res.tx_info["inner-txns"][0]["txn"]["txn"]["amt"]
-            tx_fee = res.tx_info["inner-txns"][0]["txn"]["txn"]["fee"]
-            assert tx_amount == (140000 * 3 / 2 - tx_fee)
+            tx_fee = res.tx_info["inner-txns"][0]["txn"]["txn"].get("fee", 0)
+            assert tx_amount == 140000 * 3 // 2 - fee
+            assert tx_fee == fee
+            assert decode_event_logs(res.tx_info["logs"]) == [("PayoutSent", [c.get_sender(), 140000 * 3 // 2 - fee])]
 
     def test_request_payout_winners_again(self, app_addr, participant_clients):
         for c in [participant_clients[0], participant_clients[1]]:
             with pytest.raises(LogicException):
-                res = c.call(
+                c.call(
                     App.payout,  # noqa
+                    suggested_params=pooled_payout_params(c)
                 )
-                tx_amount = res.tx_info["inner-txns"][0]["txn"]["txn"]["amt"]
-                tx_fee = res.tx_info["inner-txns"][0]["txn"]["txn"]["fee"]
-                assert tx_amount == (140000 * 3 / 2 - tx_fee)
 
     def test_request_deletion_before_payout_time(self, app_addr, creator_app_client):
         with pytest.raises(LogicException):
@@ -628,7 +674,7 @@ class TestContractNoWinners(TestContractBase):
             bet_deposit_tx = TransactionWithSigner(
                 txn=transaction.PaymentTxn(
                     c.get_sender(),
-                    c.client.suggested_params(),
+                    c.get_suggested_params(),
                     app_addr,
                     140 * consts.milli_algo),
                 signer=c.signer
@@ -666,6 +712,7 @@ class TestContractNoWinners(TestContractBase):
             with pytest.raises(LogicException):
                 res = c.call(
                     App.payout,  # noqa
+                    suggested_params=pooled_payout_params(c)
                 )
 
     def test_request_deletion_after_payout_time(self, app_addr, creator_app_client, safe_wait_to_delete):
@@ -674,3 +721,275 @@ class TestContractNoWinners(TestContractBase):
 
         # Assert close out of smart contract account
         assert creator_app_client.get_application_account_info()['amount'] == 0
+
+
+class TestContractManyOptions(TestContractBase):
+    # Test configuration
+    config = {
+        "session_start_s": time.time(),  # Start time of test session
+        "event_start_since_test_start_s": 5,  # Time interval before event start
+        "event_end_since_test_start_s": 10,  # Time interval before event end
+        "payout_time_s": 3,  # Minimum time interval to allow payout
+        "options_count": 40  # Number of possible event outcomes
+    }
+
+    def test_participants_opt_in(self, app_addr, participant_clients):
+        for p in participant_clients:
+            p.opt_in()
+
+    def test_make_bet_option_out_of_range(self, app_addr, creator_app_client, participant_clients):
+        balance_1 = creator_app_client.get_application_account_info()['amount']
+
+        c = participant_clients[0]
+
+        # TX for paying the bet quote
+        bet_deposit_tx = TransactionWithSigner(
+            txn=transaction.PaymentTxn(
+                c.get_sender(),
+                c.get_suggested_params(),
+                app_addr,
+                140 * consts.milli_algo),
+            signer=c.signer
+        )
+
+        # Make a bet on the first option past the last valid one
+        with pytest.raises(LogicException):
+            c.call(
+                App.bet,  # noqa
+                bet_deposit_tx=bet_deposit_tx,
+                opt=self.config["options_count"]
+            )
+
+        balance_2 = creator_app_client.get_application_account_info()['amount']
+
+        assert balance_2 == balance_1
+
+    def test_make_bets(self, app_addr, creator_app_client, participant_clients):
+        def _make_bet(c: ApplicationClient, opt):
+            # TX for paying the bet quote
+            bet_deposit_tx = TransactionWithSigner(
+                txn=transaction.PaymentTxn(
+                    c.get_sender(),
+                    c.get_suggested_params(),
+                    app_addr,
+                    140 * consts.milli_algo),
+                signer=c.signer
+            )
+
+            # Make a bet
+            c.call(
+                App.bet,  # noqa
+                bet_deposit_tx=bet_deposit_tx,
+                opt=opt
+            )
+
+        balance_1 = creator_app_client.get_application_account_info()['amount']
+
+        # Bets on options stored in different counters pages
+        _make_bet(participant_clients[0], 39)
+        _make_bet(participant_clients[1], 39)
+        _make_bet(participant_clients[2], 14)
+
+        balance_2 = creator_app_client.get_application_account_info()['amount']
+
+        assert (balance_2 - balance_1) == 140000 * 3
+
+    def test_get_market_state(self, app_addr, creator_app_client, oracle_account):
+        market = AlgoBetClient(
+            client=creator_app_client.client, app=creator_app_client.app, app_id=creator_app_client.app_id
+        ).get_market_state()
+
+        assert market["manager"] == creator_app_client.get_sender()
+        assert market["oracle_addr"] == oracle_account.address
+        assert market["options_count"] == 40
+        assert market["stake_amount"] == 140000 * 3
+        # One counter per option, joined across counters pages
+        expected_counters = [0] * 40
+        expected_counters[14] = 1
+        expected_counters[39] = 2
+        assert market["option_counters"] == expected_counters
+
+    def test_oracle_set_result_after_event_end(self, app_addr, oracle_app_client, safe_wait_to_payout):
+        safe_wait_to_payout()
+
+        c = oracle_app_client
+        c.call(
+            App.set_event_result,  # noqa
+            opt=39
+        )
+
+        app_state = c.get_application_state()
+        assert app_state[App.winning_count.str_key()] == 2
+
+    def test_request_payout_winners(self, app_addr, participant_clients):
+        for c in [participant_clients[0], participant_clients[1]]:
+            res = c.call(
+                App.payout,  # noqa
+                suggested_params=pooled_payout_params(c)
+            )
+            tx_amount = res.tx_info["inner-txns"][0]["txn"]["txn"]["amt"]
+            tx_fee = res.tx_info["inner-txns"][0]["txn"]["txn"].get("fee", 0)
+            assert tx_amount == 140000 * 3 // 2
+            assert tx_fee == 0
+
+
+class TestContractClientOnboarding(TestContractBase):
+    @pytest.fixture(scope="class")
+    def new_participant_client(self, app_addr, creator_app_client) -> AlgoBetClient:
+        """Return an AlgoBet client signed by a freshly created account, funded by the creator account
+        and not opted in the application yet."""
+        sk, addr = account.generate_account()
+        creator_app_client.fund(1 * consts.algo, addr)
+        return AlgoBetClient(
+            client=creator_app_client.client,
+            app=creator_app_client.app,
+            app_id=creator_app_client.app_id,
+            signer=AccountTransactionSigner(sk)
+        )
+
+    def test_place_bet_without_opt_in(self, app_addr, new_participant_client):
+        c = new_participant_client
+        assert not c.is_opted_in()
+
+        # Opt-in and bet are requested with a single application call, grouped with the deposit
+        result = c.place_bet(opt=1)
+        assert "grp" in result.tx_info["txn"]["txn"]
+        assert result.tx_info["txn"]["txn"]["apan"] == transaction.OnComplete.OptInOC
+
+        assert c.is_opted_in()
+        assert c.get_account_state()[App.participant_record.str_key()] == (1 << 8) | 1
+
+    def test_place_bet_twice(self, app_addr, new_participant_client):
+        c = new_participant_client
+        with pytest.raises(LogicException):
+            c.place_bet(opt=2)
+
+    def test_opt_in_with_payout(self, app_addr, creator_app_client):
+        """Evaluate that methods other than bet() cannot be used to opt-in."""
+        sk, addr = account.generate_account()
+        creator_app_client.fund(1 * consts.algo, addr)
+        c = creator_app_client.prepare(signer=AccountTransactionSigner(sk))
+        with pytest.raises(LogicException):
+            c.call(
+                App.payout,  # noqa
+                suggested_params=pooled_payout_params(c),
+                on_complete=transaction.OnComplete.OptInOC
+            )
+
+
+class TestContractSettlement(TestContractBase):
+    def test_make_bets(self, app_addr, creator_app_client, participant_clients):
+        # Participants opt-in with the bet call, betting on different options
+        for c, opt in zip(participant_clients, [0, 0, 0, 1]):
+            AlgoBetClient(
+                client=c.client, app=c.app, app_id=c.app_id, signer=c.signer
+            ).place_bet(opt=opt)
+
+    def test_settle_payouts_before_event_results(self, app_addr, creator_app_client, participant_clients):
+        keeper = AlgoBetClient(client=creator_app_client.client, app=creator_app_client.app,
+                               app_id=creator_app_client.app_id, signer=creator_app_client.signer)
+        with pytest.raises(LogicException):
+            keeper.settle_payouts([participant_clients[0].get_sender()])
+
+    def test_oracle_set_result_after_event_end(self, app_addr, oracle_app_client, safe_wait_to_payout):
+        safe_wait_to_payout()
+
+        c = oracle_app_client
+        c.call(
+            App.set_event_result,  # noqa
+            opt=0
+        )
+
+    def test_settle_payouts_looser(self, app_addr, creator_app_client, participant_clients):
+        keeper = AlgoBetClient(client=creator_app_client.client, app=creator_app_client.app,
+                               app_id=creator_app_client.app_id, signer=creator_app_client.signer)
+        with pytest.raises(LogicException):
+            keeper.settle_payouts([participant_clients[0].get_sender(), participant_clients[3].get_sender()])
+
+    def test_settle_payouts_winners(self, app_addr, creator_app_client, participant_clients):
+        keeper = AlgoBetClient(client=creator_app_client.client, app=creator_app_client.app,
+                               app_id=creator_app_client.app_id, signer=creator_app_client.signer)
+        winners = [c.get_sender() for c in participant_clients[:3]]
+
+        results = keeper.settle_payouts(winners)
+        assert len(results) == 1
+
+        # All the winners are paid with a single group of inner payments, whose fees are pooled
+        inner_txns = [t["txn"]["txn"] for t in results[0].tx_info["inner-txns"]]
+        assert [t["rcv"] for t in inner_txns] == winners
+        for t in inner_txns:
+            assert t["amt"] == 140000 * 4 // 3
+            assert t.get("fee", 0) == 0
+
+    def test_request_payout_after_settlement(self, app_addr, participant_clients):
+        with pytest.raises(LogicException):
+            participant_clients[0].call(
+                App.payout,  # noqa
+                suggested_params=pooled_payout_params(participant_clients[0])
+            )
+
+    def test_get_participant_statuses(self, app_addr, creator_app_client, participant_clients):
+        keeper = AlgoBetClient(client=creator_app_client.client, app=creator_app_client.app,
+                               app_id=creator_app_client.app_id, signer=creator_app_client.signer)
+        _, outsider = account.generate_account()
+        participants = [c.get_sender() for c in participant_clients] + [outsider]
+
+        # More participants than a single call can carry
+        statuses = keeper.get_participant_statuses(participants)
+
+        for c in participant_clients[:3]:
+            assert statuses[c.get_sender()] == dict(has_placed_bet=True, has_requested_payout=True, chosen_opt=0)
+        assert statuses[participant_clients[3].get_sender()] == \
+               dict(has_placed_bet=True, has_requested_payout=False, chosen_opt=1)
+        assert statuses[outsider] == dict(has_placed_bet=False, has_requested_payout=False, chosen_opt=0)
+
+
+class TestContractRefund(TestContractBase):
+    def test_make_bets(self, app_addr, creator_app_client, participant_clients):
+        # Nobody bets on option 2
+        for c, opt in zip(participant_clients, [0, 0, 1, 1]):
+            AlgoBetClient(
+                client=c.client, app=c.app, app_id=c.app_id, signer=c.signer
+            ).place_bet(opt=opt)
+
+    def test_refund_bets_before_event_results(self, app_addr, creator_app_client, participant_clients):
+        keeper = AlgoBetClient(client=creator_app_client.client, app=creator_app_client.app,
+                               app_id=creator_app_client.app_id, signer=creator_app_client.signer)
+        with pytest.raises(LogicException):
+            keeper.refund_bets([participant_clients[0].get_sender()])
+
+    def test_oracle_set_result_after_event_end(self, app_addr, oracle_app_client, safe_wait_to_payout):
+        safe_wait_to_payout()
+
+        c = oracle_app_client
+        c.call(
+            App.set_event_result,  # noqa
+            opt=2
+        )
+
+        app_state = c.get_application_state()
+        assert app_state[App.winning_count.str_key()] == 0
+
+    def test_refund_bets(self, app_addr, creator_app_client, participant_clients):
+        keeper = AlgoBetClient(client=creator_app_client.client, app=creator_app_client.app,
+                               app_id=creator_app_client.app_id, signer=creator_app_client.signer)
+        bettors = [c.get_sender() for c in participant_clients]
+
+        results = keeper.refund_bets(bettors)
+        assert len(results) == 1
+
+        # All the bettors are refunded with a single group of inner payments, whose fees are pooled
+        inner_txns = [t["txn"]["txn"] for t in results[0].tx_info["inner-txns"]]
+        assert [t["rcv"] for t in inner_txns] == bettors
+        for t in inner_txns:
+            assert t["amt"] == 140000
+            assert t.get("fee", 0) == 0
+
+        app_state = keeper.get_application_state()
+        assert app_state[App.stake_amount.str_key()] == 0
+
+    def test_refund_bets_again(self, app_addr, creator_app_client, participant_clients):
+        keeper = AlgoBetClient(client=creator_app_client.client, app=creator_app_client.app,
+                               app_id=creator_app_client.app_id, signer=creator_app_client.signer)
+        with pytest.raises(LogicException):
+            keeper.refund_bets([participant_clients[0].get_sender()])
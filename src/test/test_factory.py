@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from algosdk.encoding import decode_address
+from algosdk.logic import get_application_address
+from beaker import consts
+from beaker.client import LogicException
+
+from client import AlgoBetClient, AlgoBetFactoryClient
+from contract import AlgoBet
+from test import TestBase
+
+
+class TestFactory(TestBase):
+    """ AlgoBet factory testing routines: markets are created and funded by a factory instance. """
+
+    @pytest.fixture(scope="class")
+    def creator_factory_client(self, get_account, algod_client) -> AlgoBetFactoryClient:
+        """Return the factory client signed by the creator account, popped out from sandbox accounts list."""
+        return AlgoBetFactoryClient(client=algod_client, signer=get_account().signer)
+
+    @pytest.fixture(scope="class")
+    def factory_addr(self, creator_factory_client):
+        """Create the factory on chain, funding it for the creation of a few markets."""
+        _, factory_addr, _ = creator_factory_client.create(
+            manager_addr=creator_factory_client.get_sender(),
+            child_funding=200 * consts.milli_algo,
+        )
+        creator_factory_client.fund(10 * consts.algo)
+        yield factory_addr
+
+    def test_create_markets(self, factory_addr, creator_factory_client, get_account):
+        oracle_acct = get_account()
+        markets = [
+            dict(
+                manager_addr=creator_factory_client.get_sender(),
+                oracle_addr=oracle_acct.address,
+                event_start_unix_timestamp=int(time.time() + 60 + i),
+                event_end_unix_timestamp=int(time.time() + 120 + i),
+                payout_time_window_s=60,
+                options_count=2 + i,
+            )
+            for i in range(3)
+        ]
+
+        app_ids = creator_factory_client.create_markets(markets)
+        assert len(app_ids) == len(markets)
+
+        for app_id, market in zip(app_ids, markets):
+            child_client = AlgoBetClient(client=creator_factory_client.client, app_id=app_id)
+            app_state = child_client.get_application_state()
+            assert app_state[AlgoBet.manager.str_key()] == decode_address(market["manager_addr"]).hex()
+            assert app_state[AlgoBet.oracle_addr.str_key()] == decode_address(market["oracle_addr"]).hex()
+            assert app_state[AlgoBet.options_count.str_key()] == market["options_count"]
+
+            # Each market is funded in the same call which creates it
+            child_info = creator_factory_client.client.account_info(get_application_address(app_id))
+            assert child_info["amount"] == 200 * consts.milli_algo
+
+    def test_create_market_from_non_manager(self, factory_addr, creator_factory_client, get_account):
+        acct = get_account()
+        with pytest.raises(LogicException):
+            creator_factory_client.prepare(signer=acct.signer).create_markets([
+                dict(
+                    manager_addr=acct.address,
+                    oracle_addr=acct.address,
+                    event_start_unix_timestamp=int(time.time() + 60),
+                    event_end_unix_timestamp=int(time.time() + 120),
+                    payout_time_window_s=60,
+                    options_count=3,
+                )
+            ])
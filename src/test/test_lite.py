@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+
+import msgpack
+import pytest
+from algosdk import abi, account
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+from algosdk.error import AlgodHTTPError
+from algosdk.future import transaction
+
+import client
+from bench.standin import StandInNode, stand_in_bet_amount
+from client import AlgoBetLiteClient, AlgoBetMultiSignerClient
+from client.algobet import decode_event_logs
+from client.lite import load_contract
+from contract import AlgoBet
+from test.test_contract import TestContractBase
+
+
+def test_contract_description():
+    # The exported description must be kept in sync with the contract, by running `src/teal/compile.py`. The dummy
+    # method is added by the contract tests only.
+    exported = {m.get_signature() for m in load_contract().methods}
+    assert exported == {m.get_signature() for m in AlgoBet().contract.methods if m.name != "dummy"}
+
+
+def test_lazy_imports():
+    statement = "import sys; from client import AlgoBetLiteClient; " \
+                "print('pyteal' in sys.modules, 'beaker' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", statement], capture_output=True, check=True, text=True,
+                            cwd=os.path.dirname(os.path.dirname(client.__file__)))
+    assert output.stdout.split() == ["False", "False"]
+
+
+def test_place_bet(monkeypatch):
+    with StandInNode(latency_s=0.001, round_time_s=0.05) as node:
+        groups = []
+        submit = node.submit
+
+        def record_group(body: bytes) -> str:
+            unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+            unpacker.feed(body)
+            groups.append([transaction.SignedTransaction.undictify(stxn).transaction for stxn in unpacker])
+            return submit(body)
+
+        monkeypatch.setattr(node, "submit", record_group)
+        signer = AccountTransactionSigner(account.generate_account()[0])
+        lite_client = AlgoBetLiteClient(node.client(), 1, signer=signer)
+        res = lite_client.place_bet(2)
+
+    # The deposit, then the `bet` call encoding the chosen option
+    deposit, call = groups.pop()
+    assert res.method.name == "bet" and res.tx_id == call.get_txid()
+    assert (deposit.sender, deposit.receiver, deposit.amt) == (lite_client.sender, lite_client.app_addr,
+                                                               stand_in_bet_amount)
+    assert call.app_args == [load_contract().get_method_by_name("bet").get_selector(), abi.UintType(64).encode(2)]
+    assert call.index == 1 and call.sender == lite_client.sender
+
+
+class TestMultiSignerClient(TestContractBase):
+    """ A single multi-signer client serves all the participants and the oracle of a market. """
+
+    @pytest.fixture(scope="class")
+    def multi_client(self, app_addr, creator_app_client) -> AlgoBetMultiSignerClient:
+        return AlgoBetMultiSignerClient(creator_app_client.client, creator_app_client.app_id)
+
+    def test_make_bets(self, multi_client, participant_accounts):
+        # The first participant opts in with the bare call, the others within the bet call
+        multi_client.opt_in(participant_accounts[0].signer)
+        for a, opt in zip(participant_accounts, [0, 0, 1, 2]):
+            res = multi_client.place_bet(a.signer, opt)
+            assert decode_event_logs(res.tx_info["logs"]) == [("BetPlaced", [a.address, opt])]
+
+    def test_oracle_set_result(self, multi_client, participant_accounts, oracle_account, safe_wait_to_payout):
+        safe_wait_to_payout()
+
+        # Only the oracle may set the result
+        with pytest.raises(AlgodHTTPError):
+            multi_client.set_event_result(participant_accounts[0].signer, 0)
+        multi_client.set_event_result(oracle_account.signer, 0)
+
+    def test_request_payout_winners(self, multi_client, participant_accounts):
+        for a in participant_accounts[:2]:
+            res = multi_client.request_payout(a.signer)
+            assert decode_event_logs(res.tx_info["logs"]) == [("PayoutSent", [a.address, 140000 * 4 // 2])]
@@ -0,0 +1,236 @@
+import time
+
+import pytest
+from algosdk.atomic_transaction_composer import TransactionWithSigner
+from algosdk.future import transaction
+from beaker import (
+    consts,
+    external
+)
+from beaker.client import ApplicationClient, LogicException
+from pyteal import Approve
+
+from client.cache import CachedApplicationClient, cached_application
+from markets import AlgoBetMarkets as App
+from test.conftest import logger
+from test.test_contract import TestContractBase, pooled_payout_params
+
+
+# Workaround for https://github.com/algorand/go-algorand/issues/3192 .
+# See `test_contract.dummy`.
+@external
+def dummy(self):
+    return Approve()
+
+
+App.dummy = dummy
+
+
+class TestMarketsBase(TestContractBase):
+    """
+    Base class for AlgoBetMarkets testing routines.
+    A new instance of the multi-event smart contract is deployed for each subclass, hosting the events listed in
+    `config["event_ids"]`, all sharing the timing constraints of `config`.
+    """
+    # Test configuration
+    config = {
+        "session_start_s": time.time(),  # Start time of test session
+        "event_start_since_test_start_s": 5,  # Time interval before event start
+        "event_end_since_test_start_s": 10,  # Time interval before event end
+        "payout_time_s": 3,  # Minimum time interval to allow payout
+        "event_ids": [1, 2],  # Hosted events
+    }
+
+    @pytest.fixture(scope="class")
+    def creator_app_client(self, get_account, algod_client) -> ApplicationClient:
+        """Return the application client signed by the creator account, popped out from
+        sandbox accounts list. This account is fixed for the duration of a test class run.
+        """
+        creator_acct = get_account()
+
+        return CachedApplicationClient(
+            client=algod_client,
+            app=cached_application(App),
+            signer=creator_acct.signer
+        )
+
+    # Workaround for https://github.com/algorand/go-algorand/issues/3192 .
+    @pytest.fixture(scope="class")
+    def ping_sandbox(self, get_client):
+        """Require a dummy transaction for triggering the creation of a new sandbox block."""
+        c = get_client()
+
+        def _call_dummy(client=c):
+            client.call(App.dummy)
+
+        return _call_dummy
+
+    @pytest.fixture(scope="class")
+    def app_addr(self, creator_app_client, oracle_account):
+        """Create the application on chain and host the configured events, using the Application Client of the
+        creator account. `oracle_addr` parameter is set as the `oracle_account` account address.
+        """
+        logger.debug("Creating the application...")
+        app_id, app_addr, tx_id = creator_app_client.create(
+            manager_addr=creator_app_client.get_sender(),
+            oracle_addr=oracle_account.address,
+        )
+        logger.debug(f"Created app with id: {app_id} and address: {app_addr} in tx: {tx_id}")
+
+        # Fund the app account with 4 Algos (using creator account) for the minimum balance of the global state
+        fund_amount = 4 * consts.algo
+        creator_app_client.fund(fund_amount)
+        logger.debug(f"Funded {app_addr} with {fund_amount}microAlgos")
+
+        for event_id in self.config["event_ids"]:
+            creator_app_client.call(
+                App.create_event,  # noqa
+                event_id=event_id,
+                event_start_unix_timestamp=int(time.time() + self.config["event_start_since_test_start_s"]),
+                event_end_unix_timestamp=int(time.time() + self.config["event_end_since_test_start_s"]),
+                payout_time_window_s=self.config["payout_time_s"],
+                options_count=3,
+            )
+
+        yield app_addr
+
+
+def bet(client: ApplicationClient, app_addr: str, event_id: int, opt: int):
+    """ Place a bet of `client` account on an event. """
+    return client.call(
+        App.bet,  # noqa
+        bet_deposit_tx=TransactionWithSigner(
+            txn=transaction.PaymentTxn(
+                client.get_sender(),
+                client.get_suggested_params(),
+                app_addr,
+                140 * consts.milli_algo),
+            signer=client.signer
+        ),
+        event_id=event_id,
+        opt=opt
+    )
+
+
+class TestMarketsFlow(TestMarketsBase):
+    def test_create_existing_event(self, app_addr, creator_app_client):
+        with pytest.raises(LogicException):
+            creator_app_client.call(
+                App.create_event,  # noqa
+                event_id=1,
+                event_start_unix_timestamp=int(time.time() + 60),
+                event_end_unix_timestamp=int(time.time() + 120),
+                payout_time_window_s=0,
+                options_count=3,
+            )
+
+    def test_make_bet_deposit_from_other_sender(self, app_addr, creator_app_client, participant_clients):
+        balance_1 = creator_app_client.get_application_account_info()['amount']
+
+        c, other = participant_clients[:2]
+
+        # Bet with opt-in, the deposit being sent by another participant
+        with pytest.raises(LogicException):
+            c.call(
+                App.bet,  # noqa
+                on_complete=transaction.OnComplete.OptInOC,
+                bet_deposit_tx=TransactionWithSigner(
+                    txn=transaction.PaymentTxn(
+                        other.get_sender(),
+                        c.get_suggested_params(),
+                        app_addr,
+                        140 * consts.milli_algo),
+                    signer=other.signer
+                ),
+                event_id=1,
+                opt=0
+            )
+
+        balance_2 = creator_app_client.get_application_account_info()['amount']
+
+        assert balance_2 == balance_1
+
+    def test_make_bets(self, app_addr, participant_clients):
+        for c in participant_clients:
+            c.opt_in()
+        # Event 1 is won by two participants, while nobody bets on the winning option of event 2
+        for c, opt in zip(participant_clients, [0, 0, 1, 2]):
+            bet(c, app_addr, event_id=1, opt=opt)
+        for c, opt in zip(participant_clients, [0, 1, 1, 0]):
+            bet(c, app_addr, event_id=2, opt=opt)
+
+        app_state = participant_clients[0].get_application_state()
+        assert app_state[App.events_count.str_key()] == 2
+
+    def test_make_bets_again(self, app_addr, participant_clients):
+        with pytest.raises(LogicException):
+            bet(participant_clients[0], app_addr, event_id=1, opt=1)
+
+    def test_bet_on_missing_event(self, app_addr, participant_clients):
+        with pytest.raises(LogicException):
+            bet(participant_clients[0], app_addr, event_id=3, opt=0)
+
+    def test_oracle_set_result_after_event_end(self, app_addr, oracle_app_client, safe_wait_to_payout):
+        safe_wait_to_payout()
+
+        oracle_app_client.call(App.set_event_result, event_id=1, opt=0)  # noqa
+        oracle_app_client.call(App.set_event_result, event_id=2, opt=2)  # noqa
+
+        with pytest.raises(LogicException):
+            oracle_app_client.call(App.set_event_result, event_id=1, opt=1)  # noqa
+
+    def test_request_payout_looser(self, app_addr, participant_clients):
+        with pytest.raises(LogicException):
+            participant_clients[2].call(
+                App.payout,  # noqa
+                suggested_params=pooled_payout_params(participant_clients[2]),
+                event_id=1
+            )
+
+    def test_request_payout_winners(self, app_addr, participant_clients):
+        for c in participant_clients[:2]:
+            res = c.call(App.payout, suggested_params=pooled_payout_params(c), event_id=1)  # noqa
+            assert res.tx_info["inner-txns"][0]["txn"]["txn"]["amt"] == 140000 * 4 // 2
+
+            # The record of a paid event may be cleared
+            c.call(App.clear_record, event_id=1)  # noqa
+
+    def test_request_refunds(self, app_addr, participant_clients):
+        # Event 2 has no winners, thus all the participants are refunded
+        for c in participant_clients:
+            res = c.call(App.payout, suggested_params=pooled_payout_params(c), event_id=2)  # noqa
+            assert res.tx_info["inner-txns"][0]["txn"]["txn"]["amt"] == 140000
+
+    def test_clear_open_record(self, app_addr, participant_clients):
+        with pytest.raises(LogicException):
+            participant_clients[2].call(App.clear_record, event_id=1)  # noqa
+
+    def test_delete_events(self, app_addr, creator_app_client, participant_clients, safe_wait_to_delete):
+        safe_wait_to_delete()
+
+        for event_id in self.config["event_ids"]:
+            creator_app_client.call(
+                App.delete_event,  # noqa
+                suggested_params=pooled_payout_params(creator_app_client),
+                event_id=event_id
+            )
+
+        # Records of deleted events may be cleared
+        participant_clients[2].call(App.clear_record, event_id=1)  # noqa
+
+    def test_recreate_deleted_event(self, app_addr, creator_app_client, participant_clients):
+        # The loser of event 1 did not clear its record: a re-created event 1 would let it request a payout
+        assert participant_clients[3].get_account_state()
+        for event_id in self.config["event_ids"]:
+            with pytest.raises(LogicException):
+                creator_app_client.call(
+                    App.create_event,  # noqa
+                    event_id=event_id,
+                    event_start_unix_timestamp=int(time.time() + 60),
+                    event_end_unix_timestamp=int(time.time() + 120),
+                    payout_time_window_s=0,
+                    options_count=3,
+                )
+
+    def test_delete_app(self, app_addr, creator_app_client):
+        creator_app_client.delete()
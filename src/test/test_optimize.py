@@ -0,0 +1,192 @@
+import base64
+
+import pytest
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer, TransactionWithSigner
+from algosdk.future import transaction
+from beaker import consts
+from beaker.client import ApplicationClient
+
+from contract import AlgoBet as App
+from teal.optimize import optimize
+from test.test_contract import TestContractBase, pooled_payout_params
+
+
+def test_fold_constants():
+    assert optimize("#pragma version 7\npushint 2\npushint 3\n+\nreturn\n").split("\n")[1] == "pushint 5 // 5"
+    # Operations failing at run time are left untouched
+    assert "-" in optimize("#pragma version 7\npushint 2\npushint 3\n-\nreturn\n")
+
+
+def test_simplify_branches():
+    teal = """#pragma version 7
+intcblock 0 1
+txn NumAppArgs
+intc_0 // 0
+==
+bnz main_l2
+b main_l3
+main_l2:
+intc_1 // 1
+return
+main_l3:
+b main_l4
+main_l4:
+err
+"""
+    optimized = optimize(teal).split("\n")
+    # Comparison with zero and jump over the unconditional jump merged into a single branch
+    assert optimized[3] == "bnz main_l3"
+    # Jump to the next instruction removed
+    assert "b main_l4" not in optimized
+
+
+def test_forward_scratch():
+    teal = "#pragma version 7\ntxn Fee\nstore 1\nload 1\nreturn\n"
+    assert optimize(teal) == "#pragma version 7\ntxn Fee\nreturn\n"
+    # Slots loaded twice are kept
+    teal = "#pragma version 7\ntxn Fee\nstore 1\nload 1\nload 1\n+\nreturn\n"
+    assert optimize(teal) == teal
+
+
+def test_cache_global_reads():
+    teal = "#pragma version 7\n" + "byte \"k\"\napp_global_get\n" * 4 + "+\n+\n+\nreturn\n"
+    optimized = optimize(teal)
+    assert optimized.count("app_global_get") == 1
+    assert optimized.count("load 255") == 3
+    # Reads split by a write are not cached
+    teal = "#pragma version 7\n" + "byte \"k\"\napp_global_get\n" * 2 + "byte \"k\"\nint 1\napp_global_put\n" + \
+           "byte \"k\"\napp_global_get\n" * 2 + "+\n+\n+\nreturn\n"
+    assert optimize(teal) == teal
+
+
+class TestOptimizedDifferential(TestContractBase):
+    """ Differential testing of the optimized approval program: each call is evaluated by dryrun with both the
+    original and the optimized programs, against the same state, before being submitted.
+    """
+
+    @pytest.fixture(scope="class")
+    def differential(self, creator_app_client, app_addr):
+        """Return a function evaluating the transactions group of an ATC by dryrun with both programs, asserting that
+        outcome, state changes, logs and inner transactions match. The group is then submitted if `submit` is set.
+        """
+        client = creator_app_client.client
+        compiled = client.compile(optimize(creator_app_client.app.approval_program))
+        optimized_program = base64.b64decode(compiled["result"])
+
+        def _outcome(txn_result: dict) -> dict:
+            return {
+                "passed": "PASS" in txn_result.get("app-call-messages", []),
+                "global-delta": sorted(txn_result.get("global-delta", []), key=lambda d: d["key"]),
+                "local-deltas": sorted(
+                    (d["address"], sorted(d["delta"], key=lambda e: e["key"]))
+                    for d in txn_result.get("local-deltas", [])
+                ),
+                "logs": txn_result.get("logs", []),
+                "inner-txns": [itxn["txn"] for itxn in txn_result.get("inner-txns", [])],
+            }
+
+        def _differential(atc: AtomicTransactionComposer, submit: bool = True) -> bool:
+            last_round = client.status()["last-round"]
+            drr = transaction.create_dryrun(
+                client, atc.gather_signatures(),
+                latest_timestamp=client.block_info(last_round)["block"]["ts"], round=last_round
+            )
+            original = client.dryrun(drr)
+            for app in drr.apps:
+                if isinstance(app, dict) and app["id"] == creator_app_client.app_id:
+                    app["params"]["approval-program"] = optimized_program
+            optimized = client.dryrun(drr)
+
+            passed = True
+            for original_result, optimized_result in zip(original["txns"], optimized["txns"]):
+                assert _outcome(original_result) == _outcome(optimized_result)
+                assert optimized_result.get("cost", 0) <= original_result.get("cost", 0)
+                passed &= "PASS" in original_result.get("app-call-messages", ["PASS"])
+
+            if submit and passed:
+                atc.execute(client, 4)
+            return passed
+
+        return _differential
+
+    @staticmethod
+    def bet_atc(c: ApplicationClient, app_addr: str, opt: int, on_complete=transaction.OnComplete.NoOpOC):
+        atc = AtomicTransactionComposer()
+        c.add_method_call(
+            atc,
+            App.bet,  # noqa
+            on_complete=on_complete,
+            bet_deposit_tx=TransactionWithSigner(
+                txn=transaction.PaymentTxn(
+                    c.get_sender(), c.get_suggested_params(), app_addr, 140 * consts.milli_algo),
+                signer=c.signer
+            ),
+            opt=opt
+        )
+        return atc
+
+    def test_make_bets(self, app_addr, participant_clients, differential):
+        # The first two participants opt in with the bare call, the others within the bet call
+        for c in participant_clients[:2]:
+            atc = AtomicTransactionComposer()
+            atc.add_transaction(TransactionWithSigner(
+                txn=transaction.ApplicationOptInTxn(c.get_sender(), c.get_suggested_params(), c.app_id),
+                signer=c.signer
+            ))
+            assert differential(atc)
+        for c, opt in zip(participant_clients, [0, 0, 1, 0]):
+            on_complete = transaction.OnComplete.NoOpOC if c in participant_clients[:2] \
+                else transaction.OnComplete.OptInOC
+            assert differential(self.bet_atc(c, app_addr, opt, on_complete))
+
+    def test_make_bets_again(self, app_addr, participant_clients, differential):
+        assert not differential(self.bet_atc(participant_clients[0], app_addr, 1))
+
+    def test_oracle_set_result(self, app_addr, creator_app_client, oracle_app_client, differential,
+                               safe_wait_to_payout):
+        safe_wait_to_payout()
+
+        # Only the oracle may set the result
+        for c, authorized in [(creator_app_client, False), (oracle_app_client, True)]:
+            atc = AtomicTransactionComposer()
+            c.add_method_call(atc, App.set_event_result, opt=0)  # noqa
+            assert differential(atc) == authorized
+
+    def test_read_only(self, app_addr, creator_app_client, participant_clients, differential):
+        atc = AtomicTransactionComposer()
+        creator_app_client.add_method_call(atc, App.get_market_state)  # noqa
+        participants = [c.get_sender() for c in participant_clients]
+        creator_app_client.add_method_call(
+            atc, App.get_participant_statuses, participants=participants, accounts=participants  # noqa
+        )
+        assert differential(atc, submit=False)
+
+    def test_payouts(self, app_addr, creator_app_client, participant_clients, differential):
+        loser, winner, keeper_settled = participant_clients[2], participant_clients[0], participant_clients[1:4:2]
+        for c, passed in [(loser, False), (winner, True), (winner, False)]:
+            atc = AtomicTransactionComposer()
+            c.add_method_call(atc, App.payout, suggested_params=pooled_payout_params(c))  # noqa
+            assert differential(atc) == passed
+
+        winners = [c.get_sender() for c in keeper_settled]
+        sp = creator_app_client.get_suggested_params()
+        sp.flat_fee = True
+        sp.fee = (1 + len(winners)) * consts.milli_algo
+        atc = AtomicTransactionComposer()
+        creator_app_client.add_method_call(
+            atc, App.settle_payouts, suggested_params=sp, winners=winners, accounts=winners  # noqa
+        )
+        assert differential(atc)
+
+    def test_delete(self, app_addr, creator_app_client, differential, safe_wait_to_delete):
+        safe_wait_to_delete()
+
+        atc = AtomicTransactionComposer()
+        atc.add_transaction(TransactionWithSigner(
+            txn=transaction.ApplicationDeleteTxn(
+                creator_app_client.get_sender(), creator_app_client.get_suggested_params(),
+                creator_app_client.app_id
+            ),
+            signer=creator_app_client.signer
+        ))
+        assert differential(atc)
@@ -0,0 +1,79 @@
+from algosdk import account
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+from algosdk.error import AlgodHTTPError
+from algosdk.future import transaction
+
+from bench.standin import StandInNode
+from client.lite import AlgoBetLiteClient
+from client.params import SuggestedParamsProvider, suggested_params_provider
+
+
+class Algod:
+    """ Algod client whose round is set by the test. """
+
+    def __init__(self):
+        self.round = 10
+        self.requests = 0
+
+    def suggested_params(self):
+        self.requests += 1
+        return transaction.SuggestedParams(0, self.round, self.round + 1000, "A" * 44, min_fee=1000)
+
+
+def test_round_aware_refresh():
+    algod = Algod()
+    provider = SuggestedParamsProvider(algod)
+    assert [provider.get().first for _ in range(3)] == [10] * 3
+    assert algod.requests == 1
+
+    # Copies are served
+    provider.get().fee = 2000
+    assert provider.get().fee == 0
+
+    # Observed rounds move the first valid round forward, without fetching the params again
+    provider.observe_round(12)
+    sp = provider.get()
+    assert (sp.first, sp.last) == (12, 1010)
+    assert algod.requests == 1
+
+    # Params nearing their last valid round are fetched again
+    algod.round = 1000
+    provider.observe_round(1000)
+    sp = provider.get()
+    assert (sp.first, sp.last) == (1000, 2000)
+    assert algod.requests == 2
+
+
+def test_ttl_and_invalidation(monkeypatch):
+    algod = Algod()
+    provider = SuggestedParamsProvider(algod, ttl_s=60)
+    provider.get()
+
+    # Only "txn dead" errors invalidate the params
+    assert not provider.invalidate_if_dead(AlgodHTTPError("logic eval error: assert failed", 400))
+    provider.get()
+    assert algod.requests == 1
+    assert provider.invalidate_if_dead(AlgodHTTPError("TransactionPool.Remember: txn dead: round 1200 outside of "
+                                                      "10--1010", 400))
+    provider.get()
+    assert algod.requests == 2
+
+    monkeypatch.setattr("client.params.time.monotonic", lambda: float("inf"))
+    provider.get()
+    assert algod.requests == 3
+
+
+def test_shared_provider():
+    algod = Algod()
+    assert suggested_params_provider(algod) is suggested_params_provider(algod)
+    assert suggested_params_provider(algod) is not suggested_params_provider(Algod())
+
+
+def test_sequential_calls_share_params():
+    with StandInNode(latency_s=0.001, round_time_s=0.02) as node:
+        signer = AccountTransactionSigner(account.generate_account()[0])
+        lite_client = AlgoBetLiteClient(node.client(), 1, signer=signer)
+        results = [lite_client.place_bet(0) for _ in range(10)]
+    # The confirmed rounds move the first valid round forward, with a single request
+    assert node.params_requests == 1
+    assert len({r.tx_id for r in results}) == 10
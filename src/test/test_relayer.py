@@ -0,0 +1,71 @@
+import pytest
+from algosdk import account
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+from algosdk.error import AtomicTransactionComposerError
+
+from bench.standin import StandInNode, stand_in_bet_amount
+from client import AlgoBetRelayerClient
+from client.algobet import decode_event_logs
+from client.relayer import max_relayed_bets
+from test.test_contract import TestContractBase
+
+
+@pytest.fixture
+def relayer() -> AlgoBetRelayerClient:
+    with StandInNode(latency_s=0, round_time_s=0.05) as node:
+        sk, _ = account.generate_account()
+        yield AlgoBetRelayerClient(node.client(), 1, signer=AccountTransactionSigner(sk))
+
+
+def test_relay_bets(relayer):
+    bettors = [account.generate_account() for _ in range(max_relayed_bets)]
+    bets = relayer.compose_relayed_bets([(addr, i % 2) for i, (_, addr) in enumerate(bettors)])
+
+    # The fee payment of the relayer covers the fees of all the transactions of the group
+    assert [txn.fee for txn in bets.txns] == [1000 * len(bets.txns)] + [0] * 2 * len(bettors)
+    assert [txn.amt for txn in bets.transactions(bettors[0][1])[:1]] == [stand_in_bet_amount]
+
+    for sk, addr in bettors[:-1]:
+        bets.add_signed([txn.sign(sk) for txn in bets.transactions(addr)])
+    assert not bets.signed
+    with pytest.raises(ValueError):
+        relayer.relay_bets(bets)
+    # Transactions of other groups are refused
+    with pytest.raises(ValueError):
+        other = relayer.compose_relayed_bets([(bettors[-1][1], 0)])
+        bets.add_signed([txn.sign(bettors[-1][0]) for txn in other.transactions(bettors[-1][1])])
+
+    sk, addr = bettors[-1]
+    bets.add_signed([txn.sign(sk) for txn in bets.transactions(addr)])
+    results = relayer.relay_bets(bets)
+    assert [r.method.name for r in results] == ["bet"] * len(bettors)
+
+
+def test_relay_bets_unsigned(relayer):
+    _, addr = account.generate_account()
+    bets = relayer.compose_relayed_bets([(addr, 0)])
+    with pytest.raises(AtomicTransactionComposerError):
+        bets.atc.gather_signatures()
+    with pytest.raises(ValueError):
+        relayer.compose_relayed_bets([(addr, 0)] * (max_relayed_bets + 1))
+
+
+class TestRelayer(TestContractBase):
+    """ The creator relays the bets of all the participants, paying their fees. """
+
+    def test_relay_bets(self, app_addr, creator_app_client, participant_accounts):
+        algod_client = creator_app_client.client
+        relayer = AlgoBetRelayerClient(algod_client, creator_app_client.app_id, signer=creator_app_client.signer)
+        balances = {a.address: algod_client.account_info(a.address)["amount"] for a in participant_accounts}
+        relayer_balance = algod_client.account_info(relayer.sender)["amount"]
+
+        bets = relayer.compose_relayed_bets([(a.address, opt) for a, opt in zip(participant_accounts, [0, 0, 1, 2])])
+        for a in participant_accounts:
+            bets.add_signed([txn.sign(a.private_key) for txn in bets.transactions(a.address)])
+        results = relayer.relay_bets(bets)
+
+        for r, a, opt in zip(results, participant_accounts, [0, 0, 1, 2]):
+            assert decode_event_logs(r.tx_info["logs"]) == [("BetPlaced", [a.address, opt])]
+            # Participants pay the bet amount only
+            assert algod_client.account_info(a.address)["amount"] == balances[a.address] - 140000
+        assert algod_client.account_info(relayer.sender)["amount"] == relayer_balance - 1000 * (1 + 2 * 4)
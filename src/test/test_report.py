@@ -0,0 +1,82 @@
+from teal.report import analyze, program_size, static_report
+
+# Router with a method branch running a loop, and a bare opt-in branch
+teal = """#pragma version 7
+intcblock 0 1
+bytecblock 0x636f756e746572
+txn NumAppArgs
+intc_0 // 0
+==
+bnz main_l4
+txna ApplicationArgs 0
+pushbytes 0x0a0b0c0d // "count(uint64)void"
+==
+bnz main_l3
+err
+main_l3:
+txna ApplicationArgs 1
+btoi
+callsub count_0
+intc_1 // 1
+return
+main_l4:
+txn OnCompletion
+intc_1 // OptIn
+==
+bnz main_l5
+err
+main_l5:
+intc_1 // 1
+return
+
+// count
+count_0:
+store 0
+intc_0 // 0
+store 1
+count_0_l1:
+load 1
+load 0
+<
+bz count_0_l2
+bytec_0 // "counter"
+bytec_0 // "counter"
+app_global_get
+intc_1 // 1
++
+app_global_put
+load 1
+intc_1 // 1
++
+store 1
+b count_0_l1
+count_0_l2:
+retsub
+"""
+
+
+def test_program_size():
+    # Version, constant blocks and 3 bytes per branch
+    assert program_size("#pragma version 7\nintcblock 0 1\nb l1\nl1:\nintc_1") == 1 + 4 + 3 + 1
+
+
+def test_route_costs():
+    routes = analyze(teal)["routes"]
+    assert set(routes) == {"count", "<bare OptIn>"}
+
+    # Constant blocks (2), dispatch (4 + 4 instructions), branch body (5) and subroutine: setup (3), two loop header
+    # runs (4 each), a single loop iteration (11) and return (1)
+    assert routes["count"]["cost"] == 2 + 8 + 5 + 3 + 2 * 4 + 11 + 1
+    assert routes["count"]["loop"]
+    assert (routes["count"]["global_reads"], routes["count"]["global_writes"]) == (1, 1)
+
+    assert routes["<bare OptIn>"]["cost"] == 2 + 4 + 4 + 2
+    assert not routes["<bare OptIn>"]["loop"]
+
+
+def test_report_diff():
+    previous = teal.replace("intc_1 // 1\n+\napp_global_put", "pushint 2 // 2\n+\napp_global_put")
+    report = static_report(teal, "#pragma version 7\nintc_1", previous, "#pragma version 7\nintc_1")
+    assert "count" in report
+    # Single byte constant reference replacing a push of an immediate
+    assert "-1" in report.splitlines()[1]
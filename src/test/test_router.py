@@ -0,0 +1,61 @@
+import base64
+
+import pytest
+
+from teal.router import dispatch_profile, expected_cost, reorder_dispatch
+
+# Router of three methods, declared in alphabetical order
+teal = """#pragma version 7
+intcblock 0 1
+txn NumAppArgs
+bz main_l5
+txna ApplicationArgs 0
+pushbytes 0x0a0a0a0a // "alpha()void"
+==
+bnz main_l4
+txna ApplicationArgs 0
+pushbytes 0x0b0b0b0b // "beta()void"
+==
+bnz main_l3
+txna ApplicationArgs 0
+pushbytes 0x0c0c0c0c // "gamma()void"
+==
+bnz main_l2
+err
+main_l2:
+intc_1 // 1
+return
+main_l3:
+intc_1 // 1
+return
+main_l4:
+intc_1 // 1
+return
+main_l5:
+err
+"""
+
+
+def app_call(selector: str) -> dict:
+    return {"application-transaction": {"application-args": [base64.b64encode(bytes.fromhex(selector)).decode()]}}
+
+
+def test_dispatch_profile():
+    transactions = [app_call("0c0c0c0c"), app_call("0c0c0c0c"), {**app_call("0a0a0a0a"), "inner-txns": [
+        app_call("0c0c0c0c")
+    ]}, {"payment-transaction": {}}]
+    assert dispatch_profile(teal, transactions) == {"gamma": 3, "alpha": 1}
+
+
+def test_reorder_dispatch():
+    profile = {"gamma": 10, "alpha": 1}
+    reordered = reorder_dispatch(teal, profile)
+    selectors = [line.split(" // ")[1] for line in reordered.splitlines() if line.startswith("pushbytes")]
+    # Methods missing from the profile are checked last
+    assert selectors == ['"gamma()void"', '"alpha()void"', '"beta()void"']
+    # Branch targets follow their selectors
+    assert reordered.splitlines()[7] == "bnz main_l2"
+
+    # Gamma dispatch saves two comparisons, alpha pays one more
+    assert expected_cost(teal, profile) - expected_cost(reordered, profile) == pytest.approx((10 * 8 - 4) / 11)
+    assert reorder_dispatch(teal, {}) == teal
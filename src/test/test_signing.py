@@ -0,0 +1,22 @@
+from algosdk import account, encoding
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+from algosdk.future import transaction
+
+from client.lite import signer_address
+from client.signing import SigningPool
+
+
+def test_pool_signer():
+    sk, addr = account.generate_account()
+    sp = transaction.SuggestedParams(1000, 1, 1000, "A" * 44, flat_fee=True)
+    txns = [transaction.PaymentTxn(addr, sp, addr, amount) for amount in range(3)]
+
+    with SigningPool(max_workers=1) as pool:
+        signer = pool.signer(sk)
+        # Pool signers stand in for account signers
+        assert signer_address(signer) == addr
+        signed = signer.sign_transactions(txns, [0, 2])
+
+    # Ed25519 signatures are deterministic
+    expected = AccountTransactionSigner(sk).sign_transactions(txns, [0, 2])
+    assert [encoding.msgpack_encode(s) for s in signed] == [encoding.msgpack_encode(s) for s in expected]
@@ -0,0 +1,52 @@
+import pytest
+from algosdk import account, encoding
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner, AtomicTransactionComposer, TransactionWithSigner
+)
+from algosdk.future import transaction
+from algosdk.logic import get_application_address
+
+from client.lite import load_contract
+from client.template import BetTemplate
+
+app_id = 1234
+bet_amount = 140000
+
+
+def add_method_call_bet(opt: int, sender: str, signer, sp, opt_in: bool) -> AtomicTransactionComposer:
+    """ Bet group built from scratch, as before the templates. """
+    atc = AtomicTransactionComposer()
+    atc.add_method_call(
+        app_id, load_contract().get_method_by_name("bet"), sender, sp, signer,
+        method_args=[opt, TransactionWithSigner(
+            transaction.PaymentTxn(sender, sp, get_application_address(app_id), bet_amount), signer
+        )],
+        on_complete=transaction.OnComplete.OptInOC if opt_in else transaction.OnComplete.NoOpOC
+    )
+    return atc
+
+
+@pytest.mark.parametrize("fee, flat_fee", [(0, False), (10, False), (3000, True)])
+@pytest.mark.parametrize("opt_in", [False, True])
+def test_template_matches_add_method_call(fee, flat_fee, opt_in):
+    method = load_contract().get_method_by_name("bet")
+    template = BetTemplate(app_id, get_application_address(app_id), bet_amount, method)
+    sp = transaction.SuggestedParams(fee, 100, 1100, "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", "testnet-v1.0",
+                                     flat_fee=flat_fee)
+    atcs = []
+    for _ in range(2):
+        sk, sender = account.generate_account()
+        signer = AccountTransactionSigner(sk)
+        atcs.append((add_method_call_bet(1, sender, signer, sp, opt_in),
+                     template.compose(1, sender, signer, sp, opt_in=opt_in)))
+
+    for expected, composed in atcs:
+        assert ([encoding.msgpack_encode(t.txn) for t in composed.build_group()] ==
+                [encoding.msgpack_encode(t.txn) for t in expected.build_group()])
+        assert composed.method_dict == expected.method_dict
+
+    # Bets of several participants share a group
+    atc = template.compose(0, atcs[0][0].txn_list[0].txn.sender, atcs[0][0].txn_list[0].signer, sp)
+    template.compose(1, atcs[1][0].txn_list[0].txn.sender, atcs[1][0].txn_list[0].signer, sp, atc=atc)
+    assert len(atc.gather_signatures()) == 4
+    assert sorted(atc.method_dict) == [1, 3]